@@ -0,0 +1,222 @@
+from forward_reasoning import (Bindings, FactIndex, literal_to_atom, parse_literal, parse_rule,
+                               is_variable)
+from terms import Compound, atom, atom_to_str, compound, intern_symbol, parse_atom
+
+# ---------------------------
+# Renaming variables
+# ---------------------------
+def _rename(term, mapping, prefix):
+    """Copy of term with every variable v replaced by prefix + position of first occurrence."""
+    if isinstance(term, Compound):
+        if term.ground:
+            return term
+        return compound(term.functor, tuple(_rename(a, mapping, prefix) for a in term.args))
+    if is_variable(term):
+        if term not in mapping:
+            mapping[term] = intern_symbol(f"{prefix}{len(mapping)}")
+        return mapping[term]
+    return term
+
+
+def _rename_atom(a, mapping, prefix):
+    return atom(a.pred, tuple(_rename(t, mapping, prefix) for t in a.args), a.neg)
+
+
+def variant_key(goal):
+    """Goals that are equal up to variable names share one table."""
+    return _rename_atom(goal, {}, "q__")
+
+
+# ---------------------------
+# Answer tables
+# ---------------------------
+class Table:
+    __slots__ = ('answers', 'answer_set', 'complete', 'dfn')
+
+    def __init__(self, dfn):
+        self.answers = []        # in the order they were found
+        self.answer_set = set()
+        self.complete = False
+        self.dfn = dfn           # creation number, used to find the leader of a recursive component
+
+
+# ---------------------------
+# Tabled backward chaining
+# ---------------------------
+class TabledProver:
+    """
+    Goal-directed backward chaining over the Rule / Literal structures of
+    forward_reasoning.py, with tabling in the spirit of SLG resolution.
+
+    Every subgoal (up to variable renaming) gets an answer table, so a shared
+    subgoal is solved once. A subgoal that calls itself, directly or through
+    other subgoals, consumes the answers found so far instead of recursing
+    forever; the oldest subgoal of such a recursive component (its leader)
+    re-evaluates the component until no new answers appear and then marks
+    all of its tables complete.
+    """
+    def __init__(self, rules, facts=()):
+        self.facts = FactIndex()
+        self.rules = {}  # (pred, arity) -> [(head, body)]
+        self.tables = {}
+        self.created = []   # incomplete tables in creation order
+        self.on_stack = {}  # goal key -> dfn, for subgoals being evaluated
+        self.new_answers = 0
+        for f in facts:
+            self.facts.add(literal_to_atom(f))
+        for r in rules:
+            head = literal_to_atom(r.consequent)
+            if not r.antecedents and head.ground:
+                self.facts.add(head)
+                continue
+            mapping = {}
+            head = _rename_atom(head, mapping, "r__")  # apart from the q__ variables of goals
+            body = [_rename_atom(literal_to_atom(a), mapping, "r__") for a in r.antecedents]
+            self.rules.setdefault((head.pred, len(head.args)), []).append((head, body))
+
+    def ask(self, query):
+        """Generator of answers (strings) to query, e.g. 'Ancestor(Ann, x)'; streamed as they are found."""
+        goal = variant_key(parse_atom(query) if isinstance(query, str) else literal_to_atom(query))
+        table = self.tables.get(goal)
+        if table is not None and table.complete:
+            for a in table.answers:
+                yield atom_to_str(a)
+            return
+        table = self._new_table(goal)
+        self.on_stack[goal] = table.dfn
+        yielded = 0
+        try:
+            while True:
+                start = self.new_answers
+                self._evaluate(goal, table)
+                while yielded < len(table.answers):
+                    yield atom_to_str(table.answers[yielded])
+                    yielded += 1
+                if self.new_answers == start:
+                    break
+            self._complete_from(table.dfn)
+        finally:
+            del self.on_stack[goal]
+            if not table.complete:  # the caller stopped early: drop the unfinished tables
+                for key in self.created[table.dfn:]:
+                    del self.tables[key]
+                del self.created[table.dfn:]
+
+    def prove(self, query):
+        """True as soon as one answer to query is found."""
+        for _ in self.ask(query):
+            return True
+        return False
+
+    def stats(self):
+        return {'tables': len(self.tables),
+                'answers': sum(len(t.answers) for t in self.tables.values())}
+
+    # --- internals ---
+    def _new_table(self, goal):
+        table = Table(len(self.created))
+        self.tables[goal] = table
+        self.created.append(goal)
+        return table
+
+    def _complete_from(self, dfn):
+        for key in self.created[dfn:]:
+            self.tables[key].complete = True
+        del self.created[dfn:]
+
+    def _solve(self, goal):
+        """(table, low): low is the smallest dfn of an unfinished subgoal this call depended on."""
+        table = self.tables.get(goal)
+        if table is not None:
+            if table.complete:
+                return table, None
+            if goal in self.on_stack:
+                return table, table.dfn  # recursive call: consume the answers found so far
+        else:
+            table = self._new_table(goal)
+        self.on_stack[goal] = table.dfn
+        low = table.dfn
+        while True:
+            start = self.new_answers
+            low = min(low, self._evaluate(goal, table))
+            if low < table.dfn or self.new_answers == start:
+                break  # not a leader (its leader iterates), or nothing new: fixpoint
+        del self.on_stack[goal]
+        if low == table.dfn:
+            self._complete_from(table.dfn)
+            return table, None
+        return table, low
+
+    def _evaluate(self, goal, table):
+        """One pass over the facts and rules for goal; returns the low dfn seen."""
+        low = table.dfn
+        bindings = Bindings()
+        mark = bindings.mark()
+        lits, start, end = self.facts.candidates(goal, bindings)
+        for k in range(start, end):
+            if bindings.unify_args(goal.args, lits[k].args):
+                self._add_answer(table, bindings.resolve_atom(goal))
+            bindings.undo(mark)
+
+        for head, body in self.rules.get((goal.pred, len(goal.args)), ()):
+            if bindings.unify_args(goal.args, head.args):
+                low = min(low, self._join(goal, table, body, 0, bindings))
+            bindings.undo(mark)
+        return low
+
+    def _join(self, goal, table, body, i, bindings):
+        if i == len(body):
+            self._add_answer(table, bindings.resolve_atom(goal))
+            return table.dfn
+        sub_table, sub_low = self._solve(variant_key(bindings.resolve_atom(body[i])))
+        low = table.dfn if sub_low is None else sub_low
+        args = body[i].args
+        mark = bindings.mark()
+        answers = sub_table.answers
+        for k in range(len(answers)):  # answers added meanwhile are picked up by the next pass
+            if bindings.unify_args(args, answers[k].args):
+                low = min(low, self._join(goal, table, body, i + 1, bindings))
+            bindings.undo(mark)
+        return low
+
+    def _add_answer(self, table, answer):
+        if answer not in table.answer_set:
+            table.answer_set.add(answer)
+            table.answers.append(answer)
+            self.new_answers += 1
+
+
+def backward_chain(rules, facts, query, verbose=True):
+    """
+    Answer one query goal-directed instead of saturating the knowledge base.
+    Returns (entailed_bool, answers) where answers are the matching fact strings.
+    """
+    prover = TabledProver(rules, facts)
+    answers = list(prover.ask(query))
+    if verbose:
+        for a in answers:
+            print("  ", a)
+        print("Query:", query, "=>", "ENTAILED" if answers else "NOT ENTAILED", prover.stats())
+    return bool(answers), answers
+
+
+# ---------------------------
+# Demo / Example usage
+# ---------------------------
+if __name__ == "__main__":
+    facts = [parse_literal(s) for s in ["Man(Marcus)", "Pompeian(Marcus)",
+                                        "Parent(Ann, Bob)", "Parent(Bob, Cid)", "Parent(Cid, Ann)"]]
+    rules = [parse_rule(s) for s in [
+        "Pompeian(x) -> Roman(x)",
+        "Roman(x) -> Loyal(x)",
+        "Man(x) -> Person(x)",
+        "Person(x) -> Mortal(x)",
+        # left-recursive and cyclic: terminates thanks to tabling
+        "Ancestor(x,y) & Parent(y,z) -> Ancestor(x,z)",
+        "Parent(x,y) -> Ancestor(x,y)",
+    ]]
+    backward_chain(rules, facts, "Mortal(Marcus)")
+
+    prover = TabledProver(rules, facts)
+    for answer in prover.ask("Ancestor(Ann, who)"):
+        print("answer:", answer)
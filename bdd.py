@@ -0,0 +1,246 @@
+"""
+Reduced ordered binary decision diagrams (ROBDDs).
+
+A BDD manager owns every node: node k is (level, low, high) stored in flat
+lists, with 0 and 1 the terminals. The unique table guarantees that each
+(level, low, high) triple exists once, so equal functions are equal node
+ids and tests such as "is this formula valid" are a comparison with 1.
+Results of apply/negate/implication tests are cached per manager and
+reused by every later operation.
+
+Variables are levels in a fixed order; new ones can only be appended below
+the existing ones. force_order() picks an order that keeps the variables of
+each formula close together, which is what keeps BDDs of rule sets small.
+Operations recurse once per level, so a manager is meant for at most a few
+hundred variables per path (the Python recursion limit).
+"""
+
+AND, OR, XOR = 0, 1, 2
+_TERMINAL = 1 << 30   # level of the terminals: below every variable
+
+
+class BDD:
+    FALSE, TRUE = 0, 1
+
+    def __init__(self, order=()):
+        self.names = []          # level -> variable name
+        self.levels = {}         # variable name -> level
+        self.level = [_TERMINAL, _TERMINAL]
+        self.low = [0, 1]
+        self.high = [0, 1]
+        self.unique = {}
+        self.cache = {}
+        for name in order:
+            self.add_var(name)
+
+    # --- construction ---
+    def add_var(self, name):
+        """Level of name, appending it below the current variables if new."""
+        if name not in self.levels:
+            self.levels[name] = len(self.names)
+            self.names.append(name)
+        return self.levels[name]
+
+    def var(self, name):
+        return self._mk(self.add_var(name), 0, 1)
+
+    def _mk(self, level, low, high):
+        if low == high:
+            return low
+        key = (level, low, high)
+        u = self.unique.get(key)
+        if u is None:
+            u = len(self.level)
+            self.level.append(level)
+            self.low.append(low)
+            self.high.append(high)
+            self.unique[key] = u
+        return u
+
+    def _cofactors(self, u, level):
+        return (self.low[u], self.high[u]) if self.level[u] == level else (u, u)
+
+    def apply(self, op, u, v):
+        """AND, OR or XOR of two nodes."""
+        if op == AND:
+            if u == 0 or v == 0:
+                return 0
+            if u == 1 or u == v:
+                return v
+            if v == 1:
+                return u
+        elif op == OR:
+            if u == 1 or v == 1:
+                return 1
+            if u == 0 or u == v:
+                return v
+            if v == 0:
+                return u
+        else:
+            if u == v:
+                return 0
+            if u == 0:
+                return v
+            if v == 0:
+                return u
+        if u > v:
+            u, v = v, u   # all three are commutative
+        key = (op, u, v)
+        r = self.cache.get(key)
+        if r is None:
+            level = min(self.level[u], self.level[v])
+            u0, u1 = self._cofactors(u, level)
+            v0, v1 = self._cofactors(v, level)
+            r = self._mk(level, self.apply(op, u0, v0), self.apply(op, u1, v1))
+            self.cache[key] = r
+        return r
+
+    def neg(self, u):
+        if u < 2:
+            return 1 - u
+        key = ('not', u)
+        r = self.cache.get(key)
+        if r is None:
+            r = self._mk(self.level[u], self.neg(self.low[u]), self.neg(self.high[u]))
+            self.cache[key] = r
+        return r
+
+    def conj(self, nodes):
+        r = 1
+        for u in nodes:
+            r = self.apply(AND, r, u)
+        return r
+
+    def disj(self, nodes):
+        r = 0
+        for u in nodes:
+            r = self.apply(OR, r, u)
+        return r
+
+    # --- queries ---
+    def implies(self, u, v):
+        """Whether u -> v is valid, without building u ∧ ¬v (stops at the first counterexample)."""
+        if u == 0 or v == 1 or u == v:
+            return True
+        if u == 1 and v == 0:
+            return False
+        key = ('imp', u, v)
+        r = self.cache.get(key)
+        if r is None:
+            level = min(self.level[u], self.level[v])
+            u0, u1 = self._cofactors(u, level)
+            v0, v1 = self._cofactors(v, level)
+            r = self.implies(u0, v0) and self.implies(u1, v1)
+            self.cache[key] = r
+        return r
+
+    def count(self, u, nvars=None):
+        """Number of assignments to the first nvars variables (default: all) that satisfy u."""
+        nvars = len(self.names) if nvars is None else nvars
+        memo = {}
+
+        def below(u):   # models over the levels from level(u) to nvars - 1
+            if u < 2:
+                return u
+            if u not in memo:
+                lo, hi = self.low[u], self.high[u]
+                memo[u] = (below(lo) << (min(self.level[lo], nvars) - self.level[u] - 1)) + \
+                          (below(hi) << (min(self.level[hi], nvars) - self.level[u] - 1))
+            return memo[u]
+
+        return below(u) << min(self.level[u], nvars)
+
+    def any_model(self, u):
+        """A satisfying assignment {name: bool} of the variables on one path, or None."""
+        if u == 0:
+            return None
+        model = {}
+        while u > 1:
+            name = self.names[self.level[u]]
+            if self.high[u] != 0:
+                model[name], u = True, self.high[u]
+            else:
+                model[name], u = False, self.low[u]
+        return model
+
+    def size(self, u):
+        """Number of nodes reachable from u, terminals included."""
+        seen, stack = set(), [u]
+        while stack:
+            u = stack.pop()
+            if u not in seen:
+                seen.add(u)
+                if u > 1:
+                    stack.extend((self.low[u], self.high[u]))
+        return len(seen)
+
+    def stats(self):
+        return {'variables': len(self.names), 'nodes': len(self.level),
+                'unique': len(self.unique), 'cache': len(self.cache)}
+
+
+# ---------------------------
+# Variable ordering
+# ---------------------------
+def _bfs_order(supports):
+    """Breadth-first order of the variable interaction graph, each component from a least-connected variable."""
+    neighbours = {}
+    for s in supports:
+        for v in s:
+            neighbours.setdefault(v, set()).update(s)
+    order, seen = [], set()
+    for start in sorted(neighbours, key=lambda v: len(neighbours[v])):
+        if start in seen:
+            continue
+        seen.add(start)
+        queue = [start]
+        for v in queue:
+            order.append(v)
+            for w in sorted(neighbours[v] - seen, key=lambda w: len(neighbours[w])):
+                seen.add(w)
+                queue.append(w)
+    return order
+
+
+def force_order(supports, initial=None, iterations=20):
+    """
+    Variable order for formulas whose variable sets are supports. Starts from
+    initial, or from a breadth-first walk of the variables that share a
+    formula, then applies the FORCE heuristic: each round moves every
+    variable to the mean centre of gravity of the formulas it occurs in.
+    The order with the smallest total span of the formulas is returned.
+    """
+    supports = [list(dict.fromkeys(s)) for s in supports if s]
+    order = list(dict.fromkeys(initial)) if initial is not None else _bfs_order(supports)
+
+    def span(pos):
+        return sum(max(pos[v] for v in s) - min(pos[v] for v in s) for s in supports)
+
+    pos = {v: i for i, v in enumerate(order)}
+    best, best_span = order, span(pos)
+    for _ in range(iterations):
+        centre = [sum(pos[v] for v in s) / len(s) for s in supports]
+        total = {v: 0.0 for v in order}
+        count = {v: 0 for v in order}
+        for c, s in zip(centre, supports):
+            for v in s:
+                total[v] += c
+                count[v] += 1
+        order = sorted(order, key=lambda v: (total[v] / count[v] if count[v] else pos[v], pos[v]))
+        pos = {v: i for i, v in enumerate(order)}
+        s = span(pos)
+        if s < best_span:
+            best, best_span = order, s
+    return best
+
+
+# ---------------------------
+# Demo / Example usage
+# ---------------------------
+if __name__ == "__main__":
+    # x1 x2 ∨ x3 x4 ∨ x5 x6: linear in a good order, exponential in a bad one
+    pairs = [("x1", "x2"), ("x3", "x4"), ("x5", "x6")]
+    for order in (["x1", "x3", "x5", "x2", "x4", "x6"], force_order(pairs, ["x1", "x3", "x5", "x2", "x4", "x6"])):
+        bdd = BDD(order)
+        f = bdd.disj(bdd.apply(AND, bdd.var(a), bdd.var(b)) for a, b in pairs)
+        print(order, "nodes:", bdd.size(f), "models:", bdd.count(f), bdd.stats())
@@ -0,0 +1,287 @@
+"""
+Reproducible benchmarks for the logic engines.
+
+Every engine is run on synthetic workloads from seeded generators at
+increasing sizes:
+
+    forward_chain  transitive closure of a shuffled chain; wide fan-out rule sets
+    unify          lists of deeply nested terms (unification_fol.unify)
+    fol_to_cnf     large random quantified formulas (fol_to_cnf_with_proper_nnf)
+    resolve        random 3-CNF clause sets refuted with ResolutionProver
+                   (ground steps use resolve() of 'Resolution Tree')
+    truth_table    model counting of random KBs with the bit-parallel columns
+
+Each measurement runs in a freshly spawned interpreter (the term tables
+are module-level caches that would make a second run look free) with
+PYTHONHASHSEED fixed to the seed, and the engine module
+is imported before the clock starts: time is the best of --repeat runs, peak memory comes from one
+extra run under tracemalloc, and each engine reports its own operation
+counts. --save writes the results as JSON; --compare checks a run against
+a saved baseline and flags cases that got slower or bigger than the
+tolerance, or whose operation counts changed.
+"""
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from multiprocessing import get_context
+
+# ---------------------------
+# Workload generators
+# ---------------------------
+def gen_chain(n, seed):
+    """Edge facts of a chain N0 -> ... -> Nn in random order, with the closure rules."""
+    rng = random.Random(seed)
+    facts = [f"Edge(N{i}, N{i + 1})" for i in range(n)]
+    rng.shuffle(facts)
+    rules = ["Edge(x,y) -> Path(x,y)", "Path(x,y) & Edge(y,z) -> Path(x,z)"]
+    return rules, facts
+
+
+def gen_fanout(n, seed):
+    """n rule families all triggered by the same base facts, joined with a random relation."""
+    rng = random.Random(seed)
+    facts = [f"Base(C{j})" for j in range(50)]
+    facts += [f"Link(C{rng.randrange(50)}, C{rng.randrange(50)})" for _ in range(100)]
+    rules = []
+    for i in range(n):
+        rules.append(f"Base(x) -> Tag{i}(x)")
+        rules.append(f"Tag{i}(x) & Link(x,y) -> Reach{i}(y)")
+    return rules, facts
+
+
+def _nested_pair(depth, rng, k):
+    """A term of the given depth with variables, and an instance of it (as strings)."""
+    left = right = None
+    for level in range(depth):
+        if left is None or rng.random() < 0.3:
+            if rng.random() < 0.5:
+                leaf_l, leaf_r = f"v{k}_{level}", f"g(K{rng.randrange(9)})"
+            else:
+                leaf_l = leaf_r = f"K{rng.randrange(9)}"
+        else:
+            leaf_l = leaf_r = None
+        functor = rng.choice("fhk")
+        if left is None:
+            left, right = leaf_l, leaf_r
+        elif leaf_l is None:
+            left, right = f"{functor}({left})", f"{functor}({right})"
+        else:
+            left, right = f"{functor}({left}, {leaf_l})", f"{functor}({right}, {leaf_r})"
+    return left, right
+
+
+def gen_nested_terms(depth, seed, width=20):
+    """Two lists of `width` terms of nesting depth `depth` that unify."""
+    rng = random.Random(seed)
+    pairs = [_nested_pair(depth, rng, k) for k in range(width)]
+    return [p[0] for p in pairs], [p[1] for p in pairs]
+
+
+def gen_fol_formula(n, seed):
+    """A random formula with n atoms, quantifiers and all connectives."""
+    rng = random.Random(seed)
+    parts = [f"P{rng.randrange(10)}({rng.choice('xyz')}, {rng.choice('xyzAB')})" for _ in range(n)]
+    while len(parts) > 1:
+        b = parts.pop(rng.randrange(len(parts)))
+        a = parts.pop(rng.randrange(len(parts)))
+        op = rng.choice(["∧", "∨", "->", "∧", "∨"])
+        f = f"({a} {op} {b})"
+        r = rng.random()
+        if r < 0.1:
+            f = f"¬{f}"
+        elif r < 0.2:
+            f = f"∀{rng.choice('xyz')} {f}"
+        elif r < 0.25:
+            f = f"∃{rng.choice('xyz')} {f}"
+        parts.append(f)
+    return f"∀x ∀y ∀z {parts[0]}"
+
+
+def gen_clause_set(n, seed, ratio=4.26):
+    """Random 3-CNF over n variables at the satisfiability threshold (clauses of literal strings)."""
+    rng = random.Random(seed)
+    # sorted lists, not sets: set order follows the per-process string hash seed
+    return [sorted(('-' if rng.random() < 0.5 else '') + f"V{v}" for v in rng.sample(range(n), 3))
+            for _ in range(int(ratio * n))]
+
+
+def gen_prop_kb(n, seed):
+    """A random propositional KB over n variables (2n clauses of three literals), and n."""
+    rng = random.Random(seed)
+    kb = [" ∨ ".join(("¬" if rng.random() < 0.5 else "") + f"X{v}" for v in rng.sample(range(n), 3))
+          for _ in range(2 * n)]
+    return kb, n
+
+
+# ---------------------------
+# Engines
+# ---------------------------
+# Each runner gets its engine module, imported by _measure outside the timed window.
+def run_forward_chain(fr, workload):
+    # forward_chain() is a printing wrapper around saturate(); run the engine itself for its counters
+    rules, facts = workload
+    index, stats = fr.saturate([fr.parse_rule(r) for r in rules], [fr.parse_literal(f) for f in facts])
+    return {'facts': len(index), 'firings': stats['firings'], 'rounds': stats['rounds']}
+
+
+def run_unify(unification_fol, workload):
+    theta = unification_fol.unify(*workload)
+    return {'bindings': len(theta) if theta is not None else -1}
+
+
+def run_fol_to_cnf(fol_to_cnf, workload):
+    with contextlib.redirect_stdout(io.StringIO()):
+        clauses = fol_to_cnf.fol_to_cnf_with_proper_nnf(workload)
+    return {'clauses': len(clauses), 'literals': sum(len(c) for c in clauses)}
+
+
+def run_resolve(resolution_prover, workload):
+    prover = resolution_prover.ResolutionProver(workload, max_clauses=20000)
+    refuted = prover.prove() is not None
+    return {'refuted': int(refuted), 'clauses': len(prover.clauses),
+            'resolutions': prover.stats['resolutions'], 'generated': prover.stats['generated']}
+
+
+def run_truth_table(prepositional_logic, workload):
+    kb, n = workload
+    return {'models': prepositional_logic.count_models(kb, [f"X{i}" for i in range(n)]), 'rows': 1 << n}
+
+
+# engine -> [(case name, generator, sizes, smallest size the generator accepts)], module, runner
+SUITE = {
+    'forward_chain': ([('chain', gen_chain, [50, 100, 200], 1),
+                       ('fanout', gen_fanout, [20, 80, 320], 1)], 'forward_reasoning', run_forward_chain),
+    'unify': ([('nested', gen_nested_terms, [25, 100, 300], 1)], 'unification_fol', run_unify),
+    'fol_to_cnf': ([('random', gen_fol_formula, [50, 200, 800], 1)], 'fol_to_cnf', run_fol_to_cnf),
+    'resolve': ([('3cnf', gen_clause_set, [8, 12, 16], 3)], 'resolution_prover', run_resolve),
+    'truth_table': ([('random', gen_prop_kb, [12, 16, 20], 3)], 'prepositional_logic', run_truth_table),
+}
+
+
+# engine -> warm-up run on its module before measuring (lazy loads the import does not cover)
+SETUP = {
+    'resolve': lambda m: m.resolve({'P'}, {'-P'}),   # loads 'Resolution Tree'
+}
+
+
+# ---------------------------
+# Measurement
+# ---------------------------
+def _measure(task):
+    """One run in a fresh worker: (seconds, peak bytes or None, operation counts)."""
+    engine, case, size, seed, trace = task
+    cases, module, runner = SUITE[engine]
+    generator = next(g for name, g, _, _ in cases if name == case)
+    workload = generator(size, seed)
+    module = importlib.import_module(module)   # a cold import is not part of the measurement
+    if engine in SETUP:
+        SETUP[engine](module)
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    ops = runner(module, workload)
+    elapsed = time.perf_counter() - start
+    peak = None
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return elapsed, peak, ops
+
+
+def run_suite(engines=None, repeat=3, seed=0, scale=1.0, verbose=True):
+    """{'meta': ..., 'cases': {'engine/case/size': {'time', 'peak_kb', 'ops'}}}"""
+    results = {}
+    # a fresh interpreter per run, with a fixed string hash seed: set iteration
+    # order (e.g. in 'Resolution Tree') decides which resolvents are found
+    os.environ['PYTHONHASHSEED'] = str(seed)
+    with get_context('spawn').Pool(1, maxtasksperchild=1) as pool:
+        for engine in engines or SUITE:
+            cases, _, _ = SUITE[engine]
+            for case, _, sizes, smallest in cases:
+                for size in sorted({max(smallest, int(size * scale)) for size in sizes}):
+                    times, ops = [], None
+                    for _ in range(repeat):
+                        elapsed, _, ops = pool.apply(_measure, ((engine, case, size, seed, False),))
+                        times.append(elapsed)
+                    _, peak, _ = pool.apply(_measure, ((engine, case, size, seed, True),))
+                    key = f"{engine}/{case}/{size}"
+                    results[key] = {'time': min(times), 'peak_kb': peak / 1024, 'ops': ops}
+                    if verbose:
+                        print(f"{key:32} {min(times):9.4f}s {peak / 1024:11.1f} KB  {ops}", flush=True)
+    meta = {'python': platform.python_version(), 'machine': platform.machine(),
+            'seed': seed, 'repeat': repeat, 'scale': scale}
+    return {'meta': meta, 'cases': results}
+
+
+NOISE = {'time': 0.01, 'peak_kb': 64}   # absolute growth below this is never a regression
+
+
+def compare(current, baseline, tolerance=0.25):
+    """
+    Cases of current that regressed against baseline: list of (case, what, old, new).
+    Time and peak memory regress when they grow by more than `tolerance`
+    (and more than NOISE); operation counts must match exactly (they are
+    deterministic per seed).
+    """
+    regressions = []
+    for key, new in current['cases'].items():
+        old = baseline['cases'].get(key)
+        if old is None:
+            continue
+        for what in ('time', 'peak_kb'):
+            if new[what] > old[what] * (1 + tolerance) and new[what] - old[what] > NOISE[what]:
+                regressions.append((key, what, old[what], new[what]))
+        if new['ops'] != old['ops']:
+            regressions.append((key, 'ops', old['ops'], new['ops']))
+    return regressions
+
+
+def print_comparison(current, baseline, tolerance=0.25):
+    regressions = compare(current, baseline, tolerance)
+    print(f"\n{'case':32} {'time':>18} {'peak KB':>22}")
+    for key, new in current['cases'].items():
+        old = baseline['cases'].get(key)
+        if old is None:
+            print(f"{key:32} (not in baseline)")
+            continue
+        print(f"{key:32} {old['time']:8.4f} -> {new['time']:7.4f} "
+              f"{old['peak_kb']:10.1f} -> {new['peak_kb']:9.1f}")
+    for key, what, old, new in regressions:
+        print(f"REGRESSION {key} {what}: {old} -> {new}")
+    if not regressions:
+        print(f"No regressions (tolerance {tolerance:.0%}).")
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks for the logic engines')
+    parser.add_argument('engines', nargs='*', metavar='engine',
+                        help=f"engines to run (default: all of {', '.join(SUITE)})")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--scale', type=float, default=1.0, help='multiply every workload size')
+    parser.add_argument('--save', metavar='FILE', help='write the results as JSON')
+    parser.add_argument('--compare', metavar='FILE', help='baseline JSON to check against')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args()
+    unknown = set(args.engines) - set(SUITE)
+    if unknown:
+        parser.error(f"unknown engines: {', '.join(sorted(unknown))}")
+
+    report = run_suite(args.engines or None, args.repeat, args.seed, args.scale)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if print_comparison(report, baseline, args.tolerance):
+            sys.exit(1)
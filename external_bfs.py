@@ -0,0 +1,260 @@
+"""
+Breadth-first search with the visited set on disk (delayed duplicate detection).
+
+An in-memory BFS needs every state seen so far in one set. Here each BFS
+layer is a file of sorted, distinct states packed into 64-bit ints, and
+layer d + 1 is built from layer d in three sequential passes:
+
+1. stream layer d, expand every state, and write the successors out as
+   sorted runs of at most buffer_records states
+2. merge the runs (at most fan_in files at a time), dropping duplicates
+3. merge the result against the previous `keep` layers, dropping every
+   state already there, and write what is left as layer d + 1
+
+When every move can be undone (sliding puzzles, undirected graphs) a
+successor of layer d can only lie in layers d - 1, d or d + 1, so keep=2
+is exact; for other problems raise keep (None keeps every layer). Memory
+is bounded by buffer_records plus one read block per open file.
+
+The problem is a search.SearchProblem that also has pack(state) -> int
+below 2**64 and unpack(int) -> state. Goals are tested as each new
+layer is written, on packed states when the problem names its single goal
+state in a `goal` attribute, else through unpack and is_goal. Progress is recorded in
+manifest.json in the work directory, replaced atomically after each
+finished layer; calling external_bfs() again on the same directory resumes
+after the last finished layer, throwing away the partial files of the one
+that was interrupted.
+"""
+import argparse
+import heapq
+import json
+import os
+from array import array
+
+_BLOCK = 1 << 16   # records per read or write
+
+
+# ---------------------------
+# Sorted record files
+# ---------------------------
+def _read(path):
+    """The records of a file, in order, a block at a time."""
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(8 * _BLOCK)
+            if not chunk:
+                return
+            block = array('Q')
+            block.frombytes(chunk)
+            yield from block
+
+
+def _write(path, records):
+    """Write records to path through a temporary file; the number written."""
+    n = 0
+    block = array('Q')
+    with open(path + '.tmp', 'wb') as f:
+        for r in records:
+            block.append(r)
+            if len(block) == _BLOCK:
+                block.tofile(f)
+                n += len(block)
+                block = array('Q')
+        block.tofile(f)
+        n += len(block)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + '.tmp', path)
+    return n
+
+
+def _unique(records):
+    last = None
+    for r in records:
+        if r != last:
+            yield r
+            last = r
+
+
+def _difference(records, exclude):
+    """Sorted records not in the sorted stream exclude."""
+    exclude = iter(exclude)
+    y = next(exclude, None)
+    for x in records:
+        while y is not None and y < x:
+            y = next(exclude, None)
+        if x != y:
+            yield x
+
+
+# ---------------------------
+# Layers
+# ---------------------------
+def _layer_path(workdir, depth):
+    return os.path.join(workdir, f"layer_{depth:04d}.bin")
+
+
+def _run_path(workdir, depth, k):
+    return os.path.join(workdir, f"run_{depth:04d}_{k:06d}.bin")
+
+
+def _goal_test(problem):
+    """Test on packed states: a comparison with the packed goal if the problem has a single goal."""
+    goal = getattr(problem, 'goal', None)
+    if goal is not None:
+        return problem.pack(goal).__eq__
+    unpack, is_goal = problem.unpack, problem.is_goal
+    return lambda code: is_goal(unpack(code))
+
+
+def _watch(records, test, found):
+    """Pass records through; found[0] becomes True at the first one passing test."""
+    for r in records:
+        if not found[0] and test(r):
+            found[0] = True
+        yield r
+
+
+def _expand(problem, workdir, depth, buffer_records):
+    """Sorted runs of the successors of layer depth."""
+    pack, unpack, successors = problem.pack, problem.unpack, problem.successors
+    runs, buffer = [], []
+    for code in _read(_layer_path(workdir, depth)):
+        buffer.extend(pack(nxt) for _, nxt in successors(unpack(code)))
+        if len(buffer) >= buffer_records:
+            buffer.sort()
+            runs.append(_run_path(workdir, depth + 1, len(runs)))
+            _write(runs[-1], _unique(buffer))
+            buffer = []
+    if buffer:
+        buffer.sort()
+        runs.append(_run_path(workdir, depth + 1, len(runs)))
+        _write(runs[-1], _unique(buffer))
+    return runs
+
+
+def _merge_runs(workdir, depth, runs, fan_in):
+    """Merge runs down to at most fan_in files."""
+    k = len(runs)
+    while len(runs) > fan_in:
+        merged = []
+        for i in range(0, len(runs), fan_in):
+            group = runs[i:i + fan_in]
+            path = _run_path(workdir, depth, k)
+            k += 1
+            _write(path, _unique(heapq.merge(*map(_read, group))))
+            for p in group:
+                os.remove(p)
+            merged.append(path)
+        runs = merged
+    return runs
+
+
+def _save_manifest(workdir, manifest):
+    path = os.path.join(workdir, 'manifest.json')
+    with open(path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=1)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + '.tmp', path)
+
+
+def _clean(workdir, depth):
+    """Remove run files and temporaries (left by an interrupted layer) for layers after depth."""
+    for name in os.listdir(workdir):
+        if name.endswith('.tmp') or name.startswith('run_'):
+            os.remove(os.path.join(workdir, name))
+        elif name.startswith('layer_') and int(name[6:10]) > depth:
+            os.remove(os.path.join(workdir, name))
+
+
+def external_bfs(problem, workdir, max_depth=None, keep=2, buffer_records=1 << 20, fan_in=64,
+                 stop_at_goal=False, on_layer=None):
+    """
+    Layered BFS from problem.initial with its layers in workdir, until a layer
+    is empty, max_depth layers exist, or (stop_at_goal) the layer just
+    written holds a goal, which is then never expanded.
+    on_layer(depth, count) is called for every finished layer, including
+    those read back on resume. Returns the manifest: {'initial', 'layers'
+    (states per depth), 'goal_depth' (depth of the first layer with a goal,
+    None if not reached), 'complete'}.
+    """
+    start = problem.pack(problem.initial)
+    if not 0 <= start < 1 << 64 or problem.unpack(start) != problem.initial:
+        raise ValueError("problem.pack must map states one-to-one onto 64-bit ints")
+    os.makedirs(workdir, exist_ok=True)
+    path = os.path.join(workdir, 'manifest.json')
+    if os.path.exists(path):
+        with open(path) as f:
+            manifest = json.load(f)
+        if manifest['initial'] != start:
+            raise ValueError(f"{workdir} holds a search from another initial state")
+    else:
+        _clean(workdir, -1)
+        _write(_layer_path(workdir, 0), [start])
+        manifest = {'initial': start, 'layers': [1], 'complete': False,
+                    'goal_depth': 0 if problem.is_goal(problem.initial) else None}
+        _save_manifest(workdir, manifest)
+    depth = len(manifest['layers']) - 1
+    _clean(workdir, depth)
+    goal_test = _goal_test(problem)
+    if on_layer is not None:
+        for d, n in enumerate(manifest['layers']):
+            on_layer(d, n)
+
+    while not manifest['complete'] and (max_depth is None or depth < max_depth):
+        if stop_at_goal and manifest['goal_depth'] is not None:
+            break
+        runs = _merge_runs(workdir, depth + 1, _expand(problem, workdir, depth, buffer_records), fan_in)
+        previous = [_layer_path(workdir, d) for d in range(depth, -1, -1)][:keep]
+        new = _difference(_unique(heapq.merge(*map(_read, runs))), heapq.merge(*map(_read, previous)))
+        found = [False]
+        if manifest['goal_depth'] is None:
+            new = _watch(new, goal_test, found)   # goals are tested as the new layer is written
+        n = _write(_layer_path(workdir, depth + 1), new)
+        for p in runs:
+            os.remove(p)
+        depth += 1
+        manifest['layers'].append(n)
+        manifest['complete'] = n == 0
+        if found[0]:
+            manifest['goal_depth'] = depth
+        _save_manifest(workdir, manifest)
+        if keep is not None and depth - keep >= 0:
+            old = _layer_path(workdir, depth - keep)
+            if os.path.exists(old):
+                os.remove(old)
+        if on_layer is not None:
+            on_layer(depth, n)
+    return manifest
+
+
+def layer_states(problem, workdir, depth):
+    """The (unpacked) states of a finished layer that is still on disk."""
+    return map(problem.unpack, _read(_layer_path(workdir, depth)))
+
+
+# ---------------------------
+# Demo / Example usage
+# ---------------------------
+if __name__ == "__main__":
+    from sliding_puzzle import SlidingPuzzle
+
+    parser = argparse.ArgumentParser(description='Disk-backed BFS of the sliding puzzle (resumable)')
+    parser.add_argument('workdir')
+    parser.add_argument('--width', type=int, default=3, choices=(2, 3, 4))
+    parser.add_argument('--max-depth', type=int, default=None)
+    parser.add_argument('--buffer', type=int, default=1 << 20, help='states per sorted run')
+    args = parser.parse_args()
+
+    cells = args.width * args.width
+    puzzle = SlidingPuzzle(tuple(range(1, cells)) + (0,))
+    total = 0
+
+    def report(depth, count):
+        global total
+        total += count
+        print(f"depth {depth:3d}: {count:12d} states  (total {total})", flush=True)
+
+    manifest = external_bfs(puzzle, args.workdir, args.max_depth, buffer_records=args.buffer, on_layer=report)
+    print("complete" if manifest['complete'] else "stopped; run again to continue")
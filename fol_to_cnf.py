@@ -1,14 +1,158 @@
 import re
-from collections import namedtuple
+from weakref import WeakValueDictionary
 
 # --- AST node types ---
-Var = namedtuple('Var', ['name'])          # predicate or atomic formula string
-Not = namedtuple('Not', ['child'])
-And = namedtuple('And', ['left', 'right'])
-Or  = namedtuple('Or',  ['left', 'right'])
-ForAll = namedtuple('ForAll', ['var', 'body'])
-Exists = namedtuple('Exists', ['var', 'body'])
-Implies = namedtuple('Implies', ['left', 'right'])
+# Nodes are hash-consed: building a node equal to an existing one returns that
+# object, so equality is identity, hashing is O(1) and every pass below can
+# memoize its result per unique subformula. And / Or are n-ary and flattened.
+# The table only holds nodes that are still referenced elsewhere, and the
+# memos of the passes live for one call, so nothing accumulates between
+# conversions.
+_NODES = WeakValueDictionary()
+
+class Formula:
+    __slots__ = ('__weakref__',)
+
+    def __repr__(self):
+        return ast_to_str(self)
+
+def _cons(cls, fields, values):
+    key = (cls,) + values
+    node = _NODES.get(key)
+    if node is None:
+        node = object.__new__(cls)
+        for f, v in zip(fields, values):
+            setattr(node, f, v)
+        _NODES[key] = node
+    return node
+
+class Var(Formula):
+    """Predicate or atomic formula string, e.g. 'Loves(x,y)'."""
+    __slots__ = ('name',)
+
+    def __new__(cls, name):
+        return _cons(cls, cls.__slots__, (name,))
+
+class Not(Formula):
+    __slots__ = ('child',)
+
+    def __new__(cls, child):
+        return _cons(cls, cls.__slots__, (child,))
+
+class _NAry(Formula):
+    __slots__ = ('args',)
+
+    def __new__(cls, *args):
+        flat = []
+        for a in args:
+            if type(a) is cls:
+                flat.extend(a.args)   # (a ∧ b) ∧ c  ->  a ∧ b ∧ c
+            else:
+                flat.append(a)
+        flat = tuple(dict.fromkeys(flat))  # a ∧ a  ->  a
+        if len(flat) == 1:
+            return flat[0]
+        return _cons(cls, ('args',), (flat,))
+
+    @classmethod
+    def nested(cls, args):
+        """
+        Node over args as given, not flattened. Building a long run of nested
+        ∧ / ∨ this way and calling flatten() once is linear; flattening at
+        every level would copy the run at every level.
+        """
+        return _cons(cls, ('args',), (tuple(args),))
+
+class And(_NAry):
+    __slots__ = ()
+
+class Or(_NAry):
+    __slots__ = ()
+
+class ForAll(Formula):
+    __slots__ = ('var', 'body')
+
+    def __new__(cls, var, body):
+        return _cons(cls, cls.__slots__, (var, body))
+
+class Exists(Formula):
+    __slots__ = ('var', 'body')
+
+    def __new__(cls, var, body):
+        return _cons(cls, cls.__slots__, (var, body))
+
+class Implies(Formula):
+    __slots__ = ('left', 'right')
+
+    def __new__(cls, left, right):
+        return _cons(cls, cls.__slots__, (left, right))
+
+def _children(node):
+    if isinstance(node, Not):
+        return (node.child,)
+    if isinstance(node, _NAry):
+        return node.args
+    if isinstance(node, (ForAll, Exists)):
+        return (node.body,)
+    if isinstance(node, Implies):
+        return (node.left, node.right)
+    return ()
+
+def _rebuild(node, children):
+    if isinstance(node, Not):
+        return Not(children[0])
+    if isinstance(node, _NAry):
+        return type(node).nested(children)
+    if isinstance(node, (ForAll, Exists)):
+        return type(node)(node.var, children[0])
+    if isinstance(node, Implies):
+        return Implies(children[0], children[1])
+    return node
+
+def _transform(root, children, combine, memo):
+    """
+    Bottom-up pass with an explicit stack: combine(key, results for children(key))
+    is computed once per distinct key and cached in memo.
+    """
+    if root in memo:
+        return memo[root]
+    stack = [root]
+    while stack:
+        key = stack[-1]
+        if key in memo:
+            stack.pop()
+            continue
+        kids = children(key)
+        pending = [k for k in kids if k not in memo]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        memo[key] = combine(key, [memo[k] for k in kids])
+    return memo[root]
+
+def _run(node):
+    """Operands of the ∧ / ∨ run below node: its args, with nested nodes of its type opened up."""
+    cls = type(node)
+    operands, seen = [], set()
+    stack = list(reversed(node.args))
+    while stack:
+        a = stack.pop()
+        if type(a) is not cls:
+            operands.append(a)
+        elif a not in seen:
+            seen.add(a)
+            stack.extend(reversed(a.args))
+    return operands
+
+def flatten(node):
+    """Merge nested ∧ / ∨ of the same kind and drop repeated operands, one pass over node."""
+    def children(n):
+        return _run(n) if isinstance(n, _NAry) else _children(n)
+
+    def combine(n, children):
+        return type(n)(*children) if isinstance(n, _NAry) else _rebuild(n, children)
+    return _transform(node, children, combine, {})
 
 # ---------- Lexer ----------
 TOKEN_REGEX = re.compile(r'\s*(∀|∃|¬|->|→|&|\^|\||∨|∧|\(|\)|\[|\]|,|[A-Za-z_][A-Za-z0-9_]*|\S)')
@@ -37,57 +181,86 @@ class Parser:
             return cur
         raise SyntaxError(f"Expected {tok} but found {cur}")
 
+    BINARY = {'∨': 1, '∧': 2, '->': 3}   # binding strength
+
     def parse(self):
-        return self.parse_or()
-
-    def parse_or(self):
-        left = self.parse_and()
-        while self.peek() == '∨':
-            self.eat('∨')
-            right = self.parse_and()
-            left = Or(left, right)
-        return left
-
-    def parse_and(self):
-        left = self.parse_impl()
-        while self.peek() == '∧':
-            self.eat('∧')
-            right = self.parse_impl()
-            left = And(left, right)
-        return left
-
-    def parse_impl(self):
-        left = self.parse_unary()
-        if self.peek() == '->':
-            self.eat('->')
-            right = self.parse_impl()
-            return Implies(left, right)
-        return left
-
-    def parse_unary(self):
-        tok = self.peek()
-        if tok == '¬':
-            self.eat('¬')
-            return Not(self.parse_unary())
-        if tok == '∀':
-            self.eat('∀')
-            var = self.eat()   # variable name token
-            body = self.parse_unary()
-            return ForAll(var, body)
-        if tok == '∃':
-            self.eat('∃')
-            var = self.eat()
-            body = self.parse_unary()
-            return Exists(var, body)
-        if tok == '(' or tok == '[':
-            openb = self.eat()
-            node = self.parse()
+        """
+        Operator-precedence parse with explicit stacks, so neither long operator
+        chains nor deep brackets recurse. Prefixes ¬ / ∀x / ∃x bind tightest,
+        then ->, ∧, ∨. A run of the same ∧ / ∨ becomes one n-ary node,
+        also across brackets; -> is right associative.
+        """
+        operands = []
+        ops = []        # binary operator tokens and ('(', prefixes) group markers
+        open_groups = 0
+        while True:
+            prefixes = self.parse_prefixes()
+            if self.peek() == '(' or self.peek() == '[':
+                self.eat()
+                ops.append(('(', prefixes))
+                open_groups += 1
+                continue
+            # atom or predicate possibly with args like P(x,y)
+            operands.append(self.apply_prefixes(prefixes, self.parse_atom()))
             # accept ) or ]
-            if self.peek() in (')',']'):
+            while self.peek() in (')', ']') and open_groups:
                 self.eat()
-            return node
-        # atom or predicate possibly with args like P(x,y)
-        return self.parse_atom()
+                self._close_group(operands, ops)
+                open_groups -= 1
+            tok = self.peek()
+            if tok not in self.BINARY:
+                break
+            self.eat()
+            while ops and not isinstance(ops[-1], tuple) and self.BINARY[ops[-1]] > self.BINARY[tok]:
+                self._reduce(operands, ops)
+            ops.append(tok)
+        while ops:  # end of input (an unclosed bracket is tolerated)
+            self._close_group(operands, ops)
+        return flatten(operands[-1])
+
+    def parse_prefixes(self):
+        prefixes = []  # ¬ / ∀x / ∃x in front of an operand
+        while True:
+            tok = self.peek()
+            if tok == '¬':
+                self.eat('¬')
+                prefixes.append(('¬', None))
+            elif tok in ('∀', '∃'):
+                self.eat(tok)
+                var = self.eat()   # variable name token
+                prefixes.append((tok, var))
+            else:
+                return prefixes
+
+    @staticmethod
+    def apply_prefixes(prefixes, node):
+        for op, var in reversed(prefixes):
+            node = Not(node) if op == '¬' else ForAll(var, node) if op == '∀' else Exists(var, node)
+        return node
+
+    def _reduce(self, operands, ops):
+        """Combine the run of identical operators on top of ops with their operands."""
+        op = ops[-1]
+        k = 0
+        while ops and ops[-1] == op:
+            ops.pop()
+            k += 1
+        args = operands[-k - 1:]
+        del operands[-k - 1:]
+        if op == '->':
+            node = args[-1]
+            for left in reversed(args[:-1]):
+                node = Implies(left, node)
+        else:
+            node = (Or if op == '∨' else And).nested(args)
+        operands.append(node)
+
+    def _close_group(self, operands, ops):
+        while ops and not isinstance(ops[-1], tuple):
+            self._reduce(operands, ops)
+        if ops:
+            _, prefixes = ops.pop()
+            operands[-1] = self.apply_prefixes(prefixes, operands[-1])
 
     def parse_atom(self):
         tok = self.eat()
@@ -111,84 +284,283 @@ class Parser:
 
 # ---------- AST to string ----------
 def ast_to_str(node):
-    if isinstance(node, Var):
-        return node.name
-    if isinstance(node, Not):
-        return f"¬({ast_to_str(node.child)})"
-    if isinstance(node, And):
-        return f"({ast_to_str(node.left)} ∧ {ast_to_str(node.right)})"
-    if isinstance(node, Or):
-        return f"({ast_to_str(node.left)} ∨ {ast_to_str(node.right)})"
-    if isinstance(node, ForAll):
-        return f"∀{node.var} {ast_to_str(node.body)}"
-    if isinstance(node, Exists):
-        return f"∃{node.var} {ast_to_str(node.body)}"
-    if isinstance(node, Implies):
-        return f"({ast_to_str(node.left)} -> {ast_to_str(node.right)})"
-    return str(node)
+    out = []
+    stack = [node]   # nodes still to print and literal pieces, popped from the end
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            out.append(item)
+        elif isinstance(item, Var):
+            out.append(item.name)
+        elif isinstance(item, Not):
+            stack.extend((')', item.child, '¬('))
+        elif isinstance(item, _NAry):
+            sep = ' ∧ ' if isinstance(item, And) else ' ∨ '
+            stack.append(')')
+            for i, a in enumerate(reversed(item.args)):
+                stack.extend((a, sep) if i < len(item.args) - 1 else (a,))
+            stack.append('(')
+        elif isinstance(item, ForAll):
+            stack.extend((item.body, f"∀{item.var} "))
+        elif isinstance(item, Exists):
+            stack.extend((item.body, f"∃{item.var} "))
+        elif isinstance(item, Implies):
+            stack.extend((')', item.right, ' -> ', item.left, '('))
+        else:
+            out.append(str(item))
+    return ''.join(out)
 
 # ---------- Eliminate implications (AST) ----------
 def elim_impl(node):
+    def combine(n, children):
+        if isinstance(n, Implies):
+            # A -> B  ===  ¬A ∨ B
+            return Or.nested((Not(children[0]), children[1]))
+        return _rebuild(n, children)
+    return flatten(_transform(node, _children, combine, {}))
+
+# ---------- Push negations inward to NNF ----------
+
+def _nnf_children(key):
+    node, neg = key
+    if isinstance(node, Not):
+        return ((node.child, not neg),)          # double negation cancels
+    if isinstance(node, _NAry):
+        return tuple((a, neg) for a in node.args)
+    if isinstance(node, (ForAll, Exists)):
+        return ((node.body, neg),)
     if isinstance(node, Implies):
-        # A -> B  ===  ¬A ∨ B
-        return Or(Not(elim_impl(node.left)), elim_impl(node.right))
+        return ((node.left, not neg), (node.right, neg))  # ¬A ∨ B
+    return ()
+
+def _nnf_combine(key, children):
+    node, neg = key
     if isinstance(node, Not):
-        return Not(elim_impl(node.child))
+        return children[0]
     if isinstance(node, And):
-        return And(elim_impl(node.left), elim_impl(node.right))
-    if isinstance(node, Or):
-        return Or(elim_impl(node.left), elim_impl(node.right))
+        return (Or if neg else And).nested(children)      # De Morgan
+    if isinstance(node, (Or, Implies)):
+        return (And if neg else Or).nested(children)
     if isinstance(node, ForAll):
-        return ForAll(node.var, elim_impl(node.body))
+        # ¬∀x P  === ∃x ¬P
+        return Exists(node.var, children[0]) if neg else ForAll(node.var, children[0])
     if isinstance(node, Exists):
-        return Exists(node.var, elim_impl(node.body))
-    return node  # Var
+        # ¬∃x P  === ∀x ¬P
+        return ForAll(node.var, children[0]) if neg else Exists(node.var, children[0])
+    return Not(node) if neg else node  # atom
 
-# ---------- Push negations inward to NNF ----------
 def to_nnf(node):
-    """Return NNF form (negation only on atoms)"""
-    if isinstance(node, Not):
-        child = node.child
-        # double negation
-        if isinstance(child, Not):
-            return to_nnf(child.child)
-        # De Morgan for And/Or
-        if isinstance(child, And):
-            return Or(to_nnf(Not(child.left)), to_nnf(Not(child.right)))
-        if isinstance(child, Or):
-            return And(to_nnf(Not(child.left)), to_nnf(Not(child.right)))
-        # quantifiers: push negation inside and flip quantifier
-        if isinstance(child, ForAll):
-            # ¬∀x P  === ∃x ¬P
-            return Exists(child.var, to_nnf(Not(child.body)))
-        if isinstance(child, Exists):
-            # ¬∃x P  === ∀x ¬P
-            return ForAll(child.var, to_nnf(Not(child.body)))
-        # atom
-        return Not(to_nnf(child))
-    elif isinstance(node, And):
-        return And(to_nnf(node.left), to_nnf(node.right))
-    elif isinstance(node, Or):
-        return Or(to_nnf(node.left), to_nnf(node.right))
-    elif isinstance(node, ForAll):
-        return ForAll(node.var, to_nnf(node.body))
-    elif isinstance(node, Exists):
-        return Exists(node.var, to_nnf(node.body))
-    else:
-        return node  # Var
-
-# ---------- Simple replacements for later pipeline (stubs) ----------
-def standardize_variables(expr_str):
-    # naive: replace first y with y1, second with y2, x->x
-    s = expr_str
-    s = s.replace(' y)', ' y1)')  # small try, not robust
-    return s
-
-def skolemize_string(nnf_str):
-    # naive: just replace '∃y' with 'f(x)' occurrences for demonstration
-    s = nnf_str.replace('∃y1','').replace('∃y2','')
-    s = s.replace('∃y','f(x)')
-    return s
+    """Return NNF form (negation only on atoms); each (subformula, polarity) is converted once."""
+    return flatten(_transform((node, False), _nnf_children, _nnf_combine, {}))
+
+# ---------- Atoms: substituting variables inside the atom text ----------
+_ARG_IDENT_RE = re.compile(r'\b([A-Za-z_][A-Za-z0-9_]*)\b(?!\s*\()')   # identifier that is not a function name
+
+def subst_atom(name, mapping):
+    """'Loves(x,y)' with {'y': 'Sk1(x)'} -> 'Loves(x,Sk1(x))'; the predicate name is left alone."""
+    pred, paren, rest = name.partition('(')
+    if not paren or not mapping:
+        return name
+    return pred + paren + _ARG_IDENT_RE.sub(lambda m: mapping.get(m.group(1), m.group(1)), rest)
+
+def atom_args(name):
+    """Identifiers used as (sub)arguments of an atom, in order."""
+    pred, paren, rest = name.partition('(')
+    return _ARG_IDENT_RE.findall(rest) if paren else []
+
+def free_names(node, memo=None):
+    """
+    Identifiers occurring free in node (variables and constants alike); the
+    sets of all its subformulas are left in memo, if given.
+    """
+    def combine(n, children):
+        if isinstance(n, Var):
+            return frozenset(atom_args(n.name))
+        if isinstance(n, (ForAll, Exists)):
+            return children[0] - {n.var}
+        return frozenset().union(*children)
+    return _transform(node, _children, combine, {} if memo is None else memo)
+
+def _restrict(node, env, free):
+    """The part of a renaming that matters inside node, as a hashable memo key."""
+    return node, tuple(sorted((v, env[v]) for v in free[node] if v in env))
+
+# ---------- Standardize variables apart ----------
+def standardize_apart(node):
+    """
+    Give every quantifier its own variable (x, x1, x2, ...) and rename its
+    occurrences. A shared subformula is renamed once per distinct renaming of
+    its free variables, so identical quantified subformulas keep one name.
+    """
+    free = {}
+    free_names(node, free)
+    used = set()
+    _transform(node, _children,
+               lambda n, _: used.update(atom_args(n.name) if isinstance(n, Var) else
+                                        (n.var,) if isinstance(n, (ForAll, Exists)) else ()), {})
+    taken, counters, names = set(), {}, {}
+
+    def fresh(var):
+        i = counters.get(var, 0)
+        name = var if i == 0 else f"{var}{i}"
+        while name in taken or (i > 0 and name in used):
+            i += 1
+            name = f"{var}{i}"
+        counters[var] = i + 1
+        taken.add(name)
+        return name
+
+    def children(key):
+        n, env = key
+        if isinstance(n, (ForAll, Exists)):
+            if key not in names:
+                names[key] = fresh(n.var)
+            return (_restrict(n.body, {**dict(env), n.var: names[key]}, free),)
+        env = dict(env)
+        return tuple(_restrict(c, env, free) for c in _children(n))
+
+    def combine(key, children):
+        n, env = key
+        if isinstance(n, Var):
+            return Var(subst_atom(n.name, dict(env)))
+        if isinstance(n, (ForAll, Exists)):
+            return type(n)(names[key], children[0])
+        return _rebuild(n, children)
+    return flatten(_transform((node, ()), children, combine, {}))
+
+# ---------- New symbol names ----------
+_IDENT_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+
+class NameSupply:
+    """
+    New symbols Sk1, Sk2, ... / Def1, Def2, ... for a conversion, skipping
+    every identifier of the formulas reserved with it. Numbering starts
+    over with each supply; pass one supply to the conversions whose
+    clauses are combined, so their new symbols stay apart.
+    """
+    def __init__(self, *nodes):
+        self.used = set()
+        self.counters = {}
+        for node in nodes:
+            self.reserve(node)
+
+    def reserve(self, node):
+        """Mark every predicate, function, constant and variable name in node as taken."""
+        def combine(n, _):
+            if isinstance(n, Var):
+                self.used.update(_IDENT_RE.findall(n.name))
+            elif isinstance(n, (ForAll, Exists)):
+                self.used.add(n.var)
+        _transform(node, _children, combine, {})
+
+    def __call__(self, prefix):
+        k = self.counters.get(prefix, 0) + 1
+        while f"{prefix}{k}" in self.used:
+            k += 1
+        self.counters[prefix] = k
+        self.used.add(f"{prefix}{k}")
+        return f"{prefix}{k}"
+
+# ---------- Skolemization ----------
+def skolemize(node, names=None):
+    """
+    Remove the quantifiers of a standardized NNF formula. ∃y becomes the
+    Skolem term Skk(x1,...,xn) over the universally quantified variables in
+    scope that occur in its body (a constant Skk if there are none); universal
+    quantifiers are dropped, their variables stay implicitly universal.
+    New symbols come from names (default: a NameSupply of node).
+    Returns (quantifier-free formula, universal variables in order).
+    """
+    if names is None:
+        names = NameSupply(node)
+    free = {}
+    free_names(node, free)
+    universals = {}
+    skolem = {}
+
+    def children(key):
+        n, env = key
+        env = dict(env)
+        if isinstance(n, ForAll):
+            universals[n.var] = None
+            env[n.var] = None  # universal: stays a variable
+        elif isinstance(n, Exists):
+            if key not in skolem:
+                scope = sorted(v for v in free[n] if v in env and env[v] is None)
+                sk = names('Sk')
+                skolem[key] = f"{sk}({','.join(scope)})" if scope else sk
+            env[n.var] = skolem[key]
+        return tuple(_restrict(c, env, free) for c in _children(n))
+
+    def combine(key, children):
+        n, env = key
+        if isinstance(n, Var):
+            return Var(subst_atom(n.name, {v: t for v, t in env if t is not None}))
+        if isinstance(n, (ForAll, Exists)):
+            return children[0]
+        return _rebuild(n, children)
+    return flatten(_transform((node, ()), children, combine, {})), list(universals)
+
+# ---------- Definitional (Tseitin) CNF ----------
+def tseitin_cnf(node, variables=(), names=None):
+    """
+    Clause list of a quantifier-free NNF formula, linear in its size.
+    Each disjunction is one clause; a conjunction nested inside a disjunction
+    is replaced by a new atom Defk(v...) over the variables it mentions, with
+    clauses for Defk -> conjunct (one direction is enough, as it only occurs
+    positively). Shared conjunctions share their definition. Literals are
+    strings, negated ones start with '-' as in the resolution code. New
+    symbols come from names (default: a NameSupply of node).
+    """
+    if names is None:
+        names = NameSupply(node)
+    free = {}
+    free_names(node, free)
+    variables = set(variables)
+    clauses = []
+    defs = {}
+    pending = []
+
+    def literal(m):
+        if isinstance(m, Not):
+            return '-' + m.child.name
+        if isinstance(m, And):
+            if m not in defs:
+                scope = sorted(v for v in free[m] if v in variables)
+                d = names('Def')
+                defs[m] = f"{d}({','.join(scope)})" if scope else d
+                pending.append(m)
+            return defs[m]
+        return m.name
+
+    def clause_of(m):
+        return list(dict.fromkeys(literal(a) for a in (m.args if isinstance(m, Or) else (m,))))
+
+    for c in (node.args if isinstance(node, And) else (node,)):
+        clauses.append(clause_of(c))
+    i = 0
+    while i < len(pending):
+        m = pending[i]
+        i += 1
+        for c in m.args:
+            clauses.append(['-' + defs[m]] + clause_of(c))
+    return clauses
+
+def clause_to_str(clause):
+    return ' ∨ '.join('¬' + lit[1:] if lit.startswith('-') else lit for lit in clause) or '□'
+
+def fol_to_clauses(expr_str, names=None):
+    """
+    Full pipeline: parse, eliminate ->, NNF, standardize apart, Skolemize,
+    definitional CNF. New symbols come from names (default: a fresh
+    NameSupply, so Skolem and definition numbering starts at 1).
+    """
+    ast = Parser(tokenize(expr_str)).parse()
+    names = NameSupply() if names is None else names
+    names.reserve(ast)
+    std = standardize_apart(to_nnf(elim_impl(ast)))
+    qfree, universals = skolemize(std, names)
+    return tseitin_cnf(qfree, universals, names)
 
 # ---------- Wrapper: full move_negations replacement ----------
 def move_negations_inward_full(expr_str):
@@ -201,32 +573,31 @@ def move_negations_inward_full(expr_str):
     nnf_ast = to_nnf(ast_no_impl)
     return ast_to_str(nnf_ast)
 
-# ---------- Full pipeline (uses your earlier functions where appropriate) ----------
-def fol_to_cnf_with_proper_nnf(expr):
+# ---------- Full pipeline ----------
+def fol_to_cnf_with_proper_nnf(expr, names=None):
     print("Original Expression:")
     print(expr)
-    # Step: eliminate implications (string-level), but we parse+elim in AST inside move_negations_inward_full
+    ast = Parser(tokenize(expr)).parse()
+    names = NameSupply() if names is None else names
+    names.reserve(ast)
+
     print("\nStep (AST): Move negations inward (NNF) and eliminate implications:")
-    nnf_str = move_negations_inward_full(expr)
-    print(nnf_str)
-
-    # Next steps - naive string operations to illustrate:
-    print("\nStep: (naive) Rename variables if needed (example):")
-    renamed = nnf_str.replace('y', 'y1', 1).replace('y', 'y2', 1)
-    print(renamed)
-
-    print("\nStep: (naive) Skolemize (demonstration):")
-    skolem = skolemize_string(renamed)
-    print(skolem)
-
-    print("\nStep: (naive) Drop universal quantifiers (if present):")
-    dropped = skolem.replace('∀x ', '').replace('∀x','')
-    print(dropped)
-
-    print("\nFinal (naive) CNF-like string (note: distribution not applied here):")
-    final = dropped
-    print(final)
-    return final
+    nnf_ast = to_nnf(elim_impl(ast))
+    print(ast_to_str(nnf_ast))
+
+    print("\nStep: Standardize variables apart:")
+    std_ast = standardize_apart(nnf_ast)
+    print(ast_to_str(std_ast))
+
+    print("\nStep: Skolemize and drop universal quantifiers:")
+    qfree_ast, universals = skolemize(std_ast, names)
+    print(ast_to_str(qfree_ast))
+
+    print("\nStep: Definitional (Tseitin) CNF, one clause per line:")
+    clauses = tseitin_cnf(qfree_ast, universals, names)
+    for i, clause in enumerate(clauses, 1):
+        print(f"  {i}. {clause_to_str(clause)}")
+    return clauses
 
 # ---------- Usage ----------
 if __name__ == "__main__":
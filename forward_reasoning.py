@@ -1,5 +1,12 @@
 import re
-from collections import deque, namedtuple
+import time
+from bisect import bisect_left
+from collections import defaultdict, namedtuple
+
+from rule_compiler import compile_rule
+from term_index import DiscriminationTree
+from terms import (Atom, Compound, SYMBOL_IS_VAR, atom, atom_to_str, compound, intern_symbol,
+                   parse_atom, parse_term, term_to_str)
 
 # ---------------------------
 # Utilities: parsing & types
@@ -10,7 +17,9 @@ _VAR_RE = re.compile(r'^[a-z][a-zA-Z0-9_]*$')     # variable: starts with lowerc
 _PRED_RE = re.compile(r'^([A-Za-z][A-Za-z0-9_]*)\((.*)\)$')
 
 def is_variable(token):
-    return bool(_VAR_RE.match(token))
+    if type(token) is int:  # interned symbol id (terms.py)
+        return SYMBOL_IS_VAR[token]
+    return isinstance(token, str) and bool(_VAR_RE.match(token))
 
 def parse_literal(s):
     """Parse a predicate string like 'Loves(x,y)' into Literal(pred, [args])"""
@@ -19,68 +28,165 @@ def parse_literal(s):
     if not m:
         raise ValueError(f"Bad literal format: {s}")
     pred = m.group(1)
-    args = [a.strip() for a in m.group(2).split(',')] if m.group(2).strip() else []
+    args = _split_args(m.group(2)) if m.group(2).strip() else []
     return Literal(pred=pred, args=args, neg=False)
 
+def _split_args(s):
+    """Split an argument list on its top-level commas only: 'f(a,b), y' -> ['f(a,b)', 'y']"""
+    args, depth, start = [], 0, 0
+    for i, ch in enumerate(s):
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            args.append(s[start:i].strip())
+            start = i + 1
+    args.append(s[start:].strip())
+    return args
+
 def literal_to_str(lit):
     return f"{lit.pred}({', '.join(lit.args)})"
 
+def literal_to_atom(lit):
+    """Interned, hash-consed form of a Literal (see terms.py); atoms are returned as they are."""
+    if isinstance(lit, Atom):
+        return lit
+    return atom(intern_symbol(lit.pred), tuple(parse_term(a) for a in lit.args), lit.neg)
+
 # ---------------------------
 # Unification
 # ---------------------------
+class Bindings:
+    """
+    Substitution kept in place with an undo trail. bind() records the variable
+    on the trail; mark() / undo(mark) roll back everything bound since the mark,
+    so a failed match costs no copying. Values are stored dereferenced, which
+    keeps variable chains short for deref().
+    """
+    __slots__ = ('values', 'trail')
+
+    def __init__(self, theta=None):
+        self.values = dict(theta) if theta else {}
+        self.trail = []
+
+    def mark(self):
+        return len(self.trail)
+
+    def undo(self, mark):
+        trail, values = self.trail, self.values
+        while len(trail) > mark:
+            del values[trail.pop()]
+
+    def deref(self, t):
+        values = self.values
+        while (type(t) is int or isinstance(t, str)) and t in values:
+            t = values[t]
+        return t
+
+    def bind(self, var, value):
+        if (isinstance(value, (list, tuple)) or not _is_ground_arg(value)) and self.occurs(var, value):
+            return False  # occurs check: variable should not appear in value
+        self.values[var] = value
+        self.trail.append(var)
+        return True
+
+    def occurs(self, var, t):
+        stack = [t]
+        while stack:
+            t = self.deref(stack.pop())
+            if t == var:
+                return True
+            if isinstance(t, Compound):
+                if not t.ground:
+                    stack.extend(t.args)
+            elif isinstance(t, (list, tuple)):
+                stack.extend(t)
+        return False
+
+    def unify(self, x, y):
+        """Unify in place; on failure the caller undoes to its mark."""
+        stack = None
+        while True:
+            x, y = self.deref(x), self.deref(y)
+            if x is not y and x != y:
+                if is_variable(x):
+                    if not self.bind(x, y):
+                        return False
+                elif is_variable(y):
+                    if not self.bind(y, x):
+                        return False
+                else:
+                    # interned compound terms f(...): same functor, then unify the arguments
+                    if isinstance(x, Compound) and isinstance(y, Compound):
+                        if x.functor != y.functor:
+                            return False
+                        x, y = x.args, y.args
+                    if not (isinstance(x, (list, tuple)) and type(x) is type(y) and len(x) == len(y)):
+                        return False
+                    if stack is None:
+                        stack = []
+                    stack.extend(zip(reversed(x), reversed(y)))  # popped left to right
+            if not stack:
+                return True
+            x, y = stack.pop()
+
+    def unify_args(self, xs, ys):
+        """unify() for two argument tuples of equal length, pair by pair."""
+        for i in range(len(xs)):
+            if not self.unify(xs[i], ys[i]):
+                return False
+        return True
+
+    def resolve(self, t):
+        """Fully substituted copy of t under the current bindings."""
+        t = self.deref(t)
+        if isinstance(t, Compound):
+            if t.ground:
+                return t
+            return compound(t.functor, tuple([self.resolve(a) for a in t.args]))
+        if isinstance(t, tuple):
+            return tuple([self.resolve(a) for a in t])
+        if isinstance(t, list):
+            return [self.resolve(a) for a in t]
+        return t
+
+    def resolve_atom(self, a):
+        if a.ground:
+            return a
+        return atom(a.pred, self.resolve(a.args), a.neg)
+
+
 def unify(x, y, theta=None):
-    """Unify two terms (variables/constants or lists) with substitution theta."""
-    if theta is None:
-        theta = {}
-    # if identical after applying theta
-    x = substitute_term(x, theta)
-    y = substitute_term(y, theta)
-
-    # variable cases
-    if isinstance(x, str) and is_variable(x):
-        return unify_var(x, y, theta)
-    if isinstance(y, str) and is_variable(y):
-        return unify_var(y, x, theta)
-
-    # compound (list) case
-    if isinstance(x, list) and isinstance(y, list) and len(x) == len(y):
-        for xi, yi in zip(x, y):
-            theta = unify(xi, yi, theta)
-            if theta is None:
-                return None
-        return theta
-
-    # constants / atoms
-    if x == y:
-        return theta
+    """Unify two terms (variables/constants, lists/tuples or interned terms) with substitution theta.
+    Returns a new substitution dict, or None; theta itself is left untouched."""
+    bindings = Bindings(theta)
+    if bindings.unify(x, y):
+        return bindings.values
     return None
 
-def unify_var(var, x, theta):
-    if var in theta:
-        return unify(theta[var], x, theta)
-    if isinstance(x, str) and x in theta:
-        return unify(var, theta[x], theta)
-    # occurs check: variable should not appear in x
-    if occurs_check(var, x, theta):
-        return None
-    theta2 = dict(theta)
-    theta2[var] = x
-    return theta2
-
 def occurs_check(var, x, theta):
     x = substitute_term(x, theta)
     if var == x:
         return True
-    if isinstance(x, list):
+    if isinstance(x, Compound):
+        x = x.args
+    if isinstance(x, (list, tuple)):
         return any(occurs_check(var, xi, theta) for xi in x)
     return False
 
 def substitute_term(term, theta):
-    """Apply substitution theta to a term (str or list)."""
+    """Apply substitution theta to a term (str, list/tuple or interned term)."""
+    if type(term) is int or isinstance(term, str):
+        if term in theta:
+            return substitute_term(theta[term], theta)
+        return term
     if isinstance(term, list):
         return [substitute_term(t, theta) for t in term]
-    if isinstance(term, str) and term in theta:
-        return substitute_term(theta[term], theta)
+    if isinstance(term, tuple):
+        return tuple([substitute_term(t, theta) for t in term])
+    if isinstance(term, Compound) and not term.ground:
+        return compound(term.functor, tuple([substitute_term(t, theta) for t in term.args]))
     return term
 
 def apply_substitution_literal(lit, theta):
@@ -106,22 +212,286 @@ def parse_rule(s):
         lit = parse_literal(s)
         return Rule(antecedents=[], consequent=lit)
 
+# ---------------------------
+# Fact index
+# ---------------------------
+class FactIndex:
+    """
+    Known facts indexed by (pred, arity) and by (pred, arity, position, constant),
+    so an antecedent only meets facts that can match its bound arguments.
+    Every fact gets a sequence number in insertion order; each bucket keeps the
+    facts and their sequence numbers side by side, so the facts of one
+    derivation round are a contiguous slice found by bisection.
+
+    All facts are also kept in a discrimination tree (term_index.py), which
+    answers unifiable / instances / generalizations queries and serves the
+    antecedents whose arguments are partially bound structures such as
+    f(x, A), which the constant buckets cannot narrow down.
+    """
+    def __init__(self):
+        self.facts = {}    # every known fact -> its sequence number, in sequence order
+        self.by_pred = defaultdict(lambda: ([], []))  # (pred, arity) -> ([fact], [seq])
+        self.by_arg = defaultdict(lambda: ([], []))   # (pred, arity, pos, const) -> ([fact], [seq])
+        self.var_positions = defaultdict(set)  # (pred, arity) -> positions where some fact has a variable
+        self.tree = DiscriminationTree()
+        self.size = 0      # next sequence number
+
+    def __len__(self):
+        return len(self.facts)
+
+    def _buckets(self, lit):
+        key = (lit.pred, len(lit.args))
+        buckets = [self.by_pred[key]]
+        for pos, arg in enumerate(lit.args):
+            if not _is_ground_arg(arg):
+                self.var_positions[key].add(pos)
+            else:
+                buckets.append(self.by_arg[key + (pos, arg)])
+        return buckets
+
+    def add(self, lit):
+        """Index a new fact; returns False (and does nothing) if it is already known."""
+        if lit in self.facts:
+            return False
+        seq = self.size
+        self.size += 1
+        self.facts[lit] = seq
+        for lits, seqs in self._buckets(lit):
+            lits.append(lit)
+            seqs.append(seq)
+        self.tree.insert(lit, lit)
+        return True
+
+    def remove(self, lit):
+        """Drop a known fact; each of its buckets stays sorted by sequence number."""
+        seq = self.facts.pop(lit)
+        for lits, seqs in self._buckets(lit):
+            i = bisect_left(seqs, seq)
+            del lits[i], seqs[i]
+        self.tree.delete(lit, lit)
+
+    def unifiable(self, lit):
+        """Known facts that unify with the atom lit."""
+        return [f for f in self.tree.unifiable(lit) if unify(lit.args, f.args) is not None]
+
+    def instances(self, lit):
+        """Known facts that are instances of the atom lit."""
+        return [f for f in self.tree.instances(lit) if _matches(lit, f)]
+
+    def generalizations(self, lit):
+        """Known facts that the atom lit is an instance of."""
+        return [f for f in self.tree.generalizations(lit) if _matches(f, lit)]
+
+    def candidates(self, lit, bindings, lo=0, hi=None):
+        """
+        (facts, start, end): facts[start:end] are the facts with sequence number
+        in [lo, hi) that can match `lit` under the current Bindings, taken from
+        the smallest bucket.
+        """
+        hi = self.size if hi is None else hi
+        key = (lit.pred, len(lit.args))
+        buckets = [self.by_pred.get(key, _EMPTY_BUCKET)]
+        var_positions = self.var_positions.get(key, ())
+        structured = False
+        for pos, arg in enumerate(lit.args):
+            value = bindings.deref(arg)
+            if isinstance(value, Compound) and not value.ground:
+                structured = True
+            elif pos in var_positions:
+                continue  # a non-ground fact could match anything here
+            elif _is_ground_arg(value):
+                buckets.append(self.by_arg.get(key + (pos, value), _EMPTY_BUCKET))
+        best = None
+        for lits, seqs in buckets:
+            start, end = bisect_left(seqs, lo), bisect_left(seqs, hi)
+            if best is None or end - start < best[2] - best[1]:
+                best = (lits, start, end)
+        if structured and best[2] - best[1] > 1:
+            facts = self.facts
+            lits = [f for f in self.tree.unifiable(bindings.resolve_atom(lit)) if lo <= facts[f] < hi]
+            if len(lits) < best[2] - best[1]:
+                best = (lits, 0, len(lits))
+        return best
+
+
+_EMPTY_BUCKET = ([], [])
+
+
+def _matches(pattern, fact):
+    """True if fact is an instance of pattern (one-way: only pattern's variables are bound)."""
+    theta = {}
+    stack = list(zip(pattern.args, fact.args))
+    while stack:
+        p, t = stack.pop()
+        if is_variable(p):
+            if theta.setdefault(p, t) != t:
+                return False
+        elif isinstance(p, Compound):
+            if not isinstance(t, Compound) or p.functor != t.functor or len(p.args) != len(t.args):
+                return False
+            stack.extend(zip(p.args, t.args))
+        elif p != t:
+            return False
+    return True
+
+
+def _is_ground_arg(arg):
+    return not is_variable(arg) and not (isinstance(arg, Compound) and not arg.ground)
+
+
 # ---------------------------
 # Forward chaining algorithm
 # ---------------------------
-def forward_chain(rules, facts, query=None, verbose=True):
+def saturate(rules, facts, query_atom=None, verbose=False, use_compiled=True, profiler=None):
+    """
+    Forward-chain rules over facts (Literals or terms.py atoms) to a fixpoint.
+    Returns (index, stats): the FactIndex holding every known fact in
+    derivation order, and {'firings', 'rounds', 'stopped_early'}.
+
+    Semi-naive evaluation: facts are derived in rounds, and a rule is only
+    instantiated with at least one antecedent matched by a fact that is new
+    in the previous round (the "delta"), so no derivation is repeated.
+    If query_atom is given, stops after the round that derives it.
+
+    Function-free rules run as matchers generated by rule_compiler.py unless
+    use_compiled is off or verbose is on (which needs the bindings); the
+    others, and rounds where some antecedent meets a non-ground fact, use
+    the generic match_delta.
+
+    With a rule_profiler.RuleProfiler as profiler, per-rule activations,
+    candidates, unifications, new/duplicate consequents and time are
+    recorded in it.
+    """
+    index = FactIndex()
+    bindings = Bindings()
+    firings = 0
+
+    for f in facts:
+        index.add(literal_to_atom(f))
+    compiled = [([literal_to_atom(a) for a in r.antecedents], literal_to_atom(r.consequent)) for r in rules]
+    profile = profiler is not None
+    matchers = [compile_rule(ants, cons, f"match_rule_{no}", profile) if use_compiled and not verbose and ants else None
+                for no, (ants, cons) in enumerate(compiled)]
+    entries = [profiler.entry(f"{' & '.join(atom_to_str(a) for a in ants)} -> {atom_to_str(cons)}", len(ants))
+               if profile and ants else None for ants, cons in compiled]
+
+    # Rules with no antecedent (facts as rules) hold unconditionally: fire them once up front
+    for ants, cons in compiled:
+        if not ants:
+            # consequent may contain variables; but a fact-rule would normally be ground
+            if index.add(cons) and verbose:
+                print("Inferred (from fact-rule):", atom_to_str(cons))
+
+    delta_start, delta_end = 0, index.size  # facts [delta_start, delta_end) are new this round
+    round_num = 0
+    while delta_start < delta_end:
+        round_num += 1
+        if verbose:
+            print(f"Round {round_num}: {delta_end - delta_start} new fact(s)")
+
+        for (ants, consequent), matcher, entry in zip(compiled, matchers, entries):
+            if not ants:
+                continue
+            if entry is not None:
+                entry.activations += 1
+                started = time.perf_counter()
+            if matcher is not None and not any(index.var_positions.get(k) for k in matcher.keys):
+                counters = (entry.tried, entry.matched) if entry is not None else ()
+                for cons in matcher(index, delta_start, delta_end, *counters):
+                    firings += 1
+                    added = index.add(cons)
+                    if entry is not None:
+                        entry.fired(added)
+            else:
+                def fire():
+                    # all antecedents unified under the bindings => infer consequent
+                    nonlocal firings
+                    firings += 1
+                    cons = bindings.resolve_atom(consequent)
+                    added = index.add(cons)
+                    if entry is not None:
+                        entry.fired(added)
+                    if added and verbose:
+                        ant_strs = [atom_to_str(bindings.resolve_atom(a)) for a in ants]
+                        theta_strs = {term_to_str(k): term_to_str(bindings.resolve(v)) for k, v in bindings.values.items()}
+                        print(f"Inferred: {atom_to_str(cons)}  from {', '.join(ant_strs)} using θ={theta_strs}")
+
+                counters = (entry.tried, entry.matched) if entry is not None else None
+                match_delta(index, ants, delta_start, delta_end, bindings, fire, counters)
+            if entry is not None:
+                entry.time += time.perf_counter() - started
+
+        delta_start, delta_end = delta_end, index.size
+
+        # optional early stopping if query found
+        if query_atom is not None and query_atom in index.facts:
+            return index, {'firings': firings, 'rounds': round_num, 'stopped_early': True}
+
+    return index, {'firings': firings, 'rounds': round_num, 'stopped_early': False}
+
+
+def match_delta(index, ants, delta_start, delta_end, bindings, emit, counters=None):
+    """
+    Call emit() once for every match of all antecedents `ants` against the
+    facts of index that uses at least one fact from the delta (sequence
+    numbers [delta_start, delta_end)) and none newer; during the call the
+    antecedents' variables are bound in `bindings`. counters, if given, is a
+    pair of per-antecedent lists (tried, matched) of candidate counts.
+    """
+    # For rules with antecedents, we attempt to find substitutions that make all antecedents true.
+    # We perform a backtracking search over antecedents, building substitutions using unification.
+    # ranges[i] is the slice of fact sequence numbers antecedent i may use. At every level the
+    # antecedent with the smallest candidate list (i.e. the most bound one) is joined next;
+    # its candidates come from the hash index on its bound arguments. Bindings are made in
+    # place and undone on the trail after each candidate.
+    def backtrack(remaining, ranges):
+        if not remaining:
+            emit()
+            return
+
+        best_pos, best = 0, None
+        for pos, i in enumerate(remaining):
+            cands = index.candidates(ants[i], bindings, *ranges[i])
+            if best is None or cands[2] - cands[1] < best[2] - best[1]:
+                best_pos, best = pos, cands
+                if cands[1] == cands[2]:
+                    return  # some antecedent cannot be satisfied at all
+        i = remaining[best_pos]
+        rest = remaining[:best_pos] + remaining[best_pos + 1:]
+        lits, start, end = best
+        args = ants[i].args
+        mark = bindings.mark()
+        if counters is not None:
+            counters[0][i] += end - start
+        for k in range(start, end):
+            # attempt to unify antecedent.args with the fact's args under the current bindings
+            if bindings.unify_args(args, lits[k].args):
+                if counters is not None:
+                    counters[1][i] += 1
+                backtrack(rest, ranges)
+            bindings.undo(mark)
+
+    # Antecedent i is matched against the delta; earlier antecedents only against
+    # facts older than the delta, later ones against everything up to the delta's end.
+    # Each new combination of facts is thus enumerated exactly once.
+    for i in range(len(ants)):
+        ranges = [(0, delta_start)] * i + [(delta_start, delta_end)] + [(0, delta_end)] * (len(ants) - i - 1)
+        backtrack(tuple(range(len(ants))), ranges)
+
+
+def forward_chain(rules, facts, query=None, verbose=True, profiler=None):
     """
     rules: list of Rule objects
     facts: list of Literal objects (ground facts)
     query: string such as 'Mortal(Marcus)' or None
+    profiler: optional rule_profiler.RuleProfiler collecting per-rule statistics
     Returns (entailed_bool, derived_facts_set)
-    """
-    # store facts as strings for quick membership; but also keep Literal objects
-    derived = set(literal_to_str(f) for f in facts)
-    fact_objs = {literal_to_str(f): f for f in facts}
 
-    agenda = deque(facts)  # facts to consider (Literal objects)
-    new_inferred = True
+    Internally facts and rules are interned atoms (terms.py), so membership
+    tests hash an object id instead of formatting a string; the returned
+    set is converted back to strings once at the end. See saturate().
+    """
+    query_atom = parse_atom(query) if query is not None else None
 
     if verbose:
         print("Initial Facts:")
@@ -133,67 +503,18 @@ def forward_chain(rules, facts, query=None, verbose=True):
             print(f"  {ants} -> {literal_to_str(r.consequent)}")
         print("---------------\n")
 
-    while agenda:
-        fact = agenda.popleft()
+    index, stats = saturate(rules, facts, query_atom, verbose, profiler=profiler)
+    derived = {atom_to_str(d) for d in index.facts}
+    if stats['stopped_early']:
         if verbose:
-            print("Processing fact:", literal_to_str(fact))
-        # Try to apply each rule whose antecedents can be unified with known facts
-        for rule in rules:
-            # For rules with no antecedent (facts as rules), check if consequent already known
-            if not rule.antecedents:
-                cons_subst = {}
-                # consequent may contain variables; but a fact-rule would normally be ground
-                cons = apply_substitution_literal(rule.consequent, cons_subst)
-                cons_str = literal_to_str(cons)
-                if cons_str not in derived:
-                    derived.add(cons_str)
-                    fact_objs[cons_str] = cons
-                    agenda.append(cons)
-                    if verbose:
-                        print("Inferred (from fact-rule):", cons_str)
-                continue
-
-            # For rules with antecedents, we attempt to find substitutions that make all antecedents true.
-            # We perform a backtracking search over antecedents, building substitutions using unification
-            def backtrack(idx, theta):
-                if idx == len(rule.antecedents):
-                    # all antecedents unified under theta => infer consequent
-                    cons = apply_substitution_literal(rule.consequent, theta)
-                    cons_str = literal_to_str(cons)
-                    if cons_str not in derived:
-                        derived.add(cons_str)
-                        fact_objs[cons_str] = cons
-                        agenda.append(cons)
-                        if verbose:
-                            ant_strs = [literal_to_str(apply_substitution_literal(a, theta)) for a in rule.antecedents]
-                            print(f"Inferred: {cons_str}  from {', '.join(ant_strs)} using θ={theta}")
-                    return
-
-                antecedent = rule.antecedents[idx]
-                # We need to try to unify this antecedent with any known fact (derived)
-                for known_str, known_lit in list(fact_objs.items()):
-                    if antecedent.pred != known_lit.pred or len(antecedent.args) != len(known_lit.args):
-                        continue
-                    # attempt to unify antecedent.args with known_lit.args under current theta
-                    theta_try = unify(list(antecedent.args), list(known_lit.args), dict(theta))
-                    if theta_try is not None:
-                        backtrack(idx + 1, theta_try)
-
-            # Start backtracking with current fact as a potential match for antecedents[0]
-            # (We could try all known facts; backtrack function already does that by iterating fact_objs)
-            backtrack(0, {})
-
-        # optional early stopping if query found
-        if query is not None and query in derived:
-            if verbose:
-                print("\nQuery found early:", query)
-            return True, derived
+            print("\nQuery found early:", query)
+        return True, derived
 
     # finished
-    entailed = (query in derived) if query is not None else None
+    entailed = (query_atom in index.facts) if query is not None else None
     if verbose:
         print("\n--- Derivation complete ---")
-        print(f"Total derived facts: {len(derived)}")
+        print(f"Total derived facts: {len(derived)} ({stats['firings']} rule firings in {stats['rounds']} rounds)")
         for d in sorted(derived):
             print("  ", d)
         if query is not None:
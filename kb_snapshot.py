@@ -0,0 +1,255 @@
+"""
+Bulk loading of knowledge bases and binary snapshots of their closure.
+
+A knowledge-base file holds one rule or fact per line, in the syntax of
+forward_reasoning.py ('Man(x) -> Person(x)', 'Man(Marcus)'); blank lines
+and lines starting with '#' are skipped. Files are read in chunks and
+flat facts are split directly into interned atoms instead of going
+through the regexes of parse_literal; rules are split on '->' and '&' and
+hold atoms (which saturate() accepts like Literals), so nested terms such
+as 'Knows(x, f(y))' are read correctly too.
+
+A snapshot stores the saturated FactIndex (every fact in sequence order)
+together with the SHA-256 of the input files, so it is reused only while
+the rules and facts it was built from are unchanged.
+
+Layout (little-endian):
+    header   b'KBS1', 32-byte digest, then 7 uint32: symbol bytes,
+             compound ints, atom ints, input facts, firings, rounds, flags
+    symbols  names joined by '\\0' (only the symbols the snapshot uses)
+    compounds int32 records [functor, nargs, arg codes...] in build order
+    atoms    int32 records [pred, 2*nargs + neg, arg codes...] in fact order
+A term code is 2*symbol for a symbol and 2*compound + 1 for a compound.
+"""
+import hashlib
+import os
+import struct
+import sys
+from array import array
+
+from forward_reasoning import FactIndex, Rule, saturate
+from terms import SYMBOL_NAMES, Compound, atom, atom_to_str, compound, intern_symbol, parse_atom
+
+MAGIC = b'KBS1'
+_HEADER = struct.Struct('<4s32s7I')
+CHUNK_SIZE = 1 << 20
+
+# ---------------------------
+# Bulk loading
+# ---------------------------
+def _lines(path, digest=None, chunk_size=CHUNK_SIZE):
+    """Lines of a file read chunk by chunk; feeds the raw bytes to digest if given."""
+    with open(path, 'rb') as f:
+        tail = b''
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            if digest is not None:
+                digest.update(chunk)
+            lines = (tail + chunk).split(b'\n')
+            tail = lines.pop()
+            for line in lines:
+                yield line.decode('utf-8')
+        if tail:
+            yield tail.decode('utf-8')
+
+
+def _parse_fact(line):
+    """'Pred(a, b)' -> Atom without a regex; nested terms go through the full parser."""
+    pred, paren, rest = line.partition('(')
+    if not paren or not rest.endswith(')') or '(' in rest:
+        return parse_atom(line)
+    body = rest[:-1]
+    args = tuple(intern_symbol(a.strip()) for a in body.split(',')) if body.strip() else ()
+    return atom(intern_symbol(pred.strip()), args)
+
+
+def content_hash(paths):
+    """SHA-256 over the input files, in order."""
+    digest = hashlib.sha256()
+    for path in paths:
+        for _ in _lines(path, digest):
+            pass
+        digest.update(b'\0')  # file boundary
+    return digest.digest()
+
+
+def load_kb(paths):
+    """Parse rule/fact files; returns (rules over atoms, facts as atoms, digest)."""
+    digest = hashlib.sha256()
+    rules, facts = [], []
+    for path in paths:
+        for line in _lines(path, digest):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if '->' in line:
+                left, right = line.split('->', 1)
+                ants = [_parse_fact(part.strip()) for part in left.split('&') if part.strip()]
+                rules.append(Rule(antecedents=ants, consequent=_parse_fact(right.strip())))
+            else:
+                facts.append(_parse_fact(line))
+        digest.update(b'\0')
+    return rules, facts, digest.digest()
+
+
+# ---------------------------
+# Snapshots
+# ---------------------------
+def _to_le(ints):
+    if sys.byteorder == 'big':
+        ints.byteswap()
+    return ints
+
+
+def write_snapshot(path, index, stats, digest, n_input):
+    """Write the facts of a saturated FactIndex (see saturate()) to path."""
+    sym_local, names = {}, []
+    comp_local, comp_ints = {}, array('i')
+    atom_ints = array('i')
+
+    def sym(s):
+        if s not in sym_local:
+            sym_local[s] = len(names)
+            names.append(SYMBOL_NAMES[s])
+        return sym_local[s]
+
+    def code(t):
+        if type(t) is int:
+            return 2 * sym(t)
+        if t not in comp_local:
+            stack = [t]  # children are written before their parents
+            while stack:
+                c = stack[-1]
+                pending = [a for a in c.args if isinstance(a, Compound) and a not in comp_local]
+                if pending:
+                    stack.extend(pending)
+                    continue
+                stack.pop()
+                if c in comp_local:
+                    continue
+                comp_ints.extend([sym(c.functor), len(c.args)])
+                comp_ints.extend([code(a) for a in c.args])
+                comp_local[c] = len(comp_local)
+        return 2 * comp_local[t] + 1
+
+    for a in index.facts:
+        atom_ints.extend([sym(a.pred), 2 * len(a.args) + a.neg])
+        atom_ints.extend([code(t) for t in a.args])
+
+    symbol_bytes = '\0'.join(names).encode('utf-8')
+    header = _HEADER.pack(MAGIC, digest, len(symbol_bytes), len(comp_ints), len(atom_ints),
+                          n_input, stats['firings'], stats['rounds'], int(stats['stopped_early']))
+    # written aside and renamed, so a crash never leaves a valid header on a partial file
+    with open(path + '.tmp', 'wb') as f:
+        f.write(header)
+        f.write(symbol_bytes)
+        f.write(_to_le(comp_ints).tobytes())
+        f.write(_to_le(atom_ints).tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + '.tmp', path)
+
+
+def read_digest(path):
+    """Digest stored in a snapshot, or None if the file is missing or not a snapshot."""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(_HEADER.size)
+    except OSError:
+        return None
+    if len(head) < _HEADER.size or head[:4] != MAGIC:
+        return None
+    return _HEADER.unpack(head)[1]
+
+
+def read_snapshot(path):
+    """
+    Load a snapshot in one read; returns (index, stats, digest, n_input).
+    ValueError if the file is not a snapshot or its size disagrees with the header.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < _HEADER.size:
+        raise ValueError(f"{path} is not a knowledge-base snapshot")
+    magic, digest, n_sym, n_comp, n_atom, n_input, firings, rounds, flags = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a knowledge-base snapshot")
+    if len(data) != _HEADER.size + n_sym + 4 * n_comp + 4 * n_atom:
+        raise ValueError(f"{path} is truncated or corrupt")
+    pos = _HEADER.size
+    symbols = [intern_symbol(name) for name in data[pos:pos + n_sym].decode('utf-8').split('\0')] if n_sym else []
+    pos += n_sym
+    comp_ints = _to_le(array('i', data[pos:pos + 4 * n_comp]))
+    pos += 4 * n_comp
+    atom_ints = _to_le(array('i', data[pos:pos + 4 * n_atom]))
+
+    compounds = []
+
+    def term(c):
+        return compounds[c >> 1] if c & 1 else symbols[c >> 1]
+
+    i = 0
+    while i < n_comp:
+        n = comp_ints[i + 1]
+        compounds.append(compound(symbols[comp_ints[i]], tuple(term(c) for c in comp_ints[i + 2:i + 2 + n])))
+        i += 2 + n
+
+    index = FactIndex()
+    i = 0
+    while i < n_atom:
+        n, neg = divmod(atom_ints[i + 1], 2)
+        index.add(atom(symbols[atom_ints[i]], tuple(term(c) for c in atom_ints[i + 2:i + 2 + n]), bool(neg)))
+        i += 2 + n
+    stats = {'firings': firings, 'rounds': rounds, 'stopped_early': bool(flags)}
+    return index, stats, digest, n_input
+
+
+def load_or_saturate(paths, snapshot_path, verbose=False):
+    """
+    Closure of the knowledge base in paths: read from snapshot_path when its
+    digest matches the inputs, otherwise (or if the snapshot is damaged)
+    parsed, saturated and snapshotted. Returns (index, stats).
+    """
+    digest = content_hash(paths)
+    if read_digest(snapshot_path) == digest:
+        try:
+            index, stats, _, _ = read_snapshot(snapshot_path)
+        except ValueError:
+            pass   # stale: rebuild it below
+        else:
+            if verbose:
+                print(f"Loaded {len(index)} facts from {snapshot_path}")
+            return index, stats
+    rules, facts, digest = load_kb(paths)
+    index, stats = saturate(rules, facts)
+    write_snapshot(snapshot_path, index, stats, digest, len(facts))
+    if verbose:
+        print(f"Saturated {len(facts)} facts and {len(rules)} rules to {len(index)} facts; wrote {snapshot_path}")
+    return index, stats
+
+
+# ---------------------------
+# Demo / Example usage
+# ---------------------------
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import time
+
+    kb_path = os.path.join(tempfile.gettempdir(), "family_kb.txt")
+    snap_path = kb_path + ".kbs"
+    with open(kb_path, 'w') as f:
+        f.write("# rules\n"
+                "Parent(x,y) -> Ancestor(x,y)\n"
+                "Ancestor(x,y) & Parent(y,z) -> Ancestor(x,z)\n"
+                "# facts\n")
+        for i in range(300):
+            f.write(f"Parent(P{i}, P{i + 1})\n")
+
+    for attempt in ("cold", "warm"):
+        start = time.perf_counter()
+        index, stats = load_or_saturate([kb_path], snap_path, verbose=True)
+        print(f"{attempt}: {len(index)} facts in {time.perf_counter() - start:.3f}s", stats)
+    print(atom_to_str(next(reversed(index.facts))))
@@ -0,0 +1,223 @@
+import math
+import random
+import time
+
+from tic_tac_toe import TicTacToe, HumanPlayer, play
+
+# ---------------------------
+# Board geometry shared by every rollout
+# ---------------------------
+_LINES_CACHE = {}
+
+
+def cell_lines(game):
+    """For every square, the winning lines (tuples of squares) through it."""
+    windows = getattr(game, 'windows', None)  # MNKGame keeps its k-windows
+    key = (len(game.board), getattr(game, 'n', 3), getattr(game, 'k', 3))
+    if key not in _LINES_CACHE:
+        if windows is None:
+            windows = [(0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6),
+                       (1, 4, 7), (2, 5, 8), (0, 4, 8), (2, 4, 6)]
+        through = [[] for _ in game.board]
+        for line in windows:
+            for sq in line:
+                through[sq].append(line)
+        _LINES_CACHE[key] = [tuple(t) for t in through]
+    return _LINES_CACHE[key]
+
+
+def other(letter):
+    return 'O' if letter == 'X' else 'X'
+
+
+# ---------------------------
+# Array-backed search tree
+# ---------------------------
+class Tree:
+    """
+    Nodes are integer ids into parallel lists instead of one object per node.
+    letter[i] is the player who made move[i] to reach node i, and wins[i] is
+    counted from that player's point of view (a draw counts half).
+    """
+    def __init__(self):
+        self.parent = []
+        self.move = []
+        self.letter = []
+        self.children = []
+        self.untried = []
+        self.visits = []
+        self.wins = []
+
+    def add(self, parent, move, letter, untried):
+        self.parent.append(parent)
+        self.move.append(move)
+        self.letter.append(letter)
+        self.children.append([])
+        self.untried.append(untried)
+        self.visits.append(0)
+        self.wins.append(0.0)
+        node = len(self.move) - 1
+        if parent >= 0:
+            self.children[parent].append(node)
+        return node
+
+    def __len__(self):
+        return len(self.move)
+
+    def subtree(self, root):
+        """Copy of the subtree under `root` (which becomes node 0)."""
+        new = Tree()
+        stack = [(root, -1)]
+        while stack:
+            old, new_parent = stack.pop()
+            node = new.add(new_parent, self.move[old], self.letter[old], list(self.untried[old]))
+            new.visits[node] = self.visits[old]
+            new.wins[node] = self.wins[old]
+            stack.extend((child, node) for child in self.children[old])
+        new.parent[0] = -1
+        return new
+
+
+# ---------------------------
+# MCTS player
+# ---------------------------
+class MCTSPlayer:
+    """
+    Monte Carlo Tree Search with UCT selection. Works with anything that
+    exposes the TicTacToe interface (board list, available_moves, make_move,
+    current_winner), including MNKGame.
+
+    Give it either `iterations` (tree descents per move) or `time_limit`
+    (seconds per move); every descent runs `batch` random rollouts from the
+    new leaf. With reuse_tree=True the statistics of the subtree that was
+    actually played into are kept for the next move.
+    """
+    def __init__(self, letter, iterations=2000, time_limit=None, batch=4,
+                 exploration=math.sqrt(2), reuse_tree=True, seed=None):
+        self.letter = letter
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.batch = batch
+        self.exploration = exploration
+        self.reuse_tree = reuse_tree
+        self.rng = random.Random(seed)
+        self.tree = None
+        self.expected_board = None  # board right after our last move
+
+    def get_move(self, game):
+        board = list(game.board)
+        lines = cell_lines(game)
+        self.tree = self._reused_tree(board) if self.reuse_tree else None
+        if self.tree is None:
+            self.tree = Tree()
+            self.tree.add(-1, None, other(self.letter), [i for i, s in enumerate(board) if s == ' '])
+
+        # always at least one descent, so the root has a child to pick
+        if self.time_limit is not None:
+            deadline = time.perf_counter() + self.time_limit
+            self._iterate(board, lines)
+            while time.perf_counter() < deadline:
+                self._iterate(board, lines)
+        else:
+            for _ in range(max(1, self.iterations)):
+                self._iterate(board, lines)
+
+        tree = self.tree
+        best = max(tree.children[0], key=lambda c: tree.visits[c])
+        self.expected_board = board
+        self.expected_board[tree.move[best]] = self.letter
+        self.tree = tree.subtree(best)
+        return tree.move[best]
+
+    def _reused_tree(self, board):
+        """Follow the opponent's reply from the subtree we kept; None if it cannot be found."""
+        if self.tree is None or self.expected_board is None:
+            return None
+        changed = [i for i, (a, b) in enumerate(zip(self.expected_board, board)) if a != b]
+        if len(changed) != 1 or board[changed[0]] != other(self.letter):
+            return None
+        for child in self.tree.children[0]:
+            if self.tree.move[child] == changed[0]:
+                return self.tree.subtree(child)
+        return None
+
+    def _iterate(self, root_board, lines):
+        tree = self.tree
+        rng = self.rng
+        board = root_board[:]
+        node = 0
+        winner = None
+        c = self.exploration
+
+        # 1. selection: descend fully expanded nodes by UCT
+        while not tree.untried[node] and tree.children[node]:
+            log_n = math.log(tree.visits[node])
+            visits, wins = tree.visits, tree.wins
+            node = max(tree.children[node],
+                       key=lambda ch: wins[ch] / visits[ch] + c * math.sqrt(log_n / visits[ch]))
+            sq = tree.move[node]
+            board[sq] = tree.letter[node]
+            if self._wins(board, sq, tree.letter[node], lines):
+                winner = tree.letter[node]
+                break
+
+        # 2. expansion: add one untried move
+        if winner is None and tree.untried[node]:
+            untried = tree.untried[node]
+            sq = untried.pop(rng.randrange(len(untried)))
+            letter = other(tree.letter[node])
+            board[sq] = letter
+            if self._wins(board, sq, letter, lines):
+                winner = letter
+                rest = []
+            else:
+                rest = [i for i, s in enumerate(board) if s == ' ']
+            node = tree.add(node, sq, letter, rest)
+
+        # 3. simulation: a batch of random playouts from the leaf
+        if winner is not None:
+            x_score = float(self.batch) if winner == 'X' else 0.0
+        elif ' ' not in board:
+            x_score = self.batch * 0.5
+        else:
+            x_score = 0.0
+            empties = [i for i, s in enumerate(board) if s == ' ']
+            first = other(tree.letter[node])
+            for _ in range(self.batch):
+                x_score += self._rollout(board, empties, first, lines)
+
+        # 4. backpropagation
+        while node >= 0:
+            tree.visits[node] += self.batch
+            tree.wins[node] += x_score if tree.letter[node] == 'X' else self.batch - x_score
+            node = tree.parent[node]
+
+    def _rollout(self, board, empties, letter, lines):
+        """One random playout on a copy of the board; 1 = X wins, 0 = O wins, 0.5 = draw."""
+        b = board[:]
+        order = empties[:]
+        self.rng.shuffle(order)
+        for sq in order:
+            b[sq] = letter
+            if self._wins(b, sq, letter, lines):
+                return 1.0 if letter == 'X' else 0.0
+            letter = 'O' if letter == 'X' else 'X'
+        return 0.5
+
+    @staticmethod
+    def _wins(board, sq, letter, lines):
+        for line in lines[sq]:
+            for cell in line:
+                if board[cell] != letter:
+                    break
+            else:
+                return True
+        return False
+
+
+if __name__ == '__main__':
+    # Play against MCTS (2000 descents x 4 rollouts per move)
+    x_player = HumanPlayer('X')
+    o_player = MCTSPlayer('O', iterations=2000)
+    t = TicTacToe()
+    play(t, x_player, o_player, print_game=True)
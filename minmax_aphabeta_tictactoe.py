@@ -1,3 +1,5 @@
+from tic_tac_toe_table import lookup
+
 player, opponent = 'x', 'o'
 
 def isMovesLeft(board):
@@ -91,12 +93,18 @@ def simulate_optimal_game(start_board, start_turn='x'):
             print("Result: Draw")
             return
 
-        if current == player:
+        actor = "Player (x)" if current == player else "Opponent (o)"
+        entry = lookup(board, current)
+        if entry is not None:
+            # precomputed solution table (tic_tac_toe_table.py); its score is for
+            # the side to move, convert it to the +10/-10 scale used here
+            move = divmod(entry[0], 3)
+            sign = (entry[1] > 0) - (entry[1] < 0)
+            val = 10 * sign if current == player else -10 * sign
+        elif current == player:
             val, move = minimax(board, 0, True)
-            actor = "Player (x)"
         else:
             val, move = minimax(board, 0, False)
-            actor = "Opponent (o)"
 
         if move is None:
             # No move possible (shouldn't happen because we checked moves left)
@@ -0,0 +1,272 @@
+import random
+import time
+
+from tic_tac_toe import TicTacToe, AIPlayer, HumanPlayer, play
+
+# ---------------------------
+# m,n,k board (generalised tic-tac-toe / gomoku)
+# ---------------------------
+EMPTY = ' '
+WIN_SCORE = 10 ** 9
+
+
+class MNKGame(TicTacToe):
+    """
+    m x n board where k in a row (horizontal, vertical or diagonal) wins.
+    MNKGame(3, 3, 3) plays exactly like TicTacToe, MNKGame(15, 15, 5) is gomoku.
+
+    Besides the TicTacToe interface it keeps, incrementally on every move:
+      - stone counts for every k-cell window ("line") -> threat evaluation
+      - a Zobrist hash of the position
+      - how many stones are near each cell -> candidate move generation
+    """
+    def __init__(self, m=7, n=7, k=5, radius=2, seed=2024):
+        self.m, self.n, self.k = m, n, k
+        self.radius = radius
+        self.board = [EMPTY for _ in range(m * n)]
+        self.current_winner = None
+        self.history = []  # squares in the order they were played
+
+        # every k-long window on the board, and the windows through each cell
+        self.windows = []
+        for r in range(m):
+            for c in range(n):
+                for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_r, end_c = r + dr * (k - 1), c + dc * (k - 1)
+                    if 0 <= end_r < m and 0 <= end_c < n:
+                        self.windows.append(tuple((r + dr * i) * n + (c + dc * i) for i in range(k)))
+        self.cell_windows = [[] for _ in range(m * n)]
+        for w, cells in enumerate(self.windows):
+            for cell in cells:
+                self.cell_windows[cell].append(w)
+        self.count = {'X': [0] * len(self.windows), 'O': [0] * len(self.windows)}
+        self.threat_weight = [0] + [10 ** i for i in range(k)]  # weight of a window holding i stones
+
+        # neighbourhood used to keep candidate moves close to existing stones
+        self.neighbors = []
+        for sq in range(m * n):
+            r, c = divmod(sq, n)
+            self.neighbors.append([rr * n + cc
+                                   for rr in range(max(0, r - radius), min(m, r + radius + 1))
+                                   for cc in range(max(0, c - radius), min(n, c + radius + 1))
+                                   if (rr, cc) != (r, c)])
+        self.near = [0] * (m * n)
+
+        rng = random.Random(seed)
+        self.zobrist = {'X': [rng.getrandbits(64) for _ in range(m * n)],
+                        'O': [rng.getrandbits(64) for _ in range(m * n)]}
+        self.hash = 0
+        self.score = 0  # line-threat evaluation from X's point of view
+
+    def print_board(self):
+        for r in range(self.m):
+            print('| ' + ' | '.join(self.board[r * self.n:(r + 1) * self.n]) + ' |')
+
+    def print_board_nums(self):
+        width = len(str(self.m * self.n - 1))
+        for r in range(self.m):
+            print('| ' + ' | '.join(str(i).rjust(width) for i in range(r * self.n, (r + 1) * self.n)) + ' |')
+
+    def _window_value(self, x, o):
+        if o == 0:
+            return self.threat_weight[x]
+        if x == 0:
+            return -self.threat_weight[o]
+        return 0  # blocked window, nobody can win here
+
+    def make_move(self, square, letter):
+        # Make a move if valid, return True if valid
+        if self.board[square] != EMPTY:
+            return False
+        self.board[square] = letter
+        self.history.append(square)
+        self.hash ^= self.zobrist[letter][square]
+        xs, os_ = self.count['X'], self.count['O']
+        own = self.count[letter]
+        won = False
+        for w in self.cell_windows[square]:
+            before = self._window_value(xs[w], os_[w])
+            own[w] += 1
+            self.score += self._window_value(xs[w], os_[w]) - before
+            if own[w] == self.k:
+                won = True
+        for nb in self.neighbors[square]:
+            self.near[nb] += 1
+        if won:
+            self.current_winner = letter
+        return True
+
+    def undo_move(self, square):
+        letter = self.board[square]
+        self.board[square] = EMPTY
+        self.history.pop()
+        self.hash ^= self.zobrist[letter][square]
+        xs, os_ = self.count['X'], self.count['O']
+        own = self.count[letter]
+        for w in self.cell_windows[square]:
+            before = self._window_value(xs[w], os_[w])
+            own[w] -= 1
+            self.score += self._window_value(xs[w], os_[w]) - before
+        for nb in self.neighbors[square]:
+            self.near[nb] -= 1
+        self.current_winner = None
+
+    def winner(self, square, letter):
+        # Check if the stone on `square` completes k in a row for `letter`
+        own = self.count[letter]
+        return any(own[w] == self.k for w in self.cell_windows[square])
+
+    def candidate_moves(self):
+        """Empty squares within `radius` of a stone (the centre on an empty board)."""
+        if not self.history:
+            return [(self.m // 2) * self.n + self.n // 2]
+        return [sq for sq, spot in enumerate(self.board) if spot == EMPTY and self.near[sq]]
+
+    def move_priority(self, square):
+        """How much the windows through `square` matter to either side (for move ordering)."""
+        xs, os_ = self.count['X'], self.count['O']
+        total = 0
+        for w in self.cell_windows[square]:
+            if os_[w] == 0:
+                total += self.threat_weight[xs[w] + 1] if xs[w] + 1 < len(self.threat_weight) else WIN_SCORE
+            if xs[w] == 0:
+                total += self.threat_weight[os_[w] + 1] if os_[w] + 1 < len(self.threat_weight) else WIN_SCORE
+        return total
+
+
+# ---------------------------
+# Iterative-deepening alpha-beta player
+# ---------------------------
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class MNKAIPlayer(AIPlayer):
+    """
+    AIPlayer for MNKGame boards: negamax alpha-beta with a Zobrist-keyed
+    transposition table, deepened one ply at a time until `time_limit`
+    seconds have passed. The best move of the deepest finished iteration
+    is returned, so the deadline is always respected.
+    """
+    def __init__(self, letter, time_limit=1.0, max_depth=None):
+        super().__init__(letter)
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.table = {}  # hash -> (depth, value, flag, best move)
+        self.nodes = 0
+        self.last_depth = 0
+
+    def get_move(self, game):
+        self.deadline = time.perf_counter() + self.time_limit
+        self.nodes = 0
+        moves = self.ordered_moves(game, None)
+        best_move = moves[0]
+        max_depth = self.max_depth or game.num_empty_squares()
+        for depth in range(1, max_depth + 1):
+            try:
+                score, move = self.search_root(game, depth, moves)
+            except SearchTimeout:
+                break
+            best_move = move
+            self.last_depth = depth
+            # try the previous best move first in the next iteration
+            moves.remove(move)
+            moves.insert(0, move)
+            if abs(score) >= WIN_SCORE - game.m * game.n:
+                break  # forced win or loss found, deeper search cannot change it
+        return best_move
+
+    def search_root(self, game, depth, moves):
+        alpha, beta = -WIN_SCORE - 1, WIN_SCORE + 1
+        best_score, best_move = -WIN_SCORE - 1, moves[0]
+        for square in moves:
+            game.make_move(square, self.letter)
+            try:
+                score = -self.negamax(game, depth - 1, -beta, -alpha, self.other(self.letter), 1)
+            finally:
+                game.undo_move(square)
+            if score > best_score:
+                best_score, best_move = score, square
+            alpha = max(alpha, score)
+        return best_score, best_move
+
+    def negamax(self, game, depth, alpha, beta, letter, ply):
+        self.nodes += 1
+        if self.nodes & 255 == 0 and time.perf_counter() > self.deadline:
+            raise SearchTimeout
+
+        if game.current_winner:
+            # the previous move (by the other player) won
+            return -(WIN_SCORE - ply)
+        if not game.empty_squares():
+            return 0
+        if depth == 0:
+            return game.score if letter == 'X' else -game.score
+
+        alpha_orig = alpha
+        entry = self.table.get(game.hash)
+        tt_move = None
+        if entry is not None:
+            e_depth, e_value, e_flag, tt_move = entry
+            if e_depth >= depth:
+                if e_flag == EXACT:
+                    return e_value
+                if e_flag == LOWER:
+                    alpha = max(alpha, e_value)
+                elif e_flag == UPPER:
+                    beta = min(beta, e_value)
+                if alpha >= beta:
+                    return e_value
+
+        best_score, best_move = -WIN_SCORE - 1, None
+        other = self.other(letter)
+        for square in self.ordered_moves(game, tt_move):
+            game.make_move(square, letter)
+            try:
+                score = -self.negamax(game, depth - 1, -beta, -alpha, other, ply + 1)
+            finally:
+                game.undo_move(square)
+            if score > best_score:
+                best_score, best_move = score, square
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_score <= alpha_orig:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table[game.hash] = (depth, best_score, flag, best_move)
+        return best_score
+
+    @staticmethod
+    def ordered_moves(game, first):
+        if isinstance(game, MNKGame):
+            moves = sorted(game.candidate_moves(), key=game.move_priority, reverse=True)
+        else:
+            moves = game.available_moves()
+        if first is not None and first in moves:
+            moves.remove(first)
+            moves.insert(0, first)
+        return moves
+
+    @staticmethod
+    def other(letter):
+        return 'O' if letter == 'X' else 'X'
+
+
+if __name__ == '__main__':
+    # AI vs AI on a 7x7 board, 5 in a row, half a second per move
+    game = MNKGame(7, 7, 5)
+    x_player = MNKAIPlayer('X', time_limit=0.5)
+    o_player = MNKAIPlayer('O', time_limit=0.5)
+    winner = play(game, x_player, o_player, print_game=True)
+    print('Result:', winner or 'tie')
+
+    # Play against it yourself:
+    # play(MNKGame(15, 15, 5), HumanPlayer('X'), MNKAIPlayer('O', time_limit=2.0))
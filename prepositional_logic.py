@@ -1,39 +1,32 @@
-import itertools
+from fol_to_cnf import And, Implies, Not, Or, Parser, Var, elim_impl, to_nnf, tokenize
+from bdd import AND, OR, BDD, force_order
+from sat_solver import CDCLSolver
 
 # Logical implication
 def implies(a, b):
     return (not a) or b
 
-def truth_table():
-    rows = list(itertools.product([False, True], repeat=3))
+def truth_table(show_rows=True):
+    """
+    Models of KB = (Q->P) ∧ (P->¬Q) ∧ (Q∨R) as (P, Q, R) rows. Every column is
+    computed at once with the bit-parallel checker below; the row-by-row
+    table is only a view and is printed when show_rows is set.
+    """
+    kb, queries = ["Q -> P", "P -> ¬Q", "Q ∨ R"], ["R", "R -> P", "Q -> R"]
+    _, width, cols = next(bit_columns([_conjoin(kb)] + kb + queries, "PQR"))
+    kb_col = cols[0]
+    if show_rows:
+        print(f"{'P':^3}{'Q':^3}{'R':^3} | {'Q->P':^5}{'P->¬Q':^6}{'Q∨R':^5} | {'KB':^3} || {'R':^3}{'R->P':^6}{'Q->R':^6}")
+        print("-"*65)
+        for row in range(width):
+            bit = lambda col: col >> row & 1
+            P, Q, R = (row >> 2 & 1, row >> 1 & 1, row & 1)
+            print(f"{P:^3}{Q:^3}{R:^3} | "
+                  f"{bit(cols[1]):^5}{bit(cols[2]):^6}{bit(cols[3]):^5} | "
+                  f"{bit(kb_col):^3} || "
+                  f"{bit(cols[4]):^3}{bit(cols[5]):^6}{bit(cols[6]):^6}")
 
-    print(f"{'P':^3}{'Q':^3}{'R':^3} | {'Q->P':^5}{'P->¬Q':^6}{'Q∨R':^5} | {'KB':^3} || {'R':^3}{'R->P':^6}{'Q->R':^6}")
-    print("-"*65)
-
-    kb_rows = []  # rows where KB is true
-
-    for row in rows:
-        P, Q, R = row
-
-        expr1 = implies(Q, P)         # Q -> P
-        expr2 = implies(P, not Q)     # P -> ¬Q
-        expr3 = Q or R                # Q ∨ R
-        KB = expr1 and expr2 and expr3
-
-        # Queries
-        query_R = R
-        query_R_implies_P = implies(R, P)
-        query_Q_implies_R = implies(Q, R)
-
-        print(f"{int(P):^3}{int(Q):^3}{int(R):^3} | "
-              f"{int(expr1):^5}{int(expr2):^6}{int(expr3):^5} | "
-              f"{int(KB):^3} || "
-              f"{int(query_R):^3}{int(query_R_implies_P):^6}{int(query_Q_implies_R):^6}")
-
-        if KB:
-            kb_rows.append((P, Q, R))
-
-    return kb_rows
+    return [tuple(bool(row >> k & 1) for k in (2, 1, 0)) for row in range(width) if kb_col >> row & 1]
 
 
 def check_entailments(kb_rows):
@@ -50,6 +43,279 @@ def check_entailments(kb_rows):
     print("KB ⊨ (Q → R):", "YES" if entails(query_Q_implies_R) else "NO")
 
 
+# ---------------------------
+# Bit-parallel model checking
+# ---------------------------
+# Row r of the truth table over variables v0..v(n-1) gives vk the value of
+# bit n-1-k of r (the order of itertools.product). A column is a Python int
+# with bit r set iff the formula holds in row r, so one &, | or ~ evaluates
+# a connective over every row at once. Tables are built in chunks of 2^chunk_bits
+# rows: the last chunk_bits variables alternate inside a chunk and the others
+# are constant, which keeps memory bounded for ~30 variables.
+def _operands(node):
+    if isinstance(node, Not):
+        return (node.child,)
+    if isinstance(node, (And, Or)):
+        return node.args
+    if isinstance(node, Implies):
+        return (node.left, node.right)
+    if isinstance(node, Var):
+        return ()
+    raise ValueError(f"not a propositional formula: {node}")
+
+
+def _compile(roots):
+    """Distinct subformulas of roots in evaluation order (operands first)."""
+    order, done = [], set()
+    stack = list(roots)
+    while stack:
+        node = stack[-1]
+        if node in done:
+            stack.pop()
+            continue
+        pending = [k for k in _operands(node) if k not in done]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        done.add(node)
+        order.append(node)
+    return order
+
+
+def _alternating(j, width):
+    """width bits where bit i is bit j of i: 2^j zeros, 2^j ones, repeated."""
+    half = 1 << j
+    col, span = ((1 << half) - 1) << half, 2 * half
+    while span < width:
+        col |= col << span
+        span *= 2
+    return col
+
+
+def bit_columns(formulas, variables=None, chunk_bits=20):
+    """
+    Truth-table columns of formula strings, chunk by chunk: yields
+    (first row, rows in chunk, [column of each formula]). variables fixes the
+    variable order (default: the atoms of the formulas, sorted).
+    """
+    roots = [Parser(tokenize(f)).parse() for f in formulas]
+    order = _compile(roots)
+    names = _atoms(formulas) if variables is None else list(variables)
+    n = len(names)
+    w = min(chunk_bits, n)
+    width = 1 << w
+    ones = (1 << width) - 1
+    inner = {name: _alternating(n - 1 - k, width) for k, name in enumerate(names) if k >= n - w}
+    for chunk in range(1 << (n - w)):
+        col = {}
+        for k, name in enumerate(names[:n - w]):
+            col[Var(name)] = ones if chunk >> (n - w - 1 - k) & 1 else 0
+        for name, pattern in inner.items():
+            col[Var(name)] = pattern
+        for node in order:
+            if isinstance(node, Var):
+                if node not in col:
+                    raise ValueError(f"{node.name} is not among the variables {names}")
+            elif isinstance(node, Not):
+                col[node] = ones ^ col[node.child]
+            elif isinstance(node, And):
+                acc = ones
+                for a in node.args:
+                    acc &= col[a]
+                col[node] = acc
+            elif isinstance(node, Or):
+                acc = 0
+                for a in node.args:
+                    acc |= col[a]
+                col[node] = acc
+            else:
+                col[node] = (ones ^ col[node.left]) | col[node.right]
+        yield chunk * width, width, [col[r] for r in roots]
+
+
+def _conjoin(kb):
+    return kb if isinstance(kb, str) else " ∧ ".join(f"({f})" for f in kb)
+
+
+def _atoms(formulas):
+    return sorted({n.name for n in _compile([Parser(tokenize(f)).parse() for f in formulas]) if isinstance(n, Var)})
+
+
+def _row_to_model(row, names):
+    n = len(names)
+    return {name: bool(row >> (n - 1 - k) & 1) for k, name in enumerate(names)}
+
+
+def count_models(kb, variables=None):
+    """Number of assignments to the variables that satisfy every formula of kb."""
+    return sum(col.bit_count() for _, _, (col,) in bit_columns([_conjoin(kb)], variables))
+
+
+def models(kb, variables=None):
+    """The models of kb as {variable: bool}, in truth-table order."""
+    formula = _conjoin(kb)
+    names = _atoms([formula]) if variables is None else list(variables)
+    for first, _, (col,) in bit_columns([formula], names):
+        while col:
+            low = col & -col
+            yield _row_to_model(first + low.bit_length() - 1, names)
+            col ^= low
+
+
+def bitset_entails(kb, query):
+    """
+    KB ⊨ query by model checking: the chunk columns must satisfy
+    KB & ~query == 0. Returns (True, None) or (False, countermodel).
+    """
+    formulas = [_conjoin(kb), query]
+    names = _atoms(formulas)
+    for first, width, (kb_col, q_col) in bit_columns(formulas, names):
+        bad = kb_col & ~q_col
+        if bad:
+            return False, _row_to_model(first + (bad & -bad).bit_length() - 1, names)
+    return True, None
+
+
+# ---------------------------
+# Entailment by SAT: KB ⊨ q iff KB ∧ ¬q is unsatisfiable
+# ---------------------------
+def encode(formulas):
+    """
+    Integer clauses for the conjunction of propositional formula strings
+    ('Q -> P', 'P -> ¬Q', 'Q ∨ R', ...) and the numbering {atom: var}.
+    Formulas go to NNF and then to clauses the definitional (Tseitin) way,
+    as in fol_to_cnf.tseitin_cnf: a conjunction inside a disjunction gets a
+    fresh variable d with clauses ¬d ∨ conjunct, so the size stays linear.
+    """
+    nnf = to_nnf(elim_impl(And(*(Parser(tokenize(f)).parse() for f in formulas))))
+    atoms = {}
+    clauses = []
+    defs = {}
+    pending = []
+
+    def literal(m):
+        if isinstance(m, Not):
+            return -literal(m.child)
+        if isinstance(m, Var):
+            return atoms.setdefault(m.name, len(atoms) + len(defs) + 1)
+        if isinstance(m, And):
+            if m not in defs:
+                defs[m] = len(atoms) + len(defs) + 1
+                pending.append(m)
+            return defs[m]
+        raise ValueError(f"not a propositional formula: {m}")
+
+    def clause_of(m):
+        return list(dict.fromkeys(literal(a) for a in (m.args if isinstance(m, Or) else (m,))))
+
+    for c in (nnf.args if isinstance(nnf, And) else (nnf,)):
+        clauses.append(clause_of(c))
+    i = 0
+    while i < len(pending):
+        m = pending[i]
+        i += 1
+        for c in m.args:
+            clauses.append([-defs[m]] + clause_of(c))
+    return clauses, atoms
+
+
+def entails(kb, query, stats=None):
+    """
+    Decide KB ⊨ query with the CDCL solver. kb is a formula string or a list
+    of them. Returns (True, None), or (False, countermodel) where the
+    countermodel {atom: bool} satisfies the KB and falsifies the query.
+    Pass a dict as stats to get the solver counters.
+    """
+    if isinstance(kb, str):
+        kb = [kb]
+    clauses, atoms = encode(list(kb) + [f"¬({query})"])
+    solver = CDCLSolver(clauses, len(atoms))
+    satisfiable = solver.solve()
+    if stats is not None:
+        stats.update(solver.stats)
+    if not satisfiable:
+        return True, None
+    return False, {name: solver.model[v] for name, v in sorted(atoms.items())}
+
+
+# ---------------------------
+# Compiled knowledge base (BDD)
+# ---------------------------
+class CompiledKB:
+    """
+    A KB compiled once into a reduced ordered BDD, for many queries against
+    the same KB. Formula nodes are hash-consed and the BDD of every
+    subformula is remembered, so a query only builds the BDD of the parts
+    of q not seen before, and KB ⊨ q is the test root -> q, whose results
+    are cached in the manager too. Variables are ordered by force_order()
+    over the conjuncts of the KB.
+    """
+    def __init__(self, kb, order=None):
+        roots = [Parser(tokenize(f)).parse() for f in ([kb] if isinstance(kb, str) else kb)]
+        conjuncts = [c for r in roots for c in (r.args if isinstance(r, And) else (r,))]
+        if order is None:
+            order = force_order([[n.name for n in _compile([c]) if isinstance(n, Var)] for c in conjuncts])
+        self.variables = list(order)
+        self.bdd = BDD(order)
+        self.built = {}   # formula node -> BDD node
+        self.root = self.bdd.conj(self._build(c) for c in conjuncts)
+
+    def _build(self, formula):
+        bdd, built = self.bdd, self.built
+        for node in _compile([formula]):
+            if node in built:
+                continue
+            if isinstance(node, Var):
+                u = bdd.var(node.name)
+            elif isinstance(node, Not):
+                u = bdd.neg(built[node.child])
+            elif isinstance(node, And):
+                u = bdd.conj(built[a] for a in node.args)
+            elif isinstance(node, Or):
+                u = bdd.disj(built[a] for a in node.args)
+            else:
+                u = bdd.apply(OR, bdd.neg(built[node.left]), built[node.right])
+            built[node] = u
+        return built[formula]
+
+    def entails(self, query):
+        """(True, None) or (False, countermodel) as for entails()."""
+        q = self._build(Parser(tokenize(query)).parse())
+        if self.bdd.implies(self.root, q):
+            return True, None
+        model = self.bdd.any_model(self.bdd.apply(AND, self.root, self.bdd.neg(q)))
+        return False, {name: model.get(name, False) for name in sorted(set(self.variables) | set(model))}
+
+    def count_models(self):
+        """Number of models over the variables of the KB."""
+        return self.bdd.count(self.root, len(self.variables))
+
+    def stats(self):
+        return dict(self.bdd.stats(), kb_nodes=self.bdd.size(self.root))
+
+
 if __name__ == "__main__":
     kb_rows = truth_table()
     check_entailments(kb_rows)
+
+    kb = ["Q -> P", "P -> ¬Q", "Q ∨ R"]
+    print("\nModels of the KB:", list(models(kb)), "count:", count_models(kb))
+    print("KB ⊨ (R -> P) by bitsets:", bitset_entails(kb, "R -> P"))
+
+    print("\nCDCL Entailment Results:")
+    for q in ["R", "R -> P", "Q -> R"]:
+        holds, countermodel = entails(kb, q)
+        print(f"KB ⊨ ({q}):", "YES" if holds else f"NO, countermodel {countermodel}")
+
+    compiled = CompiledKB(kb)
+    print("\nCompiled KB:", compiled.count_models(), "models,", compiled.stats())
+    for q in ["R", "R -> P", "Q -> R"]:
+        print(f"KB ⊨ ({q}):", compiled.entails(q))
+
+    # a chain far beyond truth tables: X0, X0 -> X1, ..., X499 -> X500
+    n = 500
+    chain = ["X0"] + [f"X{i} -> X{i + 1}" for i in range(n)]
+    stats = {}
+    print(f"\nchain of {n} implications ⊨ X{n}:", entails(chain, f"X{n}", stats)[0], stats)
+    print(f"chain of {n} implications ⊨ ¬X{n}:", entails(chain, f"¬X{n}")[0])
@@ -0,0 +1,450 @@
+import heapq
+import importlib.machinery
+import importlib.util
+import os
+import time
+from collections import defaultdict
+
+from forward_reasoning import Bindings
+from term_index import DiscriminationTree, flatten
+from terms import Compound, SYMBOL_IS_VAR, SYMBOL_NAMES, atom, atom_to_str, intern_symbol, parse_atom
+
+# ---------------------------
+# Ground resolution step from 'Resolution Tree'
+# ---------------------------
+_RESOLUTION_TREE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Resolution Tree')
+_resolution_tree = None
+
+
+def _load_resolution_tree():
+    # 'Resolution Tree' has no .py extension, so load it by path
+    global _resolution_tree
+    if _resolution_tree is None:
+        loader = importlib.machinery.SourceFileLoader('resolution_tree', _RESOLUTION_TREE_PATH)
+        _resolution_tree = importlib.util.module_from_spec(importlib.util.spec_from_loader(loader.name, loader))
+        loader.exec_module(_resolution_tree)
+    return _resolution_tree
+
+
+def resolve(clause1, clause2):
+    """resolve() of 'Resolution Tree': the resolvent of two ground clauses (sets of literal strings) or None."""
+    return _load_resolution_tree().resolve(clause1, clause2)
+
+
+# ---------------------------
+# Literals and clauses
+# ---------------------------
+def parse_literal(text):
+    """'-Loves(x, Sk1(x))' / '¬P' / 'C_Scrooge' -> Atom (negation kept in atom.neg)."""
+    text = text.strip()
+    neg = text[:1] in ('-', '¬')
+    if neg:
+        text = text[1:].strip()
+    if '(' in text:
+        return parse_atom(text, neg)
+    return atom(intern_symbol(text), (), neg)
+
+
+def literal_to_str(lit):
+    body = atom_to_str(lit) if lit.args else SYMBOL_NAMES[lit.pred]
+    return '-' + body if lit.neg else body
+
+
+def _key(lit):
+    return lit.pred, len(lit.args), lit.neg
+
+
+def _complement(lit):
+    return atom(lit.pred, lit.args, not lit.neg)
+
+
+def _variables(lits):
+    out = {}
+    for lit in lits:
+        if lit.ground:
+            continue
+        stack = list(lit.args)
+        while stack:
+            t = stack.pop()
+            if type(t) is int:
+                if SYMBOL_IS_VAR[t]:
+                    out[t] = None
+            elif not t.ground:
+                stack.extend(t.args)
+    return list(out)
+
+
+class Clause:
+    """A kept clause: distinct literals, where it came from, and its state in the prover."""
+    __slots__ = ('id', 'lits', 'text', 'parents', 'rule', 'alive', 'usable', 'anchor')
+
+    def __init__(self, cid, lits, parents, rule):
+        self.id = cid
+        self.lits = lits
+        self.text = frozenset(literal_to_str(l) for l in lits)
+        self.parents = parents
+        self.rule = rule        # 'input', 'goal', 'resolve' or 'factor'
+        self.alive = True       # False once backward-subsumed
+        self.usable = False     # True once it has been the given clause
+        self.anchor = None      # where it is filed for forward subsumption
+
+    @property
+    def ground(self):
+        return all(l.ground for l in self.lits)
+
+    def __str__(self):
+        return '{' + ', '.join(literal_to_str(l) for l in self.lits) + '}' if self.lits else '{} (EMPTY CLAUSE)'
+
+
+def is_tautology(lits):
+    lit_set = set(lits)
+    return any(_complement(l) in lit_set for l in lits)
+
+
+def _match(pattern, target, theta, trail):
+    """One-way matching of two atoms: binds only the variables of pattern (undo via trail)."""
+    if pattern.pred != target.pred or pattern.neg != target.neg or len(pattern.args) != len(target.args):
+        return False
+    stack = list(zip(pattern.args, target.args))
+    while stack:
+        p, t = stack.pop()
+        if type(p) is int:
+            if SYMBOL_IS_VAR[p]:
+                if p in theta:
+                    if theta[p] is not t:
+                        return False
+                else:
+                    theta[p] = t
+                    trail.append(p)
+            elif p != t:
+                return False
+        elif p is not t:
+            if p.ground or not isinstance(t, Compound) or p.functor != t.functor or len(p.args) != len(t.args):
+                return False
+            stack.extend(zip(p.args, t.args))
+    return True
+
+
+def subsumes(d, c):
+    """True if clause d subsumes clause c: some substitution maps every literal of d into c."""
+    if len(d.lits) > len(c.lits):
+        return False
+    c_set = set(c.lits)
+    if all(l.ground for l in d.lits):
+        return c_set.issuperset(d.lits)
+    by_key = defaultdict(list)
+    for l in c.lits:
+        by_key[_key(l)].append(l)
+    # most constrained literals of d first
+    pattern = sorted(d.lits, key=lambda l: (not l.ground, len(by_key.get(_key(l), ()))))
+    theta, trail = {}, []
+
+    def search(i):
+        if i == len(pattern):
+            return True
+        p = pattern[i]
+        if p.ground:
+            return p in c_set and search(i + 1)
+        mark = len(trail)
+        for t in by_key.get(_key(p), ()):
+            if _match(p, t, theta, trail) and search(i + 1):
+                return True
+            while len(trail) > mark:
+                del theta[trail.pop()]
+        return False
+    return search(0)
+
+
+# ---------------------------
+# Given-clause prover
+# ---------------------------
+class ResolutionProver:
+    """
+    Refutation prover: saturates a clause set by binary resolution (and
+    factoring) in a given-clause loop until the empty clause appears.
+
+    - set of support: only clauses descending from the negated goal are
+      selected as given clauses, so the knowledge base is never resolved
+      with itself (all clauses are supported if no goal is given)
+    - unit preference: the shortest clause in the set of support is picked
+      next; every `age_ratio`-th pick takes the oldest instead, for fairness
+    - tautologies are dropped; a new clause subsumed by a kept one is dropped
+      (forward subsumption) and kept clauses it subsumes are removed
+      (backward subsumption)
+    - literals are kept in discrimination trees (term_index.py): resolution
+      partners are the usable literals that may unify with the complement of
+      a given literal, backward subsumption only looks at clauses with an
+      instance of one of the new clause's literals, and for forward
+      subsumption each clause is filed once under its most specific literal
+      and found through generalizations, so no step scans all clauses
+
+    Ground clause pairs are resolved with resolve() from 'Resolution Tree';
+    clauses with variables are unified with forward_reasoning.Bindings.
+    Clauses are sets of literal strings, '-' marking negation.
+    """
+    def __init__(self, clauses, negated_goal=(), max_clauses=200000, time_limit=None, age_ratio=5):
+        self.max_clauses = max_clauses
+        self.time_limit = time_limit
+        self.age_ratio = age_ratio
+        self.clauses = []                       # every clause ever kept, by id
+        self.literals = DiscriminationTree()    # literal -> ids of the kept clauses containing it
+        self.anchors = DiscriminationTree()     # anchor literal -> id, one entry per kept clause
+        self.usable = DiscriminationTree()      # literal -> (id, position) in processed clauses
+        self.sos_by_size = []                   # heap of (len, id)
+        self.sos_by_age = []                    # heap of id
+        self.lit_cache = {}                     # literal string -> Atom
+        self.empty = None
+        self.stats = defaultdict(int)
+        supported = not negated_goal
+        for c in clauses:
+            self._keep([self._lit(s) for s in c], (), 'input', supported)
+        for c in negated_goal:
+            self._keep([self._lit(s) for s in c], (), 'goal', True)
+
+    def _lit(self, text):
+        lit = self.lit_cache.get(text)
+        if lit is None:
+            lit = self.lit_cache[text] = parse_literal(text)
+        return lit
+
+    # --- clause store ---
+    def _keep(self, lits, parents, rule, supported):
+        """Simplify and store a new clause; returns it, or None if it was deleted."""
+        lits = tuple(dict.fromkeys(lits))
+        if is_tautology(lits):
+            self.stats['tautologies'] += 1
+            return None
+        cid = len(self.clauses)
+        lits = self._rename(lits, cid)
+        clause = Clause(cid, lits, parents, rule)
+        if self._forward_subsumed(clause):
+            self.stats['forward_subsumed'] += 1
+            return None
+        self._backward_subsume(clause)
+        self.clauses.append(clause)
+        if lits:
+            # file the clause under its most specific literal: a clause it subsumes has an instance of it
+            clause.anchor = max(lits, key=lambda l: len(flatten(l)))
+            self.anchors.insert(clause.anchor, cid)
+        for l in lits:
+            self.literals.insert(l, cid)
+        if supported:
+            heapq.heappush(self.sos_by_size, (len(lits), cid))
+            heapq.heappush(self.sos_by_age, cid)
+        else:
+            self._make_usable(clause)
+        if not lits:
+            self.empty = clause
+        return clause
+
+    @staticmethod
+    def _rename(lits, cid):
+        """Give the clause its own variables (x_12, y_12, ...), so kept clauses never share one."""
+        variables = _variables(lits)
+        if not variables:
+            return lits
+        mapping, taken = {}, set()
+        for v in variables:
+            base = SYMBOL_NAMES[v].split('_')[0]
+            name, n = f"{base}_{cid}", 1
+            while name in taken:
+                n += 1
+                name = f"{base}{n}_{cid}"
+            taken.add(name)
+            mapping[v] = intern_symbol(name)
+        bindings = Bindings(mapping)
+        return tuple(bindings.resolve_atom(l) for l in lits)
+
+    def _make_usable(self, clause):
+        clause.usable = True
+        for pos, l in enumerate(clause.lits):
+            self.usable.insert(l, (clause.id, pos))
+
+    def _remove(self, clause):
+        clause.alive = False
+        if clause.anchor is not None:
+            self.anchors.delete(clause.anchor, clause.id)
+        for pos, l in enumerate(clause.lits):
+            self.literals.delete(l, clause.id)
+            if clause.usable:
+                self.usable.delete(l, (clause.id, pos))
+
+    def _forward_subsumed(self, clause):
+        for l in clause.lits:
+            # a subsuming clause maps its anchor literal onto some literal l of clause
+            for cid in self.anchors.generalizations(l):
+                if subsumes(self.clauses[cid], clause):
+                    return True
+        return False
+
+    def _backward_subsume(self, clause):
+        if not clause.lits:
+            return
+        # every clause subsumed by `clause` contains an instance of each of its literals
+        anchor = max(clause.lits, key=lambda l: len(flatten(l)))
+        pool = [self.clauses[cid] for cid in dict.fromkeys(self.literals.instances(anchor))]
+        for other in [o for o in pool if o.alive and subsumes(clause, o)]:
+            self._remove(other)
+            self.stats['backward_subsumed'] += 1
+
+    # --- inference ---
+    def _select(self):
+        self.stats['selections'] += 1
+        if self.stats['selections'] % self.age_ratio == 0:
+            return self._select_from(self.sos_by_age) or self._select_from(self.sos_by_size)
+        return self._select_from(self.sos_by_size) or self._select_from(self.sos_by_age)
+
+    def _select_from(self, heap):
+        while heap:
+            entry = heapq.heappop(heap)
+            clause = self.clauses[entry[1] if isinstance(entry, tuple) else entry]
+            if clause.alive and not clause.usable:
+                return clause
+        return None
+
+    def _resolvents(self, given):
+        """(literals, partner id) of every resolvent of given with a usable clause, itself included."""
+        ground_given = given.ground
+        done_ground = set()
+        bindings = Bindings()
+        for lit in given.lits:
+            for cid, pos in list(self.usable.unifiable(_complement(lit))):
+                partner = self.clauses[cid]
+                if ground_given and partner.ground:
+                    # all clashing pairs of two ground clauses give tautologies but one
+                    if partner.id not in done_ground:
+                        done_ground.add(partner.id)
+                        self.stats['resolutions'] += 1
+                        out = resolve(given.text, partner.text)
+                        if out is not None:
+                            yield [self.lit_cache.get(s) or self._lit(s) for s in out], partner.id
+                    continue
+                other = partner.lits
+                if partner is given:
+                    other = self._rename(other, f"{given.id}r")
+                olit = other[pos]
+                self.stats['resolutions'] += 1
+                mark = bindings.mark()
+                if bindings.unify_args(lit.args, olit.args):
+                    yield ([bindings.resolve_atom(l) for l in given.lits if l is not lit] +
+                           [bindings.resolve_atom(l) for l in other if l is not olit]), partner.id
+                bindings.undo(mark)
+
+    def _factors(self, given):
+        bindings = Bindings()
+        lits = given.lits
+        for i in range(len(lits)):
+            for j in range(i + 1, len(lits)):
+                a, b = lits[i], lits[j]
+                if _key(a) != _key(b) or (a.ground and b.ground):
+                    continue
+                mark = bindings.mark()
+                if bindings.unify_args(a.args, b.args):
+                    yield [bindings.resolve_atom(l) for l in lits if l is not b]
+                bindings.undo(mark)
+
+    def prove(self):
+        """Run the given-clause loop; returns the empty clause, or None if saturated / out of budget."""
+        deadline = time.perf_counter() + self.time_limit if self.time_limit is not None else None
+        while self.empty is None:
+            if len(self.clauses) >= self.max_clauses or (deadline is not None and time.perf_counter() > deadline):
+                break
+            given = self._select()
+            if given is None:
+                break  # saturated: no refutation exists
+            self._make_usable(given)
+            for lits in self._factors(given):
+                self._keep(lits, (given.id,), 'factor', True)
+            for lits, partner in self._resolvents(given):
+                if not given.alive:
+                    break  # removed by a resolvent it produced
+                self.stats['generated'] += 1
+                if self._keep(lits, (given.id, partner), 'resolve', True) is not None and self.empty is not None:
+                    break
+        return self.empty
+
+    # --- proof output ---
+    def proof_steps(self):
+        """Clauses of the refutation, parents before children."""
+        if self.empty is None:
+            return []
+        needed, stack = set(), [self.empty.id]
+        while stack:
+            cid = stack.pop()
+            if cid not in needed:
+                needed.add(cid)
+                stack.extend(self.clauses[cid].parents)
+        return [self.clauses[cid] for cid in sorted(needed)]
+
+    def proof_tree(self, clause=None):
+        """Nested (clause string, rule, [subtrees]) rooted at the empty clause."""
+        root = self.empty if clause is None else clause
+        if root is None:
+            return None
+        built = {}
+        stack = [root.id]
+        while stack:
+            cid = stack[-1]
+            parents = self.clauses[cid].parents
+            pending = [p for p in parents if p not in built]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            c = self.clauses[cid]
+            built[cid] = (f"({cid + 1}) {c}", c.rule, [built[p] for p in parents])
+        return built[root.id]
+
+    def print_proof(self):
+        for c in self.proof_steps():
+            if c.parents:
+                how = ' and '.join(f"({p + 1})" for p in c.parents)
+                print(f"{c.id + 1}. {'Resolved' if c.rule == 'resolve' else 'Factored'} {how} -> {c}")
+            else:
+                print(f"{c.id + 1}. {c.rule}: {c}")
+
+        def show(node, depth):
+            text, rule, children = node
+            print('    ' * depth + text)
+            for child in children:
+                show(child, depth + 1)
+        if self.empty is not None:
+            print("Proof tree:")
+            show(self.proof_tree(), 1)
+
+
+def refute(clauses, negated_goal, verbose=True, **options):
+    """True if clauses ∪ negated_goal is unsatisfiable (so the goal follows), with the prover."""
+    prover = ResolutionProver(clauses, negated_goal, **options)
+    proved = prover.prove() is not None
+    if verbose:
+        if proved:
+            prover.print_proof()
+            print("\n*** PROOF SUCCESSFUL! ***")
+        else:
+            print("No refutation found.")
+        print(dict(prover.stats), f"{len(prover.clauses)} clauses kept")
+    return proved, prover
+
+
+# ---------------------------
+# Demo / Example usage
+# ---------------------------
+if __name__ == "__main__":
+    # The 'Resolution Tree' problem, with variables instead of hand-picked instances
+    kb = [
+        {"-C(x)", "L(x, S)"},                 # every child loves Santa
+        {"-L(x, S)", "-R(y)", "L(x, y)"},     # everyone who loves Santa loves any reindeer
+        {"R(Ru)"}, {"N(Ru)"},                 # Rudolph is a reindeer with a red nose
+        {"-N(x)", "W(x)", "A(x)"},            # anything with a red nose is weird or a clown
+        {"-R(x)", "-A(x)"},                   # no reindeer is a clown
+        {"-W(x)", "-L(Sc, x)"},               # Scrooge does not love weird things
+    ]
+    refute(kb, [{"C(Sc)"}])                   # negated goal: Scrooge is a child
+
+    # clauses straight from the CNF converter
+    from fol_to_cnf import NameSupply, fol_to_clauses
+    names = NameSupply()   # shared, so the new symbols of the two conversions stay apart
+    kb = fol_to_clauses("∀x (Man(x) -> Mortal(x))", names) + fol_to_clauses("Man(Socrates)", names)
+    print()
+    refute(kb, [["-Mortal(Socrates)"]])
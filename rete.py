@@ -0,0 +1,213 @@
+from collections import defaultdict, deque
+
+from forward_reasoning import Literal, is_variable, parse_literal, parse_rule, literal_to_str
+
+# ---------------------------
+# Rete network nodes
+# ---------------------------
+class AlphaMemory:
+    """Facts that pass the single-pattern tests (predicate, constants, repeated variables)."""
+    def __init__(self, const_tests, eq_tests):
+        self.const_tests = const_tests  # ((pos, constant), ...)
+        self.eq_tests = eq_tests        # ((pos, earlier pos holding the same variable), ...)
+        self.items = []
+        self.successors = []            # JoinNodes fed by this memory
+
+    def matches(self, args):
+        return (all(args[pos] == c for pos, c in self.const_tests) and
+                all(args[pos] == args[other] for pos, other in self.eq_tests))
+
+
+class BetaMemory:
+    """Partial matches (tokens) of a rule prefix; a token is a tuple of variable values by slot."""
+    def __init__(self, depth):
+        self.depth = depth
+        self.tokens = []
+        self.children = []     # JoinNodes
+        self.productions = []  # (rule, consequent builder)
+
+
+class JoinNode:
+    """
+    Joins the tokens of `parent` with the facts of `alpha`. Both sides are hashed
+    on the join key (values of variables shared with the prefix), so each
+    activation only touches the partners that actually join.
+    """
+    def __init__(self, parent, alpha, tests, binds, child):
+        self.parent = parent
+        self.alpha = alpha
+        self.tests = tests   # ((fact pos, token slot), ...)
+        self.binds = binds   # fact positions whose values extend the token, in slot order
+        self.child = child
+        self.left_index = defaultdict(list)   # join key -> tokens
+        self.right_index = defaultdict(list)  # join key -> facts args
+
+    def left_key(self, token):
+        return tuple(token[slot] for _, slot in self.tests)
+
+    def right_key(self, args):
+        return tuple(args[pos] for pos, _ in self.tests)
+
+
+# ---------------------------
+# Engine
+# ---------------------------
+class ReteEngine:
+    """
+    Persistent forward-chaining engine compiled once from Rule namedtuples.
+    Rules with the same antecedent prefix (up to variable names) share alpha
+    memories, beta memories and join nodes. add_fact() pushes one ground fact
+    through the network and derives only its consequences, so its cost depends
+    on how many partial matches the fact joins with, not on how many facts
+    are already loaded.
+    """
+    def __init__(self, rules):
+        self.root = BetaMemory(0)
+        self.root.tokens.append(())
+        self.alpha_memories = {}                  # alpha key -> AlphaMemory
+        self.alpha_by_pred = defaultdict(list)    # (pred, arity) -> [AlphaMemory]
+        self.joins = {}                           # share key -> JoinNode
+        self.facts = {}                           # fact string -> Literal (working memory)
+        self.agenda = deque()
+        for rule in rules:
+            self.add_rule(rule)
+        self._run()  # consequents of fact-rules
+
+    # --- compilation ---
+    def _alpha(self, lit):
+        const_tests, eq_tests, first_pos = [], [], {}
+        for pos, arg in enumerate(lit.args):
+            if not is_variable(arg):
+                const_tests.append((pos, arg))
+            elif arg in first_pos:
+                eq_tests.append((pos, first_pos[arg]))
+            else:
+                first_pos[arg] = pos
+        key = (lit.pred, len(lit.args), tuple(const_tests), tuple(eq_tests))
+        if key not in self.alpha_memories:
+            am = AlphaMemory(tuple(const_tests), tuple(eq_tests))
+            self.alpha_memories[key] = am
+            self.alpha_by_pred[(lit.pred, len(lit.args))].append(am)
+        return key, self.alpha_memories[key]
+
+    def add_rule(self, rule):
+        """Compile one rule into the network (before any facts are added)."""
+        if self.facts:
+            raise ValueError("rules must be compiled before facts are added")
+        if not rule.antecedents:
+            self.agenda.append(rule.consequent)  # a fact-rule holds unconditionally
+            return
+        slots = {}  # variable -> slot, numbered by first occurrence (canonical across rules)
+        beta = self.root
+        for lit in rule.antecedents:
+            alpha_key, am = self._alpha(lit)
+            tests, binds, seen = [], [], set()
+            for pos, arg in enumerate(lit.args):
+                if not is_variable(arg) or arg in seen:
+                    continue
+                seen.add(arg)
+                if arg in slots:
+                    tests.append((pos, slots[arg]))
+                else:
+                    slots[arg] = len(slots)
+                    binds.append(pos)
+            share_key = (id(beta), alpha_key, tuple(tests), tuple(binds))
+            join = self.joins.get(share_key)
+            if join is None:
+                join = JoinNode(beta, am, tuple(tests), tuple(binds), BetaMemory(beta.depth + 1))
+                for token in beta.tokens:  # only the root holds a token at compile time
+                    join.left_index[join.left_key(token)].append(token)
+                self.joins[share_key] = join
+                beta.children.append(join)
+                am.successors.append(join)
+            beta = join.child
+        cons = rule.consequent
+        build = tuple((True, slots[a]) if is_variable(a) and a in slots else (False, a) for a in cons.args)
+        beta.productions.append((rule, cons.pred, build))
+
+    # --- activation ---
+    def add_fact(self, fact):
+        """Insert one ground fact (Literal or string); returns the newly derived fact strings."""
+        if isinstance(fact, str):
+            fact = parse_literal(fact)
+        if literal_to_str(fact) in self.facts:
+            return []
+        self.agenda.append(fact)
+        return self._run()[1:]
+
+    def _run(self):
+        new = []
+        while self.agenda:
+            lit = self.agenda.popleft()
+            key = literal_to_str(lit)
+            if key in self.facts:
+                continue
+            self.facts[key] = lit
+            new.append(key)
+            self._right_activate(lit)
+        return new
+
+    def add_facts(self, facts):
+        derived = []
+        for f in facts:
+            derived.extend(self.add_fact(f))
+        return derived
+
+    def _right_activate(self, lit):
+        args = tuple(lit.args)
+        activated = []
+        for am in self.alpha_by_pred.get((lit.pred, len(args)), ()):
+            if am.matches(args):
+                am.items.append(args)
+                for join in am.successors:
+                    join.right_index[join.right_key(args)].append(args)
+                activated.append(am)
+        # deepest joins first, so a fact joining with itself is combined exactly once
+        joins = sorted((j for am in activated for j in am.successors), key=lambda j: -j.child.depth)
+        for join in joins:
+            for token in join.left_index.get(join.right_key(args), ()):
+                self._left_activate(join.child, token + tuple(args[p] for p in join.binds))
+
+    def _left_activate(self, beta, token):
+        beta.tokens.append(token)
+        for rule, pred, build in beta.productions:
+            self.agenda.append(Literal(pred=pred, args=[token[v] if is_slot else v for is_slot, v in build], neg=False))
+        for join in beta.children:
+            key = join.left_key(token)
+            join.left_index[key].append(token)
+            for args in join.right_index.get(key, ()):
+                self._left_activate(join.child, token + tuple(args[p] for p in join.binds))
+
+    # --- queries ---
+    def __contains__(self, fact):
+        return fact in self.facts
+
+    def derived(self):
+        return set(self.facts)
+
+    def stats(self):
+        return {
+            'facts': len(self.facts),
+            'alpha_memories': len(self.alpha_memories),
+            'join_nodes': len(self.joins),
+            'tokens': sum(len(j.child.tokens) for j in self.joins.values()),
+        }
+
+
+# ---------------------------
+# Demo / Example usage
+# ---------------------------
+if __name__ == "__main__":
+    rules = [parse_rule(s) for s in [
+        "Parent(x,y) -> Ancestor(x,y)",
+        "Parent(x,y) & Ancestor(y,z) -> Ancestor(x,z)",
+        "Parent(x,y) & Parent(y,z) -> Grandparent(x,z)",
+    ]]
+    engine = ReteEngine(rules)
+    print(engine.stats())
+
+    # facts arrive one at a time; each call only propagates that fact's consequences
+    for fact in ["Parent(Ann, Bob)", "Parent(Bob, Cid)", "Parent(Cid, Dee)"]:
+        print(f"add {fact}: derived {engine.add_fact(fact)}")
+    print("Ancestor(Ann, Dee)" in engine)
+    print(engine.stats())
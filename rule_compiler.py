@@ -0,0 +1,163 @@
+"""
+Rules compiled to specialized Python matcher functions for saturate().
+
+The generic join in forward_reasoning.match_delta unifies every candidate
+through Bindings, re-dispatching on term types whose shape never changes.
+For a function-free rule the shape is known in advance, so compile_rule()
+generates a generator function with one block per delta antecedent
+(semi-naive evaluation, same ranges as match_delta) in which
+
+- every rule variable is a local (v0, v1, ...), bound by a plain
+  assignment from a fact's argument tuple at its first occurrence
+- constants and repeated variables are equality checks
+- each antecedent fetches its smallest FactIndex bucket for its bound
+  arguments and loops over the sequence-number slice of that bucket
+- the consequent is built with a pre-bound atom(pred, (...), neg) call
+
+Rules with compound arguments, or whose consequent has a variable that no
+antecedent binds, are not compiled (compile_rule returns None) and keep the
+generic path. A compiled matcher assumes ground facts; saturate() checks
+matcher.keys against FactIndex.var_positions and falls back otherwise.
+Use dump_matchers() or matcher.source to read the generated code.
+"""
+import sys
+from bisect import bisect_left
+
+from terms import Compound, SYMBOL_IS_VAR, SYMBOL_NAMES, atom, atom_to_str
+
+_EMPTY = ((), ())
+_MATCHERS = {}   # (antecedents, consequent) -> compiled matcher or None
+
+
+def _join_order(ants, first):
+    """Delta antecedent first, then greedily the one with the most arguments already bound."""
+    order, bound = [first], {t for t in ants[first].args if SYMBOL_IS_VAR[t]}
+    rest = [j for j in range(len(ants)) if j != first]
+    while rest:
+        j = max(rest, key=lambda j: (sum(not SYMBOL_IS_VAR[t] or t in bound for t in ants[j].args), -j))
+        rest.remove(j)
+        order.append(j)
+        bound.update(t for t in ants[j].args if SYMBOL_IS_VAR[t])
+    return order
+
+
+def rule_source(ants, consequent, name="match", profile=False):
+    """
+    Source of the matcher generator for a rule over atoms, or None if it
+    cannot be compiled. With profile, the matcher takes two more lists and
+    counts candidates tried / matched per antecedent in them (rule_profiler.py).
+    """
+    if any(isinstance(t, Compound) for a in list(ants) + [consequent] for t in a.args):
+        return None
+    ant_vars = {t for a in ants for t in a.args if SYMBOL_IS_VAR[t]}
+    if any(SYMBOL_IS_VAR[t] and t not in ant_vars for t in consequent.args):
+        return None
+
+    consts = {}
+
+    def const(t):
+        if t not in consts:
+            consts[t] = f"C{len(consts)}"
+        return consts[t]
+
+    slots = {}
+    lines = [f"def {name}(index, delta_start, delta_end{', tried, matched' if profile else ''}):"]
+    lines.append("    by_pred, by_arg = index.by_pred.get, index.by_arg.get")
+    for i in range(len(ants)):
+        ranges = {j: ("0", "delta_start") if j < i else ("delta_start", "delta_end") if j == i else ("0", "delta_end")
+                  for j in range(len(ants))}
+        lines.append(f"    # delta: {atom_to_str(ants[i])}")
+        bound = set()
+        indent = "    "
+        for depth, j in enumerate(_join_order(ants, i)):
+            a = ants[j]
+            key = f"({a.pred}, {len(a.args)})"
+            if depth:
+                lines.append(f"{indent}# {atom_to_str(a)}")
+            lines.append(f"{indent}lits{depth}, seqs{depth} = by_pred({key}, EMPTY)")
+            for pos, t in enumerate(a.args):
+                if SYMBOL_IS_VAR[t] and t not in bound:
+                    continue
+                value = slots[t] if SYMBOL_IS_VAR[t] else const(t)
+                lines.append(f"{indent}b = by_arg(({a.pred}, {len(a.args)}, {pos}, {value}), EMPTY)")
+                lines.append(f"{indent}if len(b[1]) < len(seqs{depth}):")
+                lines.append(f"{indent}    lits{depth}, seqs{depth} = b")
+            lo, hi = ranges[j]
+            start = "0" if lo == "0" else f"bisect_left(seqs{depth}, {lo})"
+            lines.append(f"{indent}for k{depth} in range({start}, bisect_left(seqs{depth}, {hi})):")
+            indent += "    "
+            lines.append(f"{indent}a = lits{depth}[k{depth}].args")
+            if profile:
+                lines.append(f"{indent}tried[{j}] += 1")
+            checks, binds, repeats = [], [], []
+            new = set()
+            for pos, t in enumerate(a.args):
+                if not SYMBOL_IS_VAR[t]:
+                    checks.append(f"a[{pos}] != {const(t)}")
+                elif t in bound:
+                    (repeats if t in new else checks).append(f"a[{pos}] != {slots[t]}")
+                else:
+                    slots.setdefault(t, f"v{len(slots)}")
+                    bound.add(t)
+                    new.add(t)
+                    binds.append(f"{slots[t]} = a[{pos}]")
+            if checks:
+                lines.append(f"{indent}if {' or '.join(checks)}:")
+                lines.append(f"{indent}    continue")
+            lines.extend(indent + b for b in binds)
+            if repeats:
+                lines.append(f"{indent}if {' or '.join(repeats)}:")
+                lines.append(f"{indent}    continue")
+            if profile:
+                lines.append(f"{indent}matched[{j}] += 1")
+        args = ", ".join(slots[t] if SYMBOL_IS_VAR[t] else const(t) for t in consequent.args)
+        args += "," if len(consequent.args) == 1 else ""
+        lines.append(f"{indent}yield atom({consequent.pred}, ({args}), {consequent.neg})")
+    header = [f"# {' & '.join(atom_to_str(a) for a in ants)} -> {atom_to_str(consequent)}"]
+    header += [f"# {c} = {SYMBOL_NAMES[t]}" for t, c in consts.items()]
+    consts_line = [f"{c} = {t}" for t, c in consts.items()]
+    return "\n".join(header + consts_line + lines) + "\n"
+
+
+def compile_rule(ants, consequent, name="match", profile=False):
+    """
+    Matcher for a rule: a generator function (index, delta_start, delta_end)
+    yielding the consequent of every new match, like match_delta. It carries
+    .source and .keys (the (pred, arity) of its antecedents). None if the
+    rule needs the generic path. Atoms are hash-consed, so each distinct
+    rule is compiled once per process. profile selects the instrumented
+    variant (see rule_source).
+    """
+    key = (tuple(ants), consequent, profile)
+    if key in _MATCHERS:
+        return _MATCHERS[key]
+    source = rule_source(ants, consequent, name, profile)
+    matcher = None
+    if source is not None:
+        namespace = {'EMPTY': _EMPTY, 'bisect_left': bisect_left, 'atom': atom}
+        exec(compile(source, f"<rule {name}>", "exec"), namespace)
+        matcher = namespace[name]
+        matcher.source = source
+        matcher.keys = [(a.pred, len(a.args)) for a in ants]
+    _MATCHERS[key] = matcher
+    return matcher
+
+
+def dump_matchers(rules, file=None):
+    """Print the generated matcher of every rule (Rules of Literals or atoms) for inspection."""
+    from forward_reasoning import literal_to_atom
+    file = sys.stdout if file is None else file
+    for no, rule in enumerate(rules):
+        ants = [literal_to_atom(a) for a in rule.antecedents]
+        source = rule_source(ants, literal_to_atom(rule.consequent), f"match_rule_{no}") if ants else None
+        print(source if source is not None else f"# rule {no}: generic matcher\n", file=file)
+
+
+# ---------------------------
+# Demo / Example usage
+# ---------------------------
+if __name__ == "__main__":
+    from forward_reasoning import parse_rule
+    dump_matchers([parse_rule("Parent(x,y) -> Ancestor(x,y)"),
+                   parse_rule("Ancestor(x,y) & Parent(y,z) -> Ancestor(x,z)"),
+                   parse_rule("Likes(x, Pizza) & Likes(x, x) -> Narcissist(x)")])
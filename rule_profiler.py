@@ -0,0 +1,101 @@
+"""
+Opt-in profiling of forward-chaining rules.
+
+Pass a RuleProfiler to saturate() / forward_chain() and it records, for
+every rule with antecedents:
+
+- activations: how many rounds the rule was matched against a delta
+- tried[i]: candidate facts taken for antecedent i
+- matched[i]: candidates that unified with antecedent i
+- firings: complete matches, split into new and duplicate consequents
+- time: seconds spent matching the rule and adding its consequents
+
+Compiled matchers (rule_compiler.py) are profiled through an instrumented
+variant that bumps the same counters, so a profiled run takes the same
+path as a normal one. Without a profiler nothing is counted.
+"""
+import json
+import sys
+
+
+class RuleStats:
+    __slots__ = ('rule', 'activations', 'tried', 'matched', 'firings', 'new', 'duplicate', 'time')
+
+    def __init__(self, rule, n_ants):
+        self.rule = rule
+        self.activations = 0
+        self.tried = [0] * n_ants
+        self.matched = [0] * n_ants
+        self.firings = 0
+        self.new = 0
+        self.duplicate = 0
+        self.time = 0.0
+
+    def fired(self, added):
+        self.firings += 1
+        if added:
+            self.new += 1
+        else:
+            self.duplicate += 1
+
+    def as_dict(self):
+        return {f: getattr(self, f) for f in self.__slots__}
+
+
+class RuleProfiler:
+    COLUMNS = ('activations', 'tried', 'matched', 'firings', 'new', 'duplicate', 'time')
+
+    def __init__(self):
+        self.rules = {}   # rule text -> RuleStats, so several runs accumulate
+
+    def entry(self, text, n_ants):
+        stats = self.rules.get(text)
+        if stats is None:
+            stats = self.rules[text] = RuleStats(text, n_ants)
+        return stats
+
+    def sorted(self, by='time'):
+        """RuleStats, largest first by one of COLUMNS (lists are compared by their sum)."""
+        if by not in self.COLUMNS:
+            raise ValueError(f"sort key must be one of {self.COLUMNS}")
+
+        def key(s):
+            value = getattr(s, by)
+            return sum(value) if isinstance(value, list) else value
+        return sorted(self.rules.values(), key=key, reverse=True)
+
+    def report(self, by='time', limit=None, file=None):
+        file = sys.stdout if file is None else file
+        rows = self.sorted(by)[:limit]
+        print(f"{'time(s)':>9} {'act':>5} {'tried':>9} {'matched':>9} {'fired':>8} {'new':>8} {'dup':>8}  rule",
+              file=file)
+        for s in rows:
+            print(f"{s.time:9.4f} {s.activations:5d} {sum(s.tried):9d} {sum(s.matched):9d} "
+                  f"{s.firings:8d} {s.new:8d} {s.duplicate:8d}  {s.rule}", file=file)
+            print(f"{'':44}per antecedent tried {s.tried} matched {s.matched}", file=file)
+
+    def to_json(self, by='time'):
+        return json.dumps([s.as_dict() for s in self.sorted(by)], indent=2)
+
+    def dump_json(self, path, by='time'):
+        with open(path, 'w') as f:
+            f.write(self.to_json(by))
+
+
+# ---------------------------
+# Demo / Example usage
+# ---------------------------
+if __name__ == "__main__":
+    from forward_reasoning import parse_literal, parse_rule, saturate
+
+    facts = [parse_literal(f"Edge(N{i}, N{i + 1})") for i in range(120)] + \
+            [parse_literal(f"Red(N{i})") for i in range(0, 120, 10)]
+    rules = [parse_rule(s) for s in ["Edge(x,y) -> Path(x,y)",
+                                     "Path(x,y) & Edge(y,z) -> Path(x,z)",
+                                     "Path(x,y) & Red(y) -> Warm(x)",
+                                     "Warm(x) & Edge(x,y) -> Warm(y)"]]
+    profiler = RuleProfiler()
+    index, stats = saturate(rules, facts, profiler=profiler)
+    print(len(index), "facts", stats)
+    profiler.report()
+    print(profiler.to_json('firings')[:300], "...")
@@ -0,0 +1,331 @@
+"""
+Conflict-driven clause-learning (CDCL) SAT solver.
+
+Clauses are lists of non-zero ints in DIMACS style: v means variable v is
+true, -v that it is false. Internally literal v is 2*v and -v is 2*v + 1,
+so the negation of a literal is lit ^ 1 and per-literal data lives in flat
+lists.
+
+- two watched literals per clause: only clauses watching a literal that
+  just became false are visited during unit propagation
+- first-UIP conflict analysis with clause minimization, non-chronological
+  backjumping
+- VSIDS branching (activity bumped on every conflict, decayed geometrically)
+  with phase saving
+- Luby restarts and periodic deletion of learned clauses with a high LBD
+"""
+import heapq
+
+
+class _Clause:
+    __slots__ = ('lits', 'learnt', 'lbd', 'deleted')
+
+    def __init__(self, lits, learnt=False, lbd=0):
+        self.lits = lits
+        self.learnt = learnt
+        self.lbd = lbd
+        self.deleted = False
+
+
+def luby(i):
+    """i-th element (from 0) of the Luby sequence 1 1 2 1 1 2 4 1 1 2 ..."""
+    size, seq = 1, 0
+    while size < i + 1:
+        seq += 1
+        size = 2 * size + 1
+    while size - 1 != i:
+        size = (size - 1) >> 1
+        seq -= 1
+        i %= size
+    return 1 << seq
+
+
+class CDCLSolver:
+    def __init__(self, clauses=(), num_vars=0, restart_base=100, var_decay=0.95):
+        self.num_vars = 0
+        self.val = [0, 0]          # per literal: 1 true, -1 false, 0 unassigned
+        self.level = [0]           # per variable
+        self.reason = [None]       # per variable: clause that implied it
+        self.activity = [0.0]
+        self.phase = [False]
+        self.seen = [False]
+        self.watches = [[], []]    # per literal: clauses watching it
+        self.clauses = []
+        self.learnts = []
+        self.trail = []
+        self.trail_lim = []        # trail index where each decision level starts
+        self.qhead = 0
+        self.heap = []             # (-activity, var), stale entries skipped lazily
+        self.var_inc = 1.0
+        self.var_decay = var_decay
+        self.restart_base = restart_base
+        self.max_learnts = 0
+        self.ok = True
+        self.model = None
+        self.stats = {'decisions': 0, 'propagations': 0, 'conflicts': 0, 'restarts': 0,
+                      'learned': 0, 'deleted': 0}
+        self.ensure_vars(num_vars)
+        for c in clauses:
+            self.add_clause(c)
+
+    # --- problem setup ---
+    def ensure_vars(self, n):
+        while self.num_vars < n:
+            self.num_vars += 1
+            self.val.extend((0, 0))
+            self.level.append(0)
+            self.reason.append(None)
+            self.activity.append(0.0)
+            self.phase.append(False)
+            self.seen.append(False)
+            self.watches.extend(([], []))
+            heapq.heappush(self.heap, (0.0, self.num_vars))
+
+    def add_clause(self, clause):
+        """Add a DIMACS-style clause (before solving); returns False once the problem is unsatisfiable."""
+        if not self.ok:
+            return False
+        self.ensure_vars(max((abs(l) for l in clause), default=0))
+        lits = []
+        for l in dict.fromkeys(2 * l if l > 0 else -2 * l + 1 for l in clause):
+            if l ^ 1 in lits or self.val[l] == 1:
+                return True  # tautology, or already satisfied at level 0
+            if self.val[l] == 0:
+                lits.append(l)
+        if not lits:
+            self.ok = False
+        elif len(lits) == 1:
+            self._assign(lits[0], None)
+            self.ok = self._propagate() is None
+        else:
+            c = _Clause(lits)
+            self.clauses.append(c)
+            self._attach(c)
+        return self.ok
+
+    def _attach(self, c):
+        self.watches[c.lits[0]].append(c)
+        self.watches[c.lits[1]].append(c)
+
+    # --- assignment ---
+    def _assign(self, lit, reason):
+        v = lit >> 1
+        self.val[lit] = 1
+        self.val[lit ^ 1] = -1
+        self.level[v] = len(self.trail_lim)
+        self.reason[v] = reason
+        self.trail.append(lit)
+
+    def _cancel_until(self, level):
+        if len(self.trail_lim) <= level:
+            return
+        val, reason, phase, activity, heap = self.val, self.reason, self.phase, self.activity, self.heap
+        start = self.trail_lim[level]
+        for lit in self.trail[start:]:
+            v = lit >> 1
+            val[lit] = val[lit ^ 1] = 0
+            reason[v] = None
+            phase[v] = not lit & 1   # phase saving
+            heapq.heappush(heap, (-activity[v], v))
+        del self.trail[start:]
+        del self.trail_lim[level:]
+        self.qhead = len(self.trail)
+
+    def _propagate(self):
+        """Unit propagation over the watch lists; returns a conflicting clause or None."""
+        val, watches, trail = self.val, self.watches, self.trail
+        while self.qhead < len(trail):
+            false_lit = trail[self.qhead] ^ 1
+            self.qhead += 1
+            self.stats['propagations'] += 1
+            ws = watches[false_lit]
+            i = j = 0
+            n = len(ws)
+            while i < n:
+                c = ws[i]
+                i += 1
+                if c.deleted:
+                    continue  # learned clause removed by _reduce_db: drop the watch
+                lits = c.lits
+                if lits[0] == false_lit:
+                    lits[0], lits[1] = lits[1], false_lit
+                first = lits[0]
+                if val[first] == 1:
+                    ws[j] = c
+                    j += 1
+                    continue
+                for k in range(2, len(lits)):
+                    if val[lits[k]] != -1:
+                        lits[1], lits[k] = lits[k], false_lit
+                        watches[lits[1]].append(c)
+                        break
+                else:
+                    ws[j] = c
+                    j += 1
+                    if val[first] == -1:
+                        while i < n:
+                            ws[j] = ws[i]
+                            j += 1
+                            i += 1
+                        del ws[j:]
+                        self.qhead = len(trail)
+                        return c
+                    self._assign(first, c)
+            del ws[j:]
+        return None
+
+    # --- conflict analysis ---
+    def _bump(self, v):
+        self.activity[v] += self.var_inc
+        if self.activity[v] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.var_inc *= 1e-100
+            self.heap = [(-a, u) for u, a in enumerate(self.activity) if u and not self.val[2 * u]]
+            heapq.heapify(self.heap)
+        elif not self.val[2 * v]:
+            heapq.heappush(self.heap, (-self.activity[v], v))
+
+    def _analyze(self, confl):
+        """First-UIP learned clause (asserting literal first) and the level to backjump to."""
+        seen, level, reason, trail = self.seen, self.level, self.reason, self.trail
+        current = len(self.trail_lim)
+        learnt = [None]
+        counter = 0
+        p = None
+        idx = len(trail) - 1
+        while True:
+            for q in (confl.lits if p is None else confl.lits[1:]):
+                v = q >> 1
+                if not seen[v] and level[v] > 0:
+                    seen[v] = True
+                    self._bump(v)
+                    if level[v] >= current:
+                        counter += 1
+                    else:
+                        learnt.append(q)
+            while not seen[trail[idx] >> 1]:
+                idx -= 1
+            p = trail[idx]
+            idx -= 1
+            confl = reason[p >> 1]
+            seen[p >> 1] = False
+            counter -= 1
+            if counter == 0:
+                break
+        learnt[0] = p ^ 1
+
+        # drop literals implied by the rest of the clause (local minimization)
+        kept = [learnt[0]]
+        for q in learnt[1:]:
+            r = reason[q >> 1]
+            if r is None or any(not seen[x >> 1] and level[x >> 1] > 0 for x in r.lits[1:]):
+                kept.append(q)
+        for q in learnt[1:]:
+            seen[q >> 1] = False
+        learnt = kept
+
+        if len(learnt) == 1:
+            return learnt, 0
+        # the literal of the highest remaining level is watched next to the asserting one
+        best = max(range(1, len(learnt)), key=lambda k: level[learnt[k] >> 1])
+        learnt[1], learnt[best] = learnt[best], learnt[1]
+        return learnt, level[learnt[1] >> 1]
+
+    def _reduce_db(self):
+        """Delete half of the learned clauses with LBD > 2 that are not reasons."""
+        reason, val = self.reason, self.val
+        candidates = [c for c in self.learnts if c.lbd > 2 and
+                      not (reason[c.lits[0] >> 1] is c and val[c.lits[0]] == 1)]
+        candidates.sort(key=lambda c: -c.lbd)
+        for c in candidates[:len(candidates) // 2]:
+            c.deleted = True
+        self.stats['deleted'] += len(candidates) // 2
+        self.learnts = [c for c in self.learnts if not c.deleted]
+
+    # --- search ---
+    def _pick_branch(self):
+        heap, val = self.heap, self.val
+        while heap:
+            _, v = heapq.heappop(heap)
+            if not val[2 * v]:
+                return 2 * v if self.phase[v] else 2 * v + 1
+        return None
+
+    def solve(self, max_conflicts=None):
+        """True (model in self.model) / False (unsatisfiable) / None (conflict budget exhausted)."""
+        if not self.ok:
+            return False
+        if self._propagate() is not None:
+            self.ok = False
+            return False
+        self.max_learnts = max(len(self.clauses) // 3, 2000)
+        budget_start = self.stats['conflicts']
+        restart = 0
+        while True:
+            status = self._search(self.restart_base * luby(restart))
+            if status is not None:
+                return status
+            restart += 1
+            self.stats['restarts'] += 1
+            if max_conflicts is not None and self.stats['conflicts'] - budget_start >= max_conflicts:
+                return None
+
+    def _search(self, conflict_limit):
+        conflicts = 0
+        while True:
+            confl = self._propagate()
+            if confl is not None:
+                self.stats['conflicts'] += 1
+                conflicts += 1
+                if not self.trail_lim:
+                    self.ok = False
+                    return False
+                learnt, back = self._analyze(confl)
+                self._cancel_until(back)
+                if len(learnt) == 1:
+                    self._assign(learnt[0], None)
+                else:
+                    c = _Clause(learnt, True, len({self.level[l >> 1] for l in learnt}))
+                    self.learnts.append(c)
+                    self._attach(c)
+                    self._assign(learnt[0], c)
+                self.stats['learned'] += 1
+                self.var_inc /= self.var_decay
+            else:
+                if conflicts >= conflict_limit:
+                    self._cancel_until(0)
+                    return None
+                if len(self.learnts) - len(self.trail) >= self.max_learnts:
+                    self._reduce_db()
+                    self.max_learnts = int(self.max_learnts * 1.1)
+                lit = self._pick_branch()
+                if lit is None:
+                    self.model = {v: self.val[2 * v] == 1 for v in range(1, self.num_vars + 1)}
+                    self._cancel_until(0)
+                    return True
+                self.stats['decisions'] += 1
+                self.trail_lim.append(len(self.trail))
+                self._assign(lit, None)
+
+
+def solve(clauses, num_vars=0):
+    """Model {var: bool} of DIMACS-style clauses, or None if they are unsatisfiable."""
+    solver = CDCLSolver(clauses, num_vars)
+    return solver.model if solver.solve() else None
+
+
+# ---------------------------
+# Demo / Example usage
+# ---------------------------
+if __name__ == "__main__":
+    import time
+
+    # pigeonhole: n + 1 pigeons do not fit into n holes (hard for resolution)
+    n = 7
+    var = lambda p, h: p * n + h + 1
+    clauses = [[var(p, h) for h in range(n)] for p in range(n + 1)]
+    clauses += [[-var(p, h), -var(q, h)] for h in range(n) for p in range(n + 1) for q in range(p + 1, n + 1)]
+    solver = CDCLSolver(clauses)
+    start = time.perf_counter()
+    print(f"pigeonhole {n + 1}/{n}:", "SAT" if solver.solve() else "UNSAT",
+          f"in {time.perf_counter() - start:.2f}s", solver.stats)
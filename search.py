@@ -0,0 +1,301 @@
+"""
+State-space search: one problem protocol, four engines.
+
+A problem subclasses SearchProblem and provides
+
+    initial              the start state
+    successors(state)    yields (action, next_state) pairs, lazily
+    is_goal(state)
+    key(state)           hashable identity of a state (default: the state itself)
+    heuristic(state)     estimate of the remaining cost (default 0)
+    cost(s, action, t)   step cost (default 1; BFS and IDDFS count steps)
+
+and every engine works on it:
+
+    bfs        shortest path in steps; goal test at generation
+    iddfs      depth-limited DFS with growing limits; memory linear in the depth
+    astar      cheapest path with an admissible heuristic
+    ida_star   A*'s answer in memory linear in the depth
+
+The engines keep one (parent key, action, state) entry per stored state
+(BFS, A*) or just the current path (IDDFS, IDA*) instead of copying paths
+into every frontier entry, and pull successors from the generator only
+when a node is expanded. Results are Solution(states, actions, cost), or
+None; pass a dict as stats to get node counts.
+"""
+from collections import deque, namedtuple
+from heapq import heappop, heappush
+from itertools import count
+
+Solution = namedtuple('Solution', 'states actions cost')
+
+
+class SearchProblem:
+    def __init__(self, initial):
+        self.initial = initial
+
+    def successors(self, state):
+        raise NotImplementedError
+
+    def is_goal(self, state):
+        raise NotImplementedError
+
+    def key(self, state):
+        return state
+
+    def heuristic(self, state):
+        return 0
+
+    def cost(self, state, action, next_state):
+        return 1
+
+
+def _record(stats, **counts):
+    if stats is not None:
+        stats.update(counts)
+
+
+def _solution(parents, key, cost=None):
+    """Follow parent pointers from key back to the start."""
+    states, actions = [], []
+    while key is not None:
+        key, action, state = parents[key]
+        states.append(state)
+        actions.append(action)
+    states.reverse()
+    actions.reverse()
+    return Solution(states, actions[1:], len(states) - 1 if cost is None else cost)
+
+
+# ---------------------------
+# Breadth-first search
+# ---------------------------
+def bfs(problem, stats=None):
+    """Solution with the fewest steps, or None if no goal is reachable."""
+    successors, is_goal, key = problem.successors, problem.is_goal, problem.key
+    start = problem.initial
+    k0 = key(start)
+    parents = {k0: (None, None, start)}   # key -> (parent key, action, state); doubles as the visited set
+    result, expanded, peak = None, 0, 1
+    if is_goal(start):
+        result = _solution(parents, k0)
+    frontier = deque([(start, k0)]) if result is None else ()
+    while frontier:
+        state, k = frontier.popleft()
+        expanded += 1
+        for action, nxt in successors(state):
+            nk = key(nxt)
+            if nk in parents:
+                continue
+            parents[nk] = (k, action, nxt)
+            if is_goal(nxt):
+                result = _solution(parents, nk)
+                break
+            frontier.append((nxt, nk))
+        if result is not None:
+            break
+        if len(frontier) > peak:
+            peak = len(frontier)
+    _record(stats, expanded=expanded, stored=len(parents), max_frontier=peak)
+    return result
+
+
+# ---------------------------
+# Iterative deepening
+# ---------------------------
+def depth_limited(problem, limit, stats=None, visit=None):
+    """
+    Depth-first search to depth limit, avoiding states already on the path.
+    Returns (Solution or None, cutoff), where cutoff tells whether the limit
+    pruned anything. visit(state, limit) is called for each state reached.
+    """
+    successors, is_goal, key = problem.successors, problem.is_goal, problem.key
+    start = problem.initial
+    expanded = generated = 0
+    if visit is not None:
+        visit(start, limit)
+    if is_goal(start):
+        _record(stats, expanded=0, generated=0)
+        return Solution([start], [], 0), False
+    # states/keys/actions hold the current path; stack[i] iterates the successors of states[i]
+    states, keys, actions = [start], [key(start)], []
+    on_path = set(keys)
+    stack = [iter(successors(start))] if limit > 0 else []
+    cutoff = limit == 0
+    while stack:
+        for action, nxt in stack[-1]:
+            nk = key(nxt)
+            if nk in on_path:
+                continue
+            generated += 1
+            if visit is not None:
+                visit(nxt, limit)
+            if is_goal(nxt):
+                _record(stats, expanded=expanded + len(stack), generated=generated)
+                return Solution(states + [nxt], actions + [action], len(states)), False
+            if len(states) == limit:
+                cutoff = True
+                continue
+            states.append(nxt)
+            keys.append(nk)
+            actions.append(action)
+            on_path.add(nk)
+            stack.append(iter(successors(nxt)))
+            break
+        else:
+            stack.pop()
+            expanded += 1
+            on_path.discard(keys.pop())
+            states.pop()
+            if actions:
+                actions.pop()
+    _record(stats, expanded=expanded, generated=generated)
+    return None, cutoff
+
+
+def iddfs(problem, max_depth=50, stats=None, on_depth=None, visit=None):
+    """
+    depth_limited() with limits 0, 1, ..., max_depth; the first solution
+    found has the fewest steps. Stops early once a limit prunes nothing.
+    on_depth(limit) is called before each iteration.
+    """
+    totals = {'iterations': 0, 'expanded': 0, 'generated': 0}
+    result, counts = None, {}
+    for limit in range(max_depth + 1):
+        if on_depth is not None:
+            on_depth(limit)
+        result, cutoff = depth_limited(problem, limit, counts, visit)
+        totals['iterations'] += 1
+        totals['expanded'] += counts['expanded']
+        totals['generated'] += counts['generated']
+        if result is not None or not cutoff:
+            break
+    _record(stats, **totals)
+    return result
+
+
+# ---------------------------
+# Heuristic search
+# ---------------------------
+def astar(problem, stats=None):
+    """Cheapest solution (optimal for an admissible heuristic), or None."""
+    successors, is_goal, key = problem.successors, problem.is_goal, problem.key
+    h, cost = problem.heuristic, problem.cost
+    start = problem.initial
+    k0 = key(start)
+    parents = {k0: (None, None, start)}
+    best = {k0: 0}   # key -> cheapest known cost from the start
+    tie = count()
+    # ties on f go to the deeper node (-g), then to the older entry
+    frontier = [(h(start), 0, next(tie), start, k0)]
+    result, expanded, peak = None, 0, 1
+    while frontier:
+        _, neg_g, _, state, k = heappop(frontier)
+        g = -neg_g
+        if g > best[k]:
+            continue   # superseded by a cheaper entry
+        if is_goal(state):
+            result = _solution(parents, k, g)
+            break
+        expanded += 1
+        for action, nxt in successors(state):
+            nk = key(nxt)
+            ng = g + cost(state, action, nxt)
+            if ng < best.get(nk, ng + 1):
+                best[nk] = ng
+                parents[nk] = (k, action, nxt)
+                heappush(frontier, (ng + h(nxt), -ng, next(tie), nxt, nk))
+        if len(frontier) > peak:
+            peak = len(frontier)
+    _record(stats, expanded=expanded, stored=len(parents), max_frontier=peak)
+    return result
+
+
+def _bounded(problem, bound, counts):
+    """One IDA* iteration: (Solution or None, smallest f that exceeded bound)."""
+    successors, is_goal, key = problem.successors, problem.is_goal, problem.key
+    h, cost = problem.heuristic, problem.cost
+    start = problem.initial
+    states, keys, actions, costs = [start], [key(start)], [], [0]
+    on_path = set(keys)
+    stack = [iter(successors(start))]
+    next_bound = float('inf')
+    while stack:
+        state, g = states[-1], costs[-1]
+        for action, nxt in stack[-1]:
+            nk = key(nxt)
+            if nk in on_path:
+                continue
+            counts['generated'] += 1
+            ng = g + cost(state, action, nxt)
+            f = ng + h(nxt)
+            if f > bound:
+                if f < next_bound:
+                    next_bound = f
+                continue
+            states.append(nxt)
+            keys.append(nk)
+            actions.append(action)
+            costs.append(ng)
+            if is_goal(nxt):
+                return Solution(states, actions, ng), next_bound
+            on_path.add(nk)
+            stack.append(iter(successors(nxt)))
+            break
+        else:
+            stack.pop()
+            counts['expanded'] += 1
+            on_path.discard(keys.pop())
+            states.pop()
+            costs.pop()
+            if actions:
+                actions.pop()
+    return None, next_bound
+
+
+def ida_star(problem, stats=None, max_bound=float('inf')):
+    """
+    Iterative deepening on f = g + h: each iteration is a depth-first search
+    cut at the bound, and the next bound is the smallest f that was cut.
+    Optimal for an admissible heuristic; None if no goal within max_bound.
+    """
+    start = problem.initial
+    bound = problem.heuristic(start)
+    counts = {'iterations': 0, 'expanded': 0, 'generated': 0}
+    result = Solution([start], [], 0) if problem.is_goal(start) else None
+    while result is None and bound <= max_bound:
+        counts['iterations'] += 1
+        result, next_bound = _bounded(problem, bound, counts)
+        if next_bound == float('inf'):
+            break
+        if result is None:
+            bound = next_bound
+    _record(stats, bound=bound, **counts)
+    return result
+
+
+# ---------------------------
+# Demo / Example usage
+# ---------------------------
+if __name__ == "__main__":
+    class Jugs(SearchProblem):
+        """Measure 2 litres with a 4 and a 3 litre jug."""
+        def successors(self, state):
+            a, b = state
+            yield "fill A", (4, b)
+            yield "fill B", (a, 3)
+            yield "empty A", (0, b)
+            yield "empty B", (a, 0)
+            pour = min(a, 3 - b)
+            yield "A -> B", (a - pour, b + pour)
+            pour = min(b, 4 - a)
+            yield "B -> A", (a + pour, b - pour)
+
+        def is_goal(self, state):
+            return 2 in state
+
+    problem = Jugs((0, 0))
+    for engine in (bfs, iddfs, astar, ida_star):
+        stats = {}
+        solution = engine(problem, stats=stats)
+        print(f"{engine.__name__:9} {solution.cost} steps: {', '.join(solution.actions)}  {stats}")
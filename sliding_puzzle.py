@@ -0,0 +1,103 @@
+"""
+The N×N sliding-tile puzzle (8-puzzle, 15-puzzle) as a search.SearchProblem.
+
+A state is a flat tuple in row-major order with 0 for the blank, so it is
+its own hash key and a move is a single swap. The legal blank moves of
+every cell and the Manhattan distance of every tile from every cell are
+precomputed per puzzle. Actions name the direction the blank moves.
+pack()/unpack() convert states to 64-bit ints for external_bfs.py.
+"""
+from math import isqrt
+
+from search import SearchProblem
+
+ACTIONS = (("Up", -1, 0), ("Down", 1, 0), ("Left", 0, -1), ("Right", 0, 1))
+
+
+def to_state(grid):
+    """Flat tuple of a list of rows (or of an already flat sequence)."""
+    if grid and isinstance(grid[0], (list, tuple)):
+        return tuple(t for row in grid for t in row)
+    return tuple(grid)
+
+
+def inversions(state):
+    tiles = [t for t in state if t]
+    return sum(1 for i in range(len(tiles)) for j in range(i + 1, len(tiles)) if tiles[i] > tiles[j])
+
+
+class SlidingPuzzle(SearchProblem):
+    def __init__(self, initial, goal=None):
+        initial = to_state(initial)
+        super().__init__(initial)
+        self.width = width = isqrt(len(initial))
+        if width * width != len(initial) or sorted(initial) != list(range(len(initial))):
+            raise ValueError(f"not a square puzzle: {initial}")
+        self.goal = to_state(goal) if goal is not None else tuple(range(1, len(initial))) + (0,)
+        # moves[i]: (action, cell the blank moves to) for the blank at cell i
+        self.moves = []
+        for i in range(len(initial)):
+            r, c = divmod(i, width)
+            self.moves.append(tuple((name, (r + dr) * width + c + dc) for name, dr, dc in ACTIONS
+                                    if 0 <= r + dr < width and 0 <= c + dc < width))
+        # distance[t][i]: Manhattan distance of tile t at cell i from its goal cell (0 for the blank)
+        self.distance = [[0] * len(initial) for _ in initial]
+        for g, t in enumerate(self.goal):
+            if t:
+                gr, gc = divmod(g, width)
+                self.distance[t] = [abs(i // width - gr) + abs(i % width - gc) for i in range(len(initial))]
+
+    def successors(self, state):
+        b = state.index(0)
+        for action, j in self.moves[b]:
+            s = list(state)
+            s[b], s[j] = s[j], 0
+            yield action, tuple(s)
+
+    def is_goal(self, state):
+        return state == self.goal
+
+    def heuristic(self, state):
+        distance = self.distance
+        return sum([distance[t][i] for i, t in enumerate(state)])
+
+    def _parity(self, state):
+        # a horizontal move keeps the inversion count; a vertical one changes it by width - 1,
+        # so with an even width the blank's row is added to keep the parity invariant
+        extra = state.index(0) // self.width if self.width % 2 == 0 else 0
+        return (inversions(state) + extra) % 2
+
+    def is_solvable(self):
+        return self._parity(self.initial) == self._parity(self.goal)
+
+    def pack(self, state):
+        """The state as an int with 4 bits per cell (puzzles up to 4×4 fit in 64 bits)."""
+        return int(bytes(state).hex()[1::2], 16)
+
+    def unpack(self, code):
+        return tuple(int(c, 16) for c in f"{code:0{len(self.goal)}x}")
+
+    def grid(self, state):
+        """The state as a list of rows."""
+        w = self.width
+        return [list(state[r * w:(r + 1) * w]) for r in range(w)]
+
+
+# ---------------------------
+# Demo / Example usage
+# ---------------------------
+if __name__ == "__main__":
+    import time
+
+    import search
+
+    puzzle = SlidingPuzzle([[8, 6, 7], [2, 5, 4], [3, 0, 1]])   # one of the hardest: 31 moves
+    print("solvable:", puzzle.is_solvable())
+    for engine in (search.bfs, search.astar, search.ida_star):
+        stats = {}
+        start = time.perf_counter()
+        solution = engine(puzzle, stats=stats)
+        print(f"{engine.__name__:9} {solution.cost} moves in {time.perf_counter() - start:.2f}s  {stats}")
+    stats = {}
+    solution = search.iddfs(SlidingPuzzle([[1, 2, 3], [5, 0, 6], [4, 7, 8]]), stats=stats)
+    print(f"iddfs     {solution.cost} moves: {' '.join(solution.actions)}  {stats}")
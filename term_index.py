@@ -0,0 +1,166 @@
+"""
+Discrimination tree: an index from atoms (terms.py) to values, answering
+"which stored atoms may unify with / are instances of / generalize this one".
+
+An atom is flattened to the preorder sequence of its symbols, e.g.
+P(f(x, A), y) -> [P/2, f/2, *, A, *], with every variable replaced by the
+wildcard *. Stored sequences share prefixes in a trie. Retrieval walks the
+trie and the query side by side: a query variable skips one whole stored
+subterm, a stored * skips one whole query subterm. Variables are not
+tracked across positions, so the result is a superset of the answers
+(P(x, x) is returned for P(A, B)); callers run unify/match on it, which
+now sees only a handful of candidates instead of the whole store.
+"""
+from terms import SYMBOL_IS_VAR
+
+_VAR = None   # the wildcard key
+
+
+class _Node:
+    __slots__ = ('children', 'values')
+
+    def __init__(self):
+        self.children = {}
+        self.values = {}   # value -> None, in insertion order (leaves only)
+
+
+def _key(t):
+    """Trie key of a term's top symbol: None for a variable, the symbol id, or (functor, arity)."""
+    if type(t) is int:
+        return _VAR if SYMBOL_IS_VAR[t] else t
+    return (t.functor, len(t.args))
+
+
+def _arity(key):
+    return key[1] if type(key) is tuple else 0
+
+
+_FLAT = {}   # atom -> (keys, ends); atoms are hash-consed, so each is flattened once
+
+
+def _flat(lit):
+    flat = _FLAT.get(lit)
+    if flat is None:
+        keys = [(lit.pred, len(lit.args), lit.neg)]
+        stack = list(reversed(lit.args))
+        while stack:
+            t = stack.pop()
+            keys.append(_key(t))
+            if type(t) is not int:
+                stack.extend(reversed(t.args))
+        # ends[i]: the position right after the subterm starting at i
+        ends = [0] * len(keys)
+        for i in range(len(keys) - 1, -1, -1):
+            j = i + 1
+            for _ in range(_arity(keys[i])):
+                j = ends[j]
+            ends[i] = j
+        flat = _FLAT[lit] = (tuple(keys), ends)
+    return flat
+
+
+def flatten(lit):
+    """Preorder keys of an atom; its predicate, arity and sign form the first key."""
+    return _flat(lit)[0]
+
+
+class DiscriminationTree:
+    def __init__(self):
+        self.root = _Node()
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def insert(self, lit, value):
+        node = self.root
+        for key in (_FLAT.get(lit) or _flat(lit))[0]:
+            child = node.children.get(key)
+            if child is None:
+                child = node.children[key] = _Node()
+            node = child
+        if value not in node.values:
+            node.values[value] = None
+            self.size += 1
+
+    def delete(self, lit, value):
+        """Remove value stored under lit (no-op if absent); empty branches are pruned."""
+        path = [self.root]
+        keys = (_FLAT.get(lit) or _flat(lit))[0]
+        for key in keys:
+            node = path[-1].children.get(key)
+            if node is None:
+                return
+            path.append(node)
+        if value not in path[-1].values:
+            return
+        del path[-1].values[value]
+        self.size -= 1
+        for i in range(len(keys) - 1, -1, -1):
+            node = path[i + 1]
+            if node.values or node.children:
+                break
+            del path[i].children[keys[i]]
+
+    def _retrieve(self, lit, query_var_skips, stored_var_skips):
+        q, end = _FLAT.get(lit) or _flat(lit)
+        n = len(q)
+        if len(q) == 1:   # propositional atom: a single exact key
+            node = self.root.children.get(q[0])
+            if node is not None:
+                yield from node.values
+            return
+        stack = [(self.root, 0, 0)]   # (node, query position, stored subterms still to skip)
+        while stack:
+            node, i, skip = stack.pop()
+            if skip:
+                for key, child in node.children.items():
+                    stack.append((child, i, skip - 1 + _arity(key)))
+                continue
+            if i == n:
+                yield from node.values
+                continue
+            key = q[i]
+            if key is _VAR:
+                if query_var_skips:
+                    stack.append((node, i + 1, 1))
+                else:
+                    child = node.children.get(_VAR)
+                    if child is not None:
+                        stack.append((child, i + 1, 0))
+                continue
+            child = node.children.get(key)
+            if child is not None:
+                stack.append((child, i + 1, 0))
+            if stored_var_skips:
+                child = node.children.get(_VAR)
+                if child is not None:
+                    stack.append((child, end[i], 0))
+
+    def unifiable(self, lit):
+        """Values of stored atoms that may unify with lit."""
+        return self._retrieve(lit, True, True)
+
+    def instances(self, lit):
+        """Values of stored atoms that may be instances of lit."""
+        return self._retrieve(lit, True, False)
+
+    def generalizations(self, lit):
+        """Values of stored atoms that lit may be an instance of."""
+        return self._retrieve(lit, False, True)
+
+
+# ---------------------------
+# Demo / Example usage
+# ---------------------------
+if __name__ == "__main__":
+    from terms import atom_to_str, parse_atom
+
+    tree = DiscriminationTree()
+    for s in ["P(f(x, A), y)", "P(f(B, A), C)", "P(g(A), C)", "P(x, x)", "Q(A)"]:
+        tree.insert(parse_atom(s), s)
+    query = parse_atom("P(f(B, z), C)")
+    print("query:", atom_to_str(query))
+    print("  unifiable:      ", list(tree.unifiable(query)))
+    print("  instances:      ", list(tree.instances(query)))
+    print("  generalizations:", list(tree.generalizations(query)))
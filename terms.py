@@ -0,0 +1,216 @@
+"""
+Shared term layer for the logic code (forward_reasoning.py, unification_fol.py).
+
+- symbols (constants, variables, functors, predicates) are interned to small
+  ints; SYMBOL_NAMES[id] gives the name back and SYMBOL_IS_VAR[id] says
+  whether it is a variable (lowercase first letter, as in both modules)
+- compound terms f(t1, ..., tn) and atoms P(t1, ..., tn) are hash-consed:
+  building the same one twice returns the same object, so equality is
+  identity and hashing never looks at the arguments again
+
+Terms are parsed from and printed to the syntax the modules already use:
+'Loves(x, Food)', 'f(g(z))'.
+"""
+import re
+
+_VAR_RE = re.compile(r'^[a-z][a-zA-Z0-9_]*$')     # variable: starts with lowercase
+_TOKEN_RE = re.compile(r'\s*([(),]|[^(),]+)')   # any other run of characters is one symbol
+
+# ---------------------------
+# Interned symbols
+# ---------------------------
+_SYMBOL_IDS = {}
+SYMBOL_NAMES = []
+SYMBOL_IS_VAR = []
+
+
+def intern_symbol(name):
+    sid = _SYMBOL_IDS.get(name)
+    if sid is None:
+        sid = len(SYMBOL_NAMES)
+        _SYMBOL_IDS[name] = sid
+        SYMBOL_NAMES.append(name)
+        SYMBOL_IS_VAR.append(bool(_VAR_RE.match(name)))
+    return sid
+
+
+def is_var(term):
+    return type(term) is int and SYMBOL_IS_VAR[term]
+
+
+# ---------------------------
+# Hash-consed compound terms and atoms
+# ---------------------------
+class Compound:
+    """f(t1, ..., tn); build with compound(), never directly."""
+    __slots__ = ('functor', 'args', 'ground')
+
+    def __repr__(self):
+        return term_to_str(self)
+
+
+class Atom:
+    """P(t1, ..., tn), possibly negated; build with atom(), never directly."""
+    __slots__ = ('pred', 'args', 'neg', 'ground')
+
+    def __repr__(self):
+        return atom_to_str(self)
+
+
+_COMPOUNDS = {}
+_ATOMS = {}
+
+
+def _is_ground(t):
+    return not SYMBOL_IS_VAR[t] if type(t) is int else t.ground
+
+
+def compound(functor, args):
+    """The unique Compound for functor (symbol id) applied to a tuple of terms."""
+    key = (functor, args)
+    t = _COMPOUNDS.get(key)
+    if t is None:
+        t = Compound()
+        t.functor, t.args = functor, args
+        t.ground = all(_is_ground(a) for a in args)
+        _COMPOUNDS[key] = t
+    return t
+
+
+def atom(pred, args, neg=False):
+    """The unique Atom for pred (symbol id) applied to a tuple of terms."""
+    key = (pred, args, neg)
+    a = _ATOMS.get(key)
+    if a is None:
+        a = Atom()
+        a.pred, a.args, a.neg = pred, args, neg
+        a.ground = all(_is_ground(t) for t in args)
+        _ATOMS[key] = a
+    return a
+
+
+def table_sizes():
+    return {'symbols': len(SYMBOL_NAMES), 'compounds': len(_COMPOUNDS), 'atoms': len(_ATOMS)}
+
+
+# ---------------------------
+# Parsing / printing
+# ---------------------------
+def _parse(tokens, i):
+    """
+    The term starting at tokens[i] and the index after it. Compounds still
+    being read wait on an explicit stack, so any nesting depth parses.
+    """
+    stack = []   # (functor id, arguments read so far)
+    n = len(tokens)
+    while True:
+        if i >= n:
+            raise ValueError("Missing ')'" if stack else "Empty term")
+        name = tokens[i]
+        if name in '(),':
+            raise ValueError(f"Bad term near: {' '.join(tokens[i:])}")
+        sid = intern_symbol(name)
+        if i + 1 < n and tokens[i + 1] == '(':
+            i += 2
+            if i >= n or tokens[i] != ')':
+                stack.append((sid, []))
+                continue
+            t, i = compound(sid, ()), i + 1
+        else:
+            t, i = sid, i + 1
+        # t is complete: add it to the enclosing compound, closing every one that ends here
+        while stack:
+            stack[-1][1].append(t)
+            if i >= n:
+                raise ValueError("Missing ')'")
+            if tokens[i] == ')':
+                sid, args = stack.pop()
+                t, i = compound(sid, tuple(args)), i + 1
+                continue
+            if tokens[i] != ',':
+                raise ValueError(f"Expected ',' but found {tokens[i]}")
+            i += 1
+            break
+        else:
+            return t, i
+
+
+def _tokenize(s):
+    s = s.strip()
+    tokens, pos = [], 0
+    while pos < len(s):
+        m = _TOKEN_RE.match(s, pos)
+        if not m:
+            raise ValueError(f"Bad term format: {s}")
+        tokens.append(m.group(1).strip())   # 'Ice Cream', '3.5' are symbols as they stand
+        pos = m.end()
+    return tokens
+
+
+def parse_term(s):
+    """'f(g(z), a)' -> Compound, 'x' -> symbol id."""
+    tokens = _tokenize(s)
+    t, i = _parse(tokens, 0)
+    if i != len(tokens):
+        raise ValueError(f"Bad term format: {s}")
+    return t
+
+
+def parse_atom(s, neg=False):
+    """'Loves(x, f(y))' -> Atom."""
+    t = parse_term(s)
+    if type(t) is int:
+        raise ValueError(f"Bad literal format: {s}")
+    return atom(t.functor, t.args, neg)
+
+
+def term_to_str(t):
+    if type(t) is int:
+        return SYMBOL_NAMES[t]
+    out, stack = [], [t]   # stack of terms and punctuation still to print
+    while stack:
+        t = stack.pop()
+        if type(t) is str:
+            out.append(t)
+        elif type(t) is int:
+            out.append(SYMBOL_NAMES[t])
+        else:
+            out.append(SYMBOL_NAMES[t.functor] + "(")
+            stack.append(")")
+            for j in range(len(t.args) - 1, -1, -1):
+                stack.append(t.args[j])
+                if j:
+                    stack.append(", ")
+    return "".join(out)
+
+
+def atom_to_str(a):
+    return f"{SYMBOL_NAMES[a.pred]}({', '.join(term_to_str(t) for t in a.args)})"
+
+
+def to_term(x):
+    """Interned form of a string term, or of a list/tuple of them (kept as a tuple)."""
+    if isinstance(x, str):
+        return parse_term(x)
+    if isinstance(x, (list, tuple)):
+        return tuple(to_term(e) for e in x)
+    return x
+
+
+def from_term(t):
+    """Inverse of to_term: strings for terms, lists for tuples."""
+    if isinstance(t, tuple):
+        return [from_term(e) for e in t]
+    return term_to_str(t)
+
+
+# ---------------------------
+# Demo / Example usage
+# ---------------------------
+if __name__ == "__main__":
+    t = parse_term("Likes(John, f(Ice Cream, 3.5))")
+    print(t, table_sizes())
+    # constants are any text between the punctuation, as in the string-based modules
+    assert term_to_str(t) == "Likes(John, f(Ice Cream, 3.5))"
+    assert atom_to_str(parse_atom("Age( Bob , 3.5 )")) == "Age(Bob, 3.5)"
+    assert not is_var(parse_term("ice cream"))
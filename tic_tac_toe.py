@@ -1,5 +1,7 @@
 import random
 
+from tic_tac_toe_table import lookup
+
 class TicTacToe:
     def __init__(self):
         self.board = [' ' for _ in range(9)] # 3x3 board as a list
@@ -116,8 +118,13 @@ class AIPlayer:
         if len(game.available_moves()) == 9:
             square = random.choice(game.available_moves()) # Random move if first move
         else:
-            # Get the best move using minimax algorithm
-            square = self.minimax(game, self.letter)['position']
+            # Look the best move up in the precomputed solution table,
+            # fall back to the minimax algorithm if it has not been built
+            entry = lookup(game.board, self.letter) if len(game.board) == 9 else None
+            if entry is not None:
+                square = entry[0]
+            else:
+                square = self.minimax(game, self.letter)['position']
         return square
    
     def minimax(self, state, player):
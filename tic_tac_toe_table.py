@@ -0,0 +1,186 @@
+"""
+Precomputed tic-tac-toe solution table.
+
+Every position reachable from the empty board (with either X or O moving
+first) is solved once by plain minimax and written to TABLE_FILE. At
+runtime the table is read in one go and a position is looked up in O(1):
+
+    index  = 2 * (base-3 code of the board) + (0 if X to move else 1)
+    record = 2 bytes at 2 * index:  best square (0-8, 255 = none), score
+
+The score is from the side to move's point of view and uses the same
+depth-aware scale as AIPlayer.minimax: +(empty squares + 1) for a win,
+-(empty squares + 1) for a loss, 0 for a draw.
+
+Build / check the table with:
+    python tic_tac_toe_table.py          # writes tic_tac_toe_table.bin
+    python tic_tac_toe_table.py verify   # compares it against live minimax
+"""
+import os
+import sys
+
+TABLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tic_tac_toe_table.bin')
+NO_MOVE = 255
+NUM_ENTRIES = 2 * 3 ** 9
+UNKNOWN = 127  # score byte of positions that cannot be reached
+
+LINES = [(0, 1, 2), (3, 4, 5), (6, 7, 8),
+         (0, 3, 6), (1, 4, 7), (2, 5, 8),
+         (0, 4, 8), (2, 4, 6)]
+
+# cell symbols used across the repo: tic_tac_toe.py uses 'X'/'O'/' ',
+# minmax_aphabeta_tictactoe.py uses 'x'/'o'/'_'
+CELL_CODES = {' ': 0, '_': 0, 'X': 1, 'x': 1, 'O': 2, 'o': 2}
+SIDE_CODES = {'X': 0, 'x': 0, 'O': 1, 'o': 1}
+
+
+# ---------------------------
+# Encoding
+# ---------------------------
+def board_code(cells):
+    """Base-3 code of 9 cells (flat list or 3x3 rows); None for unknown symbols."""
+    if len(cells) == 3:
+        cells = [c for row in cells for c in row]
+    code = 0
+    for c in cells:
+        d = CELL_CODES.get(c)
+        if d is None:
+            return None
+        code = code * 3 + d
+    return code
+
+
+def table_index(cells, to_move):
+    code = board_code(cells)
+    if code is None or to_move not in SIDE_CODES:
+        return None
+    return 2 * code + SIDE_CODES[to_move]
+
+
+# ---------------------------
+# Generator (build step)
+# ---------------------------
+def _has_won(board, d):
+    return any(board[a] == d and board[b] == d and board[c] == d for a, b, c in LINES)
+
+
+def solve_all():
+    """Solve every reachable position; returns {index: (square, score)}."""
+    solved = {}
+    board = [0] * 9
+
+    def code():
+        v = 0
+        for d in board:
+            v = v * 3 + d
+        return v
+
+    def solve(side):  # side: 1 = X, 2 = O (to move)
+        idx = 2 * code() + (side - 1)
+        if idx in solved:
+            return solved[idx][1]
+        other = 3 - side
+        empties = board.count(0)
+        if _has_won(board, other):
+            result = (NO_MOVE, -(empties + 1))
+        elif empties == 0:
+            result = (NO_MOVE, 0)
+        else:
+            # same order and strict improvement as AIPlayer.minimax, so the
+            # stored move is the one the live search would pick
+            best_sq, best_score = NO_MOVE, -100
+            for sq in range(9):
+                if board[sq] == 0:
+                    board[sq] = side
+                    score = -solve(other)
+                    board[sq] = 0
+                    if score > best_score:
+                        best_sq, best_score = sq, score
+            result = (best_sq, best_score)
+        solved[idx] = result
+        return result[1]
+
+    solve(1)  # X moves first
+    solve(2)  # O moves first
+    return solved
+
+
+def build_table(path=TABLE_FILE):
+    solved = solve_all()
+    data = bytearray([NO_MOVE, UNKNOWN]) * NUM_ENTRIES
+    for idx, (sq, score) in solved.items():
+        data[2 * idx] = sq
+        data[2 * idx + 1] = score & 0xFF  # int8 in one byte
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(solved)
+
+
+# ---------------------------
+# Runtime lookup
+# ---------------------------
+def load_table(path=TABLE_FILE):
+    """Read the whole table in one go; None if it has not been built."""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) != 2 * NUM_ENTRIES:
+        return None
+    return data
+
+
+_TABLE = load_table()
+
+
+def lookup(cells, to_move, table=None):
+    """(best square, score) for the side to move, or None if not in the table."""
+    table = table if table is not None else _TABLE
+    if table is None:
+        return None
+    idx = table_index(cells, to_move)
+    if idx is None or table[2 * idx + 1] == UNKNOWN:
+        return None
+    score = table[2 * idx + 1]
+    return table[2 * idx], score - 256 if score > 127 else score
+
+
+# ---------------------------
+# Check against live minimax
+# ---------------------------
+def verify(table=None):
+    """Compare every table entry with AIPlayer.minimax; returns the number of mismatches."""
+    from tic_tac_toe import TicTacToe, AIPlayer
+
+    table = table if table is not None else load_table()
+    mismatches = 0
+    checked = 0
+    for idx in range(NUM_ENTRIES):
+        if table[2 * idx + 1] == UNKNOWN:
+            continue
+        code, side = divmod(idx, 2)
+        game = TicTacToe()
+        for sq in range(8, -1, -1):
+            code, d = divmod(code, 3)
+            game.board[sq] = ' XO'[d]
+        letter = 'XO'[side]
+        last = 'XO'[1 - side]
+        if any(all(game.board[i] == last for i in line) for line in LINES):
+            game.current_winner = last
+        expected = AIPlayer(letter).minimax(game, letter)
+        sq, score = lookup(game.board, letter, table)
+        expected_sq = NO_MOVE if expected['position'] is None else expected['position']
+        if (sq, score) != (expected_sq, expected['score']):
+            mismatches += 1
+            print(f"Mismatch at {game.board} ({letter} to move): table {(sq, score)}, minimax {(expected_sq, expected['score'])}")
+        checked += 1
+    print(f"Checked {checked} positions, {mismatches} mismatches")
+    return mismatches
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'verify':
+        sys.exit(1 if verify() else 0)
+    n = build_table()
+    print(f"Solved {n} positions -> {TABLE_FILE}")
@@ -0,0 +1,166 @@
+import argparse
+import importlib.machinery
+import importlib.util
+import math
+import os
+import random
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+from tic_tac_toe import TicTacToe, AIPlayer, play
+
+# ---------------------------
+# Players
+# ---------------------------
+_LAB1_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lab1 tic tac toe')
+_lab1 = None
+
+
+def _load_lab1():
+    # 'lab1 tic tac toe' has no .py extension, so load it by path
+    global _lab1
+    if _lab1 is None:
+        loader = importlib.machinery.SourceFileLoader('lab1_tic_tac_toe', _LAB1_PATH)
+        _lab1 = importlib.util.module_from_spec(importlib.util.spec_from_loader(loader.name, loader))
+        loader.exec_module(_lab1)
+    return _lab1
+
+
+class RandomPlayer:
+    def __init__(self, letter):
+        self.letter = letter
+
+    def get_move(self, game):
+        return random.choice(game.available_moves())
+
+
+class RuleBasedPlayer:
+    """The win / block / first-free rules of ai_move() in 'lab1 tic tac toe'."""
+    def __init__(self, letter):
+        self.letter = letter
+        self.ai_move = _load_lab1().ai_move
+
+    def get_move(self, game):
+        # ai_move plays 'O' against 'X' on a 3x3 grid, so swap letters when we are X
+        swap = {'X': 'O', 'O': 'X', ' ': ' '} if self.letter == 'X' else None
+        cells = [swap[c] for c in game.board] if swap else game.board
+        r, c = self.ai_move([cells[i * 3:(i + 1) * 3] for i in range(3)])
+        return r * 3 + c
+
+
+PLAYERS = {
+    'ai': AIPlayer,
+    'rule': RuleBasedPlayer,
+    'random': RandomPlayer,
+}
+
+
+# ---------------------------
+# Move latency histogram
+# ---------------------------
+BUCKETS_PER_E = 20  # log-spaced buckets, ~5% wide
+
+
+class TimedPlayer:
+    """Wraps a player and records how long each get_move() call takes."""
+    def __init__(self, player, histogram):
+        self.player = player
+        self.letter = player.letter
+        self.histogram = histogram
+
+    def get_move(self, game):
+        start = time.perf_counter_ns()
+        square = self.player.get_move(game)
+        elapsed = time.perf_counter_ns() - start
+        self.histogram[int(math.log(max(elapsed, 1)) * BUCKETS_PER_E)] += 1
+        return square
+
+
+def percentile(histogram, p):
+    """Upper edge (in microseconds) of the bucket holding the p-th percentile."""
+    total = sum(histogram.values())
+    if total == 0:
+        return 0.0
+    rank = p / 100 * total
+    seen = 0
+    for bucket in sorted(histogram):
+        seen += histogram[bucket]
+        if seen >= rank:
+            return math.exp((bucket + 1) / BUCKETS_PER_E) / 1000
+    return 0.0
+
+
+# ---------------------------
+# Worker / shard
+# ---------------------------
+def run_shard(args):
+    """Play `games` games in this process; returns (results, latency histograms)."""
+    name_a, name_b, games, first_game, seed = args
+    random.seed(seed)
+    results = Counter()  # 'A' / 'B' / 'draw'
+    latency = {'A': Counter(), 'B': Counter()}
+    players = {}
+    for side, name in (('A', name_a), ('B', name_b)):
+        for letter in 'XO':
+            players[(side, letter)] = TimedPlayer(PLAYERS[name](letter), latency[side])
+    for g in range(first_game, first_game + games):
+        # alternate who moves first so neither side keeps the first-move advantage
+        x_side, o_side = ('A', 'B') if g % 2 == 0 else ('B', 'A')
+        winner = play(TicTacToe(), players[(x_side, 'X')], players[(o_side, 'O')], print_game=False)
+        if winner == 'X':
+            results[x_side] += 1
+        elif winner == 'O':
+            results[o_side] += 1
+        else:
+            results['draw'] += 1
+    return results, latency
+
+
+def tournament(name_a, name_b, games=10000, workers=None, shard_size=2000, seed=0):
+    """Play `games` games of name_a vs name_b sharded across worker processes."""
+    workers = workers or os.cpu_count() or 1
+    shards = []
+    first = 0
+    while first < games:
+        n = min(shard_size, games - first)
+        shards.append((name_a, name_b, n, first, seed * 1000003 + first))
+        first += n
+
+    results = Counter()
+    latency = {'A': Counter(), 'B': Counter()}
+    start = time.perf_counter()
+    with Pool(workers) as pool:
+        for shard_results, shard_latency in pool.imap_unordered(run_shard, shards):
+            results.update(shard_results)
+            for side in latency:
+                latency[side].update(shard_latency[side])
+    elapsed = time.perf_counter() - start
+    return {'names': {'A': name_a, 'B': name_b}, 'games': games, 'seconds': elapsed,
+            'results': results, 'latency': latency}
+
+
+def print_report(report):
+    games = report['games']
+    print(f"Games: {games}   time: {report['seconds']:.2f}s   "
+          f"throughput: {games / report['seconds']:.0f} games/s")
+    for side, name in report['names'].items():
+        hist = report['latency'][side]
+        wins = report['results'][side]
+        print(f"  {side}: {name:8} wins {wins:>9} ({100 * wins / games:5.1f}%)   "
+              f"move latency p50 {percentile(hist, 50):8.1f}us  "
+              f"p90 {percentile(hist, 90):8.1f}us  p99 {percentile(hist, 99):8.1f}us")
+    draws = report['results']['draw']
+    print(f"  {'draws':11}      {draws:>9} ({100 * draws / games:5.1f}%)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Headless AI-vs-AI tic-tac-toe tournament')
+    parser.add_argument('player_a', choices=sorted(PLAYERS))
+    parser.add_argument('player_b', choices=sorted(PLAYERS))
+    parser.add_argument('-n', '--games', type=int, default=10000)
+    parser.add_argument('-w', '--workers', type=int, default=None)
+    parser.add_argument('--shard-size', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    print_report(tournament(args.player_a, args.player_b, args.games, args.workers, args.shard_size, args.seed))
@@ -0,0 +1,166 @@
+from collections import defaultdict
+from itertools import takewhile
+
+from forward_reasoning import Bindings, FactIndex, literal_to_atom, match_delta, parse_literal, parse_rule
+from terms import atom_to_str, parse_atom
+
+# ---------------------------
+# Knowledge base with justifications
+# ---------------------------
+class TruthMaintainedKB:
+    """
+    Forward-chaining knowledge base that remembers why each fact holds.
+
+    Every rule firing is stored as a justification (rule number, antecedent
+    facts) of its consequent, and every fact knows the justifications it
+    takes part in. Facts are asserted and retracted one at a time:
+
+    - assert_fact() runs semi-naive evaluation with only the new fact as delta
+    - retract() uses delete-and-rederive (DRed): it first over-deletes every
+      fact with a justification that depends on the retracted fact, then
+      re-derives those over-deleted facts that still have a justification
+      made only of surviving facts. Only the facts reached in the first
+      step and their justifications are touched.
+    """
+    def __init__(self, rules, facts=()):
+        self.rules = [([literal_to_atom(a) for a in r.antecedents], literal_to_atom(r.consequent)) for r in rules]
+        self.index = FactIndex()
+        self.base = set()                    # asserted facts
+        self.justs = defaultdict(set)        # fact -> {(rule no, antecedent facts)}
+        self.used_by = defaultdict(set)      # fact -> {(consequent, justification)} it takes part in
+        self.bindings = Bindings()
+        start = self.index.size
+        for f in facts:
+            f = _to_atom(f)
+            self.base.add(f)
+            self.index.add(f)
+        for no, (ants, cons) in enumerate(self.rules):
+            if not ants:  # a fact-rule holds unconditionally
+                self._justify(cons, (no, ()))
+        self._propagate(start)
+
+    # --- queries ---
+    def __contains__(self, fact):
+        return _to_atom(fact) in self.index.facts
+
+    def __len__(self):
+        return len(self.index)
+
+    def derived(self):
+        return {atom_to_str(f) for f in self.index.facts}
+
+    def justifications(self, fact):
+        """How fact is supported: 'asserted' and/or (rule number, [antecedent strings]) pairs."""
+        fact = _to_atom(fact)
+        out = ['asserted'] if fact in self.base else []
+        out.extend((no, [atom_to_str(a) for a in ants]) for no, ants in self.justs.get(fact, ()))
+        return out
+
+    # --- updates ---
+    def assert_fact(self, fact):
+        """Add a base fact; returns the strings of the facts that became true."""
+        fact = _to_atom(fact)
+        if fact in self.base:
+            return []
+        self.base.add(fact)
+        start = self.index.size
+        if not self.index.add(fact):
+            return []  # was already derived
+        self._propagate(start)
+        new = takewhile(lambda item: item[1] >= start, reversed(self.index.facts.items()))
+        return [atom_to_str(f) for f, _ in new][::-1]
+
+    def retract(self, fact):
+        """Remove a base fact; returns the strings of the facts that lost all support."""
+        fact = _to_atom(fact)
+        if fact not in self.base:
+            raise ValueError(f"{atom_to_str(fact)} is not an asserted fact")
+        self.base.discard(fact)
+
+        # 1. over-delete: everything with some justification through a deleted fact
+        deleted = {fact}
+        stack = [fact]
+        while stack:
+            for cons, _ in self.used_by.get(stack.pop(), ()):
+                if cons not in deleted and cons not in self.base:
+                    deleted.add(cons)
+                    stack.append(cons)
+
+        # 2. re-derive: over-deleted facts with a justification made of live facts,
+        #    and then whatever those revive in turn
+        def alive(f):
+            return f not in deleted or f in revived
+
+        revived = set()
+        stack = [f for f in deleted
+                 if any(all(alive(a) for a in ants) for _, ants in self.justs.get(f, ()))]
+        revived.update(stack)
+        while stack:
+            for cons, (_, ants) in self.used_by.get(stack.pop(), ()):
+                if cons in deleted and cons not in revived and all(alive(a) for a in ants):
+                    revived.add(cons)
+                    stack.append(cons)
+
+        # 3. drop what is left, with every justification it takes part in
+        gone = deleted - revived
+        for f in gone:
+            for cons, just in self.used_by.pop(f, ()):
+                self.justs[cons].discard(just)
+                for a in just[1]:
+                    if a is not f:
+                        self.used_by[a].discard((cons, just))
+            for just in self.justs.pop(f, ()):
+                for a in just[1]:
+                    self.used_by[a].discard((f, just))
+            self.index.remove(f)
+        return sorted(atom_to_str(f) for f in gone)
+
+    # --- internals ---
+    def _justify(self, cons, just):
+        if just in self.justs[cons]:
+            return
+        self.justs[cons].add(just)
+        for a in just[1]:
+            self.used_by[a].add((cons, just))
+        self.index.add(cons)
+
+    def _propagate(self, start):
+        """Semi-naive rounds starting with the facts numbered from start as delta."""
+        index, bindings = self.index, self.bindings
+        delta_start, delta_end = start, index.size
+        while delta_start < delta_end:
+            for no, (ants, consequent) in enumerate(self.rules):
+                if not ants:
+                    continue
+
+                def fire():
+                    self._justify(bindings.resolve_atom(consequent),
+                                  (no, tuple(bindings.resolve_atom(a) for a in ants)))
+
+                match_delta(index, ants, delta_start, delta_end, bindings, fire)
+            delta_start, delta_end = delta_end, index.size
+
+
+def _to_atom(fact):
+    return parse_atom(fact) if isinstance(fact, str) else literal_to_atom(fact)
+
+
+# ---------------------------
+# Demo / Example usage
+# ---------------------------
+if __name__ == "__main__":
+    rules = [parse_rule(s) for s in [
+        "Parent(x,y) -> Ancestor(x,y)",
+        "Ancestor(x,y) & Parent(y,z) -> Ancestor(x,z)",
+        "Man(x) -> Person(x)",
+        "Citizen(x) -> Person(x)",
+    ]]
+    facts = [parse_literal(s) for s in ["Parent(Ann, Bob)", "Parent(Bob, Cid)", "Parent(Cid, Dee)",
+                                        "Man(Marcus)", "Citizen(Marcus)"]]
+    kb = TruthMaintainedKB(rules, facts)
+    print(len(kb), "facts;", "Ancestor(Ann, Dee)" in kb)
+    print("Person(Marcus) because", kb.justifications("Person(Marcus)"))
+
+    print("retract Man(Marcus):", kb.retract("Man(Marcus)"))        # Person(Marcus) still holds
+    print("retract Parent(Bob, Cid):", kb.retract("Parent(Bob, Cid)"))
+    print("assert Parent(Bob, Cid):", kb.assert_fact("Parent(Bob, Cid)"))
@@ -1,67 +1,166 @@
+from terms import Compound, SYMBOL_IS_VAR, compound, from_term, to_term
+
+
 def unify(x, y, substitutions=None):
-    if substitutions is None:
-        substitutions = {}
-
-    # If both are same, return current substitutions
-    if x == y:
-        return substitutions
-
-    # If x is a variable
-    elif is_variable(x):
-        return unify_var(x, y, substitutions)
-
-    # If y is a variable
-    elif is_variable(y):
-        return unify_var(y, x, substitutions)
-
-    # If both are compound expressions (lists or tuples)
-    elif isinstance(x, (list, tuple)) and isinstance(y, (list, tuple)) and len(x) == len(y):
-        for a, b in zip(x, y):
-            substitutions = unify(a, b, substitutions)
-            if substitutions is None:
-                return None
-        return substitutions
-
-    # If cannot unify
-    else:
+    """
+    Unify two terms given as strings ('f(g(z))') or lists of them.
+    Terms are interned first (terms.py), so f(x) and f(g(z)) are real
+    compound terms; the substitution is returned with string terms again.
+    """
+    theta = {}
+    if substitutions:
+        theta = {to_term(var): to_term(val) for var, val in substitutions.items()}
+    theta = unify_terms(to_term(x), to_term(y), theta)
+    if theta is None:
         return None
+    return {from_term(var): from_term(val) for var, val in theta.items()}
 
 
-def unify_var(var, x, substitutions):
-    if var in substitutions:
-        return unify(substitutions[var], x, substitutions)
-    elif x in substitutions:
-        return unify(var, substitutions[x], substitutions)
-    elif occurs_check(var, x, substitutions):
-        return None
-    else:
-        substitutions[var] = x
-        return substitutions
+def unify_terms(x, y, substitutions=None):
+    """
+    Near-linear unification of interned terms (Huet style).
+
+    Every term is a node in a union-find structure; each equivalence class
+    remembers one non-variable member (its schema). Pairs to unify are kept
+    on an explicit worklist, so deep terms never hit the recursion limit,
+    and shared subterms (hash-consed) are only merged once. The occurs check
+    is deferred to a single cycle check at the end. Returns an idempotent
+    substitution {variable: term} or None.
+    """
+    parent, size, schema = {}, {}, {}
+
+    def find(t):
+        root = t
+        while root in parent:
+            root = parent[root]
+        while t in parent and parent[t] is not root:  # path compression
+            parent[t], t = root, parent[t]
+        return root
+
+    work = [(x, y)]
+    if substitutions:
+        work.extend(substitutions.items())
+    while work:
+        s, t = work.pop()
+        rs, rt = find(s), find(t)
+        if rs is rt or rs == rt:
+            continue
+        ss = schema.get(rs, None if is_variable(rs) else rs)
+        st = schema.get(rt, None if is_variable(rt) else rt)
+        if ss is not None and st is not None:
+            fs, args_s = _functor_args(ss)
+            ft, args_t = _functor_args(st)
+            if fs != ft or len(args_s) != len(args_t):
+                return None  # clash: different functors / constants
+            work.extend(zip(args_s, args_t))
+        # union by size, keeping whichever schema exists
+        if size.get(rs, 1) < size.get(rt, 1):
+            rs, rt = rt, rs
+        parent[rt] = rs
+        size[rs] = size.get(rs, 1) + size.get(rt, 1)
+        keep = ss if ss is not None else st
+        if keep is not None:
+            schema[rs] = keep
+
+    if _has_cycle(schema, find):
+        return None  # a variable occurs in its own binding
+
+    # read the substitution off the classes (iteratively, memoised per class)
+    resolved = {}
+    result = {}
+    for var in [t for t in list(parent) + list(schema) if is_variable(t)]:
+        root = find(var)
+        value = _resolve(root, schema, find, resolved)
+        if value != var:
+            result[var] = value
+    return result
 
 
-def occurs_check(var, x, substitutions):
-    if var == x:
-        return True
-    elif isinstance(x, (list, tuple)):
-        return any(occurs_check(var, xi, substitutions) for xi in x)
-    elif x in substitutions:
-        return occurs_check(var, substitutions[x], substitutions)
+def _functor_args(term):
+    if isinstance(term, Compound):
+        return term.functor, term.args
+    if isinstance(term, tuple):
+        return None, term  # a plain argument list
+    return term, ()        # constant
+
+
+def _schema_of(node, schema):
+    """Non-variable member of node's class; a non-variable node that was never unioned is its own."""
+    return schema.get(node, None if is_variable(node) else node)
+
+
+def _has_cycle(schema, find):
+    """Depth-first search over class -> argument classes; True if some class reaches itself."""
+    state = {}  # root -> 1 (on the stack) / 2 (done)
+    for start in list(schema):
+        start = find(start)
+        if state.get(start):
+            continue
+        state[start] = 1
+        stack = [(start, iter(_functor_args(schema[start])[1]))]
+        while stack:
+            node, args = stack[-1]
+            for arg in args:
+                child = find(arg)
+                st = state.get(child)
+                if st == 1:
+                    return True
+                term = _schema_of(child, schema)
+                if st is None and term is not None:
+                    state[child] = 1
+                    stack.append((child, iter(_functor_args(term)[1])))
+                    break
+            else:
+                state[node] = 2
+                stack.pop()
     return False
 
 
+def _resolve(root, schema, find, resolved):
+    """Fully substituted term for a class, built bottom-up and shared via hash-consing."""
+    if root in resolved:
+        return resolved[root]
+    stack = [root]
+    while stack:
+        node = stack[-1]
+        if node in resolved:
+            stack.pop()
+            continue
+        term = _schema_of(node, schema)
+        if term is None or not isinstance(term, (Compound, tuple)):
+            resolved[node] = node if term is None else term
+            stack.pop()
+            continue
+        pending = [find(a) for a in _functor_args(term)[1] if find(a) not in resolved]
+        if pending:
+            stack.extend(pending)
+            continue
+        args = tuple(resolved[find(a)] for a in _functor_args(term)[1])
+        resolved[node] = compound(term.functor, args) if isinstance(term, Compound) else args
+        stack.pop()
+    return resolved[root]
+
+
 def is_variable(term):
-    # variable is a lowercase string
+    # variable is a lowercase symbol
+    if type(term) is int:
+        return SYMBOL_IS_VAR[term]
     return isinstance(term, str) and term[0].islower()
 
 
 # -----------------------------------------------
 # ✅ Example usage (you can replace with your own)
 # -----------------------------------------------
-x1 = ['P', 'f(x)', 'g(y)', 'y']
-x2 = ['P', 'f(g(z))', 'g(f(a))', 'f(a)']
-
-result = unify(x1, x2)
-if result:
-    print("Unification Successful! Substitutions:", result)
-else:
-    print("Unification Failed!")
+if __name__ == "__main__":
+    x1 = ['P', 'f(x)', 'g(y)', 'y']
+    x2 = ['P', 'f(g(z))', 'g(f(a))', 'f(a)']
+
+    result = unify(x1, x2)
+    if result:
+        print("Unification Successful! Substitutions:", result)
+    else:
+        print("Unification Failed!")
+
+    # occurs check below the top level, and an idempotent result
+    assert unify('x', 'g(g(x))') is None
+    assert unify(['x', 'y'], ['A', 'f(g(x))']) == {'x': 'A', 'y': 'f(g(A))'}